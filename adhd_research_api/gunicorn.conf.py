@@ -0,0 +1,89 @@
+"""Gunicorn settings for serving the API in production
+
+    gunicorn -c adhd_research_api/gunicorn.conf.py
+
+Runs GUNICORN_WORKERS pre-forked processes (default ``2 x CPUs + 1``), each
+with GUNICORN_THREADS request threads. The app is imported once in the
+master (``preload_app``) and the file-backed indexes are loaded there
+before forking, so workers start warm and share those pages copy-on-write.
+Database connections are never opened in the master: each worker opens
+its own pool on first use.
+
+Reloading:
+
+    kill -HUP <master pid>     # re-read this file, replace workers gracefully
+    kill -USR2 <master pid>    # start a new master on new code, then
+    kill -QUIT <old master>    # drain and stop the old one
+
+With ``preload_app`` a HUP keeps the code already imported in the master;
+deploy new code with USR2 (or restart the container).
+"""
+
+import os
+import sys
+import tempfile
+
+
+def _cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# Workers write metric snapshots here so /metrics can sum them (see src/metrics.py).
+# Set before the app is preloaded, which reads it at import.
+# A master re-exec'd by USR2 inherits it, so it is not removed on exit.
+os.environ.setdefault('METRICS_DIR', tempfile.mkdtemp(prefix='adhd-research-metrics-'))
+
+wsgi_app = 'src.main:app'
+chdir = os.path.dirname(os.path.abspath(__file__))
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5000')}")
+
+worker_class = 'gthread'
+workers = int(os.getenv('GUNICORN_WORKERS') or 2 * _cpu_count() + 1)
+threads = int(os.getenv('GUNICORN_THREADS', '2'))
+preload_app = True
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+# Recycle workers now and then (staggered) so slow leaks cannot accumulate
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '10000'))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'info').lower()
+
+
+def on_starting(server):
+    """Drop metric snapshots left by a previous run in a fixed METRICS_DIR"""
+    from src.metrics import clear_directory
+    clear_directory(os.environ['METRICS_DIR'])
+
+
+def child_exit(server, worker):
+    """Keep an exited worker's counters in /metrics and drop its gauges"""
+    from src.metrics import mark_process_dead
+    mark_process_dead(worker.pid, os.environ['METRICS_DIR'])
+
+
+def when_ready(server):
+    """Warm the file-backed indexes in the master before workers are forked"""
+    from src.assessment_scoring import get_assessment_scorer
+    from src.decision_tree import get_decision_tree
+    from src.knowledge_index import get_knowledge_index
+
+    for name, load in (('knowledge base', get_knowledge_index), ('decision tree', get_decision_tree),
+                       ('assessment', get_assessment_scorer)):
+        try:
+            load()
+        except Exception as e:
+            # Workers load it on first use instead and report the error there
+            server.log.warning('Could not preload the %s: %s', name, e)
+
+    # A pool opened while importing must not be shared across fork
+    database_config = sys.modules.get('src.database_config')
+    if database_config is not None:
+        database_config.prisma.close()
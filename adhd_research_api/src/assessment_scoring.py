@@ -0,0 +1,241 @@
+"""Vectorized scoring for the professional ASRS assessment
+
+``phase4/assessments/asrs_professional.json`` groups its questions into
+weighted sections and defines the composite as
+
+    (core_adhd * 0.4) + (workplace_impact * 0.3) + (life_management * 0.2) + (masking_indicators * 0.1)
+
+Each section score is the sum of its answers as a percentage of the
+section maximum, so the composite runs from 0 to ``max_score`` (100). Both
+steps are linear, so the questionnaire is compiled into one Q x (S + 1)
+matrix: a column per section plus a composite column. Scoring N
+assessments is then a single ``responses @ matrix`` on an N x Q array.
+
+A ``professional_modifiers`` entry (e.g. +3 for an Engineer) is added to
+the composite, and the result is clipped to the score range and mapped to
+its ``scoring.interpretation`` band with ``np.searchsorted``.
+"""
+
+import json
+import operator
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+DEFAULT_ASSESSMENT_JSON = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'phase4', 'assessments', 'asrs_professional.json',
+)
+
+# Decimals of the scores returned; bands are resolved on the rounded score
+SCORE_DECIMALS = 2
+
+_FORMULA_TERM_RE = re.compile(r'([A-Za-z_]\w*)\s*\*\s*(\d+(?:\.\d+)?)')
+
+
+def _formula_weights(formula: Optional[str]) -> Dict[str, float]:
+    """{section_id: weight} from a formula like "(core_adhd * 0.4) + ..." """
+    return {name: float(weight) for name, weight in _FORMULA_TERM_RE.findall(formula or '')}
+
+
+class AssessmentScorer:
+    """An assessment document compiled into a weight matrix"""
+
+    def __init__(self, document: Dict[str, Any], weights: Optional[Dict[str, float]] = None):
+        self.document = document
+        self.assessment_id = document.get('assessment_id')
+        sections = document.get('sections') or []
+        if not sections:
+            raise ValueError('Assessment has no sections')
+        scoring = document.get('scoring') or {}
+        self.max_score = float(scoring.get('max_score', 100))
+
+        self.section_ids = [section['section_id'] for section in sections]
+        if weights is None:
+            weights = _formula_weights(scoring.get('formula')) or {
+                section['section_id']: section.get('weight', 0) for section in sections
+            }
+        unknown = set(weights) - set(self.section_ids)
+        if unknown:
+            raise ValueError(f"Unknown section(s) in weights: {', '.join(sorted(unknown))}")
+        section_weights = np.array([weights.get(section_id, 0.0) for section_id in self.section_ids], dtype=np.float64)
+        if (section_weights < 0).any() or section_weights.sum() <= 0:
+            raise ValueError('Section weights must be non-negative and not all zero')
+        self.weights = dict(zip(self.section_ids, np.round(section_weights / section_weights.sum(), 6).tolist()))
+
+        self.question_ids: List[str] = []
+        options: List[List[int]] = []
+        columns: List[int] = []
+        for column, section in enumerate(sections):
+            for question in section.get('questions') or []:
+                self.question_ids.append(question['id'])
+                options.append([int(option['value']) for option in question.get('options') or []])
+                columns.append(column)
+        if not self.question_ids:
+            raise ValueError('Assessment has no questions')
+        self.question_index = {question_id: i for i, question_id in enumerate(self.question_ids)}
+
+        # Answers outside a question's options are rejected through a
+        # (question, value - lowest) table instead of per-answer set lookups
+        self.lowest = min(min(values) for values in options)
+        self.valid = np.zeros((len(options), max(max(values) for values in options) - self.lowest + 1), dtype=bool)
+        for row, values in enumerate(options):
+            self.valid[row, np.array(values) - self.lowest] = True
+
+        section_max = np.zeros(len(sections))
+        np.add.at(section_max, columns, [max(values) for values in options])
+        if (section_max <= 0).any():
+            raise ValueError('Every section needs at least one question with a positive option value')
+        self.matrix = np.zeros((len(self.question_ids), len(sections) + 1), dtype=np.float64)
+        self.matrix[np.arange(len(columns)), columns] = self.max_score / section_max[columns]
+        self.matrix[:, -1] = self.matrix[:, :-1] @ (section_weights / section_weights.sum())
+
+        # Role name (case-insensitive) or modifier id -> modifier code; code 0 is "none"
+        modifiers = document.get('professional_modifiers') or {}
+        self.modifier_ids = [None] + list(modifiers)
+        self.modifier_values = np.array([0.0] + [float(m.get('modifier', 0)) for m in modifiers.values()])
+        self.modifier_codes: Dict[str, int] = {}
+        for code, (modifier_id, modifier) in enumerate(modifiers.items(), start=1):
+            self.modifier_codes[modifier_id.lower()] = code
+            for role in modifier.get('roles') or []:
+                self.modifier_codes.setdefault(role.lower(), code)
+
+        bands = []
+        for band, meaning in (scoring.get('interpretation') or {}).items():
+            _, _, upper = band.partition('-')
+            bands.append((float(upper or band), band, meaning))
+        bands.sort(key=lambda band: band[0])
+        self.band_upper = np.array([upper for upper, _, _ in bands])
+        self.bands = [
+            {'band': band, 'level': meaning.get('level'), 'recommendations': meaning.get('recommendations', [])}
+            for _, band, meaning in bands
+        ]
+
+    @classmethod
+    def load(cls, path: str = None) -> 'AssessmentScorer':
+        path = path or os.getenv('ASSESSMENT_JSON') or DEFAULT_ASSESSMENT_JSON
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def with_weights(self, weights: Dict[str, float]) -> 'AssessmentScorer':
+        """The same questionnaire re-weighted; weights are normalized to sum to 1"""
+        return type(self)(self.document, weights)
+
+    def modifier_code(self, role: Optional[str]) -> int:
+        if role is None or role == '':
+            return 0
+        if not isinstance(role, str):
+            raise ValueError('role must be a string')
+        return self.modifier_codes.get(role.strip().lower(), 0)
+
+    def response_matrix(self, responses: Iterable[Any]) -> np.ndarray:
+        """N x Q array from answer objects ({question_id: value}) or lists in question order"""
+        rows = []
+        width = len(self.question_ids)
+        # One extra key keeps itemgetter returning a tuple for one-question forms
+        answer_values = operator.itemgetter(*self.question_ids, *self.question_ids[:1])
+        for number, answers in enumerate(responses):
+            if isinstance(answers, dict):
+                try:
+                    rows.append(answer_values(answers)[:width])
+                except KeyError as e:
+                    raise ValueError(f'Assessment {number}: missing answer to {e.args[0]}') from None
+                if len(answers) != width:
+                    unknown = next(q for q in answers if q not in self.question_index)
+                    raise ValueError(f'Assessment {number}: unknown question {unknown}')
+            elif isinstance(answers, list):
+                if len(answers) != width:
+                    raise ValueError(f'Assessment {number}: expected {width} answers, got {len(answers)}')
+                rows.append(answers)
+            else:
+                raise ValueError(f'Assessment {number}: responses must be an object or a list')
+        if not rows:
+            return np.zeros((0, width))
+        try:
+            matrix = np.array(rows, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError('Answers must be numbers') from None
+        self.check(matrix)
+        return matrix
+
+    def check(self, responses: np.ndarray):
+        """Raise ValueError unless every answer is one of its question's option values"""
+        offsets = responses - self.lowest
+        ok = (offsets == np.floor(offsets)) & (offsets >= 0) & (offsets < self.valid.shape[1])
+        if ok.all():
+            ok = self.valid[np.arange(responses.shape[1]), offsets.astype(np.intp)]
+        if not ok.all():
+            row, column = map(int, np.argwhere(~ok)[0])
+            value = responses[row, column]
+            problem = 'missing answer to' if np.isnan(value) else f'{value:g} is not an option of'
+            raise ValueError(f'Assessment {row}: {problem} {self.question_ids[column]}')
+
+    def score_matrix(self, responses: np.ndarray, modifier_codes: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Score an N x Q response array
+
+        Returns arrays: ``sections`` (N x S), ``composite``, ``modifier``,
+        ``score`` (composite plus modifier, clipped to 0..max_score and
+        rounded to SCORE_DECIMALS) and ``band`` (index into ``self.bands``).
+        """
+        scored = responses @ self.matrix
+        composite = scored[:, -1]
+        if modifier_codes is None:
+            modifier = np.zeros(len(composite))
+        else:
+            modifier = self.modifier_values[modifier_codes]
+        # Weighted sums carry float error (uniform answers of 2 give 50.00000000000001),
+        # which would otherwise push a score on a band boundary into the next band
+        score = np.round(np.clip(composite + modifier, 0.0, self.max_score), SCORE_DECIMALS)
+        band = np.minimum(np.searchsorted(self.band_upper, score, side='left'), len(self.bands) - 1)
+        return {'sections': scored[:, :-1], 'composite': composite, 'modifier': modifier, 'score': score, 'band': band}
+
+    def score_batch(self, assessments: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score assessments given as {"responses": ..., "role": ...} objects"""
+        assessments = list(assessments)
+        for number, assessment in enumerate(assessments):
+            if not isinstance(assessment, dict):
+                raise ValueError(f'Assessment {number}: must be an object')
+        responses = self.response_matrix(assessment.get('responses') for assessment in assessments)
+        codes = np.fromiter((self.modifier_code(a.get('role')) for a in assessments), dtype=np.intp, count=len(assessments))
+        scored = self.score_matrix(responses, codes)
+
+        sections = np.round(scored['sections'], SCORE_DECIMALS).tolist()
+        modifiers = [
+            {'id': modifier_id, 'value': value}
+            for modifier_id, value in zip(self.modifier_ids, self.modifier_values.tolist())
+        ]
+        results = []
+        for row, (score, composite, band, code) in enumerate(zip(
+            scored['score'].tolist(), np.round(scored['composite'], SCORE_DECIMALS).tolist(),
+            scored['band'].tolist(), codes.tolist(),
+        )):
+            result = {
+                'score': score,
+                'composite': composite,
+                'modifier': modifiers[code],
+                'sections': dict(zip(self.section_ids, sections[row])),
+            }
+            if self.bands:
+                result.update(self.bands[band])
+            results.append(result)
+        return results
+
+    def score(self, assessment: Dict[str, Any]) -> Dict[str, Any]:
+        return self.score_batch([assessment])[0]
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_assessment_scorer() -> AssessmentScorer:
+    """Process-wide scorer, compiled on first use"""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = AssessmentScorer.load()
+    return _scorer
@@ -0,0 +1,177 @@
+"""Asyncio data access for endpoints that run independent queries
+
+``PrismaClient`` runs one query at a time on a pooled connection, so an
+endpoint that needs several unrelated result sets pays for them in
+sequence. ``AsyncPrismaClient`` keeps an ``AsyncConnectionPool`` on one
+event loop running in a background thread; Flask's (synchronous) request
+threads hand it coroutines through ``run()``, and ``gather()`` sends
+independent queries on separate connections at once, so the request waits
+for the slowest query rather than the sum of them.
+
+It is opt-in (``DB_ASYNC=1``). The loop thread and pool are created on
+first use, i.e. inside a gunicorn worker rather than the pre-fork master.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.database_config import PrismaClient, _libpq_conninfo, prisma
+from src.metrics import observe_query, register_pool
+from src.query_trace import query_tracer
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:  # psycopg is optional; callers fall back to PrismaClient
+    psycopg = None
+    AsyncConnectionPool = None
+
+Query = Tuple[str, Optional[tuple]]
+
+# Label for async queries in db_query_* metrics; a gather() has no single calling method
+ASYNC_QUERY_METHOD = 'async_query_raw'
+
+# The queries get_research_stats() fans out; each is independent of the others
+RESEARCH_STATS_QUERIES: Dict[str, Query] = {
+    'total_research_entries': ('SELECT COUNT(*) AS value FROM research_entries;', None),
+    'total_treatment_recommendations': ('SELECT COUNT(*) AS value FROM treatment_recommendations;', None),
+    'total_assessment_tools': ('SELECT COUNT(*) AS value FROM assessment_tools;', None),
+    'evidence_level_distribution': (
+        'SELECT "evidenceLevel", COUNT(*) AS count FROM research_entries '
+        'GROUP BY "evidenceLevel" ORDER BY "evidenceLevel";',
+        None,
+    ),
+    'study_type_distribution': (
+        'SELECT "studyType", COUNT(*) AS count FROM research_entries '
+        'GROUP BY "studyType" ORDER BY count DESC;',
+        None,
+    ),
+    'recent_additions': (
+        'SELECT title, "addedDate" FROM research_entries ORDER BY "addedDate" DESC LIMIT 5;',
+        None,
+    ),
+}
+_SCALAR_STATS = {'total_research_entries', 'total_treatment_recommendations', 'total_assessment_tools'}
+
+
+class AsyncPrismaClient:
+    """Async counterpart of ``PrismaClient`` with a sync bridge for Flask views"""
+
+    def __init__(self, client: PrismaClient):
+        self.client = client
+        # Enough connections for one request's fan-out, plus a few in flight
+        self.pool_max_size = int(os.getenv('DB_ASYNC_POOL_MAX_SIZE', '8'))
+        self.timeout = client.pool_timeout
+        # Off by default: the single-statement stats query is as fast or faster
+        # at LAN latencies and holds one connection instead of six
+        self.enabled = os.getenv('DB_ASYNC', '0').lower() not in ('0', 'false', 'no')
+        self._loop = None
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """True when queries can go through the async pool (enabled, psycopg installed, pool backend)"""
+        return self.enabled and AsyncConnectionPool is not None and self.client.backend == 'pool'
+
+    def _start(self):
+        if self._pid is None:
+            atexit.register(self.close)
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name='async-db', daemon=True).start()
+
+        async def open_pool():
+            pool = AsyncConnectionPool(
+                _libpq_conninfo(self.client.db_url),
+                min_size=1,
+                max_size=self.pool_max_size,
+                timeout=self.timeout,
+                max_idle=self.client.pool_max_idle,
+                max_lifetime=self.client.pool_max_lifetime,
+                check=AsyncConnectionPool.check_connection,
+                kwargs={'row_factory': dict_row},
+                name='adhd-research-async',
+                open=False,
+            )
+            await pool.open()
+            return pool
+
+        self._pool = asyncio.run_coroutine_threadsafe(open_pool(), loop).result()
+        self._loop, self._pid = loop, os.getpid()
+
+    def run(self, coroutine):
+        """Run a coroutine on the client's loop from a synchronous thread and return its result"""
+        # A forked child inherits the loop object but not its thread
+        if self._loop is None or self._pid != os.getpid():
+            with self._lock:
+                if self._loop is None or self._pid != os.getpid():
+                    self._start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def close(self):
+        """Close the pool and stop the loop thread, if they were started"""
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                asyncio.run_coroutine_threadsafe(self._pool.close(), self._loop).result()
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = self._pool = None
+
+    async def query_raw(self, query: str, params: tuple = None, prepare: bool = None) -> List[Dict[str, Any]]:
+        """Execute raw SQL on a connection of the async pool (same contract as PrismaClient.query_raw)"""
+        started = time.perf_counter()
+        failed, rows = True, []
+        try:
+            async with self._pool.connection() as conn:
+                cur = await conn.execute(query, params, prepare=prepare)
+                rows = await cur.fetchall() if cur.description is not None else []
+            failed = False
+        except psycopg.Error as e:
+            print(f"Database query error: {e}")
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            observe_query(ASYNC_QUERY_METHOD, elapsed, len(rows), failed)
+            if query_tracer.enabled:
+                # Plans are captured on the sync pool, from the tracer's own thread
+                query_tracer.record(query, params, ASYNC_QUERY_METHOD, elapsed, len(rows), failed,
+                                    self.client.explain)
+        return rows
+
+    async def gather(self, queries: Sequence[Query]) -> List[List[Dict[str, Any]]]:
+        """Run independent (query, params) pairs concurrently, each on its own connection
+
+        If any query fails, its error is raised once the others have finished.
+        """
+        results = await asyncio.gather(
+            *(self.query_raw(query, params) for query, params in queries), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def get_research_stats(self) -> Dict[str, Any]:
+        """Same result as PrismaClient.get_research_stats(), with the six queries run at once"""
+        results = await self.gather(list(RESEARCH_STATS_QUERIES.values()))
+        stats = {}
+        for name, rows in zip(RESEARCH_STATS_QUERIES, results):
+            stats[name] = (rows[0]['value'] if rows else 0) if name in _SCALAR_STATS else rows
+        return stats
+
+
+# Global instance
+async_prisma = AsyncPrismaClient(prisma)
+register_pool('async', lambda: async_prisma._pool)
+
+
+def get_research_stats() -> Dict[str, Any]:
+    """Research statistics, fanned out over the async pool when it is available"""
+    if async_prisma.available:
+        return async_prisma.run(async_prisma.get_research_stats())
+    return prisma.get_research_stats()
@@ -0,0 +1,127 @@
+"""In-process caches for API responses
+
+Research data only changes when an ingest job runs, so cached values are
+stamped with the data version they were computed under (see
+``src.data_version``) and treated as misses once that version moves on.
+"""
+
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from flask import current_app, request
+
+
+class TTLCache:
+    """Thread-safe cache whose entries expire after ``ttl`` seconds or on a data version change"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Hashable, Tuple[float, Optional[int], Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Optional[int] = None) -> Any:
+        """Return the cached value, or None if missing, expired or from another version"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, entry_version, value = entry
+        if entry_version != version or time.monotonic() >= expires_at:
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, version, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ResponseCache:
+    """Bounded LRU of rendered responses keyed by route and query args
+
+    Wrap a view with ``@cache.cached`` to serve its 200 responses from
+    memory with a strong ETag, answering matching ``If-None-Match``
+    requests with 304. The whole cache is dropped when ``version()``
+    returns a new data version.
+    """
+
+    def __init__(self, max_entries: int, version: Callable[[], Optional[int]] = None):
+        self.max_entries = max_entries
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[bytes, str, str]]' = OrderedDict()
+        self._entries_version = None
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Optional[int] = None) -> Optional[Tuple[bytes, str, str]]:
+        """Return (body, etag, mimetype) for key, or None on a miss"""
+        with self._lock:
+            if version != self._entries_version:
+                self._entries.clear()
+                self._entries_version = version
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: Hashable, entry: Tuple[bytes, str, str], version: Optional[int] = None) -> None:
+        with self._lock:
+            if version != self._entries_version:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def cached(self, view):
+        """Decorator serving a JSON view through the cache"""
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            version = self.version() if self.version else None
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            entry = self.get(key, version)
+            if entry is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                body = response.get_data()
+                entry = (body, hashlib.blake2b(body, digest_size=16).hexdigest(), response.mimetype)
+                self.set(key, entry, version)
+
+            body, etag, mimetype = entry
+            response = current_app.response_class(body, mimetype=mimetype)
+            response.set_etag(etag)
+            # Clients may keep the body but must revalidate it with the ETag
+            response.headers['Cache-Control'] = 'no-cache'
+            return response.make_conditional(request)
+
+        return wrapper
@@ -0,0 +1,73 @@
+"""Data version token shared between ingest jobs and API processes
+
+``migrate_data.js`` (and anything else that writes research data) bumps the
+single row in the ``data_version`` table. API processes poll it at most
+every ``DATA_VERSION_POLL_SECONDS`` and use the value to invalidate their
+caches, so reading the current version is normally just a clock check.
+
+Bump the version by hand after editing data outside the ingest scripts:
+
+    python -m src.data_version bump
+"""
+
+import os
+import sys
+import threading
+import time
+
+from src.database_config import QUERY_ERRORS, PrismaClient, prisma
+
+
+class DataVersion:
+    """Process-local, rate-limited view of the ``data_version`` token"""
+
+    def __init__(self, client: PrismaClient, poll_interval: float = None):
+        self.client = client
+        self.poll_interval = poll_interval if poll_interval is not None else float(
+            os.getenv('DATA_VERSION_POLL_SECONDS', '5')
+        )
+        self._version = 0
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def current(self) -> int:
+        """Return the data version, re-reading it once the poll interval has passed"""
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.poll_interval:
+            with self._lock:
+                if self._checked_at is None or now - self._checked_at >= self.poll_interval:
+                    try:
+                        rows = self.client.query_raw('SELECT version FROM data_version WHERE id = 1;')
+                    except QUERY_ERRORS:
+                        # Keep the last known version; the query behind the response fails on its own
+                        rows = None
+                    if rows:
+                        self._version = int(rows[0]['version'])
+                    self._checked_at = now
+        return self._version
+
+    def bump(self) -> int:
+        """Increment the shared version, invalidating caches in every API process"""
+        rows = self.client.query_raw(
+            """
+            INSERT INTO data_version (id, version, "updatedAt") VALUES (1, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT (id) DO UPDATE
+                SET version = data_version.version + 1, "updatedAt" = CURRENT_TIMESTAMP
+            RETURNING version;
+            """
+        )
+        with self._lock:
+            if rows:
+                self._version = int(rows[0]['version'])
+            self._checked_at = time.monotonic()
+        return self._version
+
+
+# Global instance
+data_version = DataVersion(prisma)
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] != ['bump']:
+        sys.exit('usage: python -m src.data_version bump')
+    print(f"Data version is now {data_version.bump()}")
@@ -1,16 +1,229 @@
+import base64
 import os
+import re
 import subprocess
+import sys
 import json
-from typing import Dict, List, Any
+import threading
+import time
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from dotenv import load_dotenv
 
+from src.metrics import observe_query, register_pool
+from src.query_trace import query_tracer
+from src.result_decoding import NULL_SENTINEL, decode_csv
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+except ImportError:  # psycopg is optional; the psql backend still works without it
+    psycopg = None
+    ConnectionPool = None
+
+QUERY_ERRORS = (subprocess.CalledProcessError,) + ((psycopg.Error,) if psycopg else ())
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Matches a %s placeholder or an escaped %% literal
+_PLACEHOLDER_RE = re.compile(r'%[s%]')
+
+# Joins available to research entry listings, keyed by table alias
+RESEARCH_ENTRY_JOINS = {
+    'tp': 'LEFT JOIN target_populations tp ON re."targetPopulationId" = tp.id',
+    'm': 'LEFT JOIN methodologies m ON re."methodologyId" = m.id',
+    'kf': 'LEFT JOIN key_findings kf ON re."keyFindingsId" = kf.id',
+    'wr': 'LEFT JOIN workplace_relevance wr ON re."workplaceRelevanceId" = wr.id',
+    'qa': 'LEFT JOIN quality_assessments qa ON re."qualityAssessmentId" = qa.id',
+    'ca': 'LEFT JOIN clinical_applications ca ON re."clinicalApplicationsId" = ca.id',
+}
+
+# Projectable research entry fields: name -> (SQL expression, join alias or None)
+RESEARCH_ENTRY_FIELDS = {
+    'id': ('re.id', None),
+    'title': ('re.title', None),
+    'authors': ('re.authors', None),
+    'journal': ('re.journal', None),
+    'publicationDate': ('re."publicationDate"', None),
+    'doi': ('re.doi', None),
+    'studyType': ('re."studyType"', None),
+    'evidenceLevel': ('re."evidenceLevel"', None),
+    'sampleSize': ('re."sampleSize"', None),
+    'ageRange': ('tp."ageRange"', 'tp'),
+    'gender': ('tp.gender', 'tp'),
+    'occupation': ('tp.occupation', 'tp'),
+    'adhdSubtype': ('tp."adhdSubtype"', 'tp'),
+    'design': ('m.design', 'm'),
+    'duration': ('m.duration', 'm'),
+    'primaryResults': ('kf."primaryResults"', 'kf'),
+    'clinicalSignificance': ('kf."clinicalSignificance"', 'kf'),
+    'productivityImpact': ('wr."productivityImpact"', 'wr'),
+    'accommodationNeeds': ('wr."accommodationNeeds"', 'wr'),
+    'careerImplications': ('wr."careerImplications"', 'wr'),
+    'riskOfBias': ('qa."riskOfBias"', 'qa'),
+    'gradeRating': ('qa."gradeRating"', 'qa'),
+    'diagnosticUtility': ('ca."diagnosticUtility"', 'ca'),
+}
+
+# Columns stored on research_entries itself (no joins needed)
+RESEARCH_ENTRY_BASE_FIELDS = [
+    'id', 'title', 'authors', 'journal', 'publicationDate', 'doi', 'studyType', 'evidenceLevel', 'sampleSize',
+]
+
+# Default listing shape, matching what GET /api/research has always returned
+RESEARCH_ENTRY_DEFAULT_FIELDS = RESEARCH_ENTRY_BASE_FIELDS + [
+    'ageRange', 'gender', 'occupation', 'adhdSubtype', 'design', 'duration',
+    'primaryResults', 'clinicalSignificance', 'productivityImpact', 'careerImplications',
+    'riskOfBias', 'gradeRating', 'diagnosticUtility',
+]
+
+MAX_PAGE_SIZE = 500
+MAX_BATCH_IDS = 500
+
+# Full detail view of research entries, one row per id in the bound text[].
+# The single-id and batch routes share this text so they share one prepared statement.
+RESEARCH_ENTRY_DETAIL_SQL = """
+    SELECT
+        re.id, re.title, re.authors, re.journal, re."publicationDate", re.doi,
+        re."studyType", re."evidenceLevel", re."sampleSize",
+        re."createdAt", re."updatedAt", re."addedDate", re."lastReviewed",
+        tp."ageRange", tp.gender, tp.occupation, tp."adhdSubtype",
+        m.design, m.duration, m."primaryOutcomes", m."secondaryOutcomes",
+        kf."primaryResults", kf."effectSizes", kf."clinicalSignificance", kf.limitations,
+        wr."productivityImpact", wr."accommodationNeeds", wr."careerImplications",
+        qa."riskOfBias", qa."gradeRating", qa."reviewerNotes",
+        ca."diagnosticUtility", ca."treatmentRecommendations", ca."monitoringParameters",
+        ARRAY(
+            SELECT t.name FROM "_ResearchEntryTags" rt JOIN tags t ON t.id = rt."B"
+            WHERE rt."A" = re.id ORDER BY t.name
+        ) AS tags
+    FROM research_entries re
+    LEFT JOIN target_populations tp ON re."targetPopulationId" = tp.id
+    LEFT JOIN methodologies m ON re."methodologyId" = m.id
+    LEFT JOIN key_findings kf ON re."keyFindingsId" = kf.id
+    LEFT JOIN workplace_relevance wr ON re."workplaceRelevanceId" = wr.id
+    LEFT JOIN quality_assessments qa ON re."qualityAssessmentId" = qa.id
+    LEFT JOIN clinical_applications ca ON re."clinicalApplicationsId" = ca.id
+    WHERE re.id = ANY(%s::text[])
+"""
+
+# Facet values of every research entry in listing order, for src.facet_index
+RESEARCH_FACET_ROWS_SQL = """
+    SELECT
+        re.id, re."evidenceLevel", re."studyType",
+        CASE WHEN wr."productivityImpact" IS NOT NULL AND wr."productivityImpact" != '' THEN 1 ELSE 0 END
+            AS "workplaceFocus",
+        COALESCE(entry_tags.tags, '{}') AS tags
+    FROM research_entries re
+    LEFT JOIN workplace_relevance wr ON re."workplaceRelevanceId" = wr.id
+    LEFT JOIN (
+        SELECT rt."A" AS id, array_agg(t.name ORDER BY t.name) AS tags
+        FROM "_ResearchEntryTags" rt JOIN tags t ON t.id = rt."B"
+        GROUP BY rt."A"
+    ) entry_tags ON entry_tags.id = re.id
+    ORDER BY re."publicationDate" DESC, re.id DESC
+"""
+
+# Text indexed by src.related_research for "related entries", one row per entry
+RESEARCH_TEXT_ROWS_SQL = """
+    SELECT
+        re.id, re.title, kf."primaryResults", kf."clinicalSignificance",
+        wr."productivityImpact", wr."careerImplications",
+        COALESCE(entry_tags.tags, '{}') AS tags
+    FROM research_entries re
+    LEFT JOIN key_findings kf ON re."keyFindingsId" = kf.id
+    LEFT JOIN workplace_relevance wr ON re."workplaceRelevanceId" = wr.id
+    LEFT JOIN (
+        SELECT rt."A" AS id, array_agg(t.name ORDER BY t.name) AS tags
+        FROM "_ResearchEntryTags" rt JOIN tags t ON t.id = rt."B"
+        GROUP BY rt."A"
+    ) entry_tags ON entry_tags.id = re.id
+    ORDER BY re.id
+"""
+
+# Search relevance, computed against the prefix tsquery bound to the first %s
+SEARCH_RANK_SQL = 'ts_rank_cd(re."searchVector", to_tsquery(\'english\', %s))'
+
+# Words in a search term; everything else (tsquery operators, quotes) is dropped
+_SEARCH_WORD_RE = re.compile(r'\w+')
+
+
+def prefix_tsquery(search_term: str) -> Optional[str]:
+    """Turn free text into a tsquery matching every word as a prefix
+
+    ``"stress manag"`` becomes ``"stress:* & manag:*"``. Returns None when
+    the term contains no words.
+    """
+    words = _SEARCH_WORD_RE.findall(search_term)
+    if not words:
+        return None
+    return ' & '.join(f'{word}:*' for word in words)
+
+
+def encode_cursor(row: Dict[str, Any], ranked: bool = False) -> str:
+    """Opaque keyset cursor pointing just past ``row`` in listing order
+
+    Search results are ordered by relevance first, so their cursors also
+    carry the row's searchRank.
+    """
+    published = row['publicationDate']
+    if not isinstance(published, str):
+        published = published.isoformat()
+    key = [published, row['id']]
+    if ranked:
+        key.append(row['searchRank'])
+    payload = json.dumps(key, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, ranked: bool = False) -> Tuple[Any, ...]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor') from None
+    if (
+        not isinstance(key, list)
+        or len(key) != (3 if ranked else 2)
+        or not all(isinstance(part, str) for part in key[:2])
+        or (ranked and not isinstance(key[2], (int, float)))
+    ):
+        raise ValueError('Invalid cursor')
+    return tuple(key)
+
+
+def _libpq_conninfo(db_url: str) -> str:
+    """Translate a Prisma-style DATABASE_URL into a libpq connection URI
+
+    Prisma accepts ``?schema=public`` but libpq rejects unknown URI
+    parameters, so the schema is moved into ``options=-csearch_path=...``.
+    """
+    parts = urlsplit(db_url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    schema = None
+    kept = []
+    for key, value in query:
+        if key == 'schema':
+            schema = value
+        else:
+            kept.append((key, value))
+    if schema:
+        kept.append(('options', f'-csearch_path={schema}'))
+    return urlunsplit(parts._replace(query=urlencode(kept)))
+
+
 class PrismaClient:
-    """Simple wrapper for Prisma CLI operations"""
+    """Simple wrapper for Prisma-managed PostgreSQL access
+
+    Queries run through a pooled psycopg connection by default. Set
+    ``DB_BACKEND=psql`` (or run without psycopg installed) to fall back to
+    shelling out to the ``psql`` CLI for each query.
+    """
 
-    def __init__(self, schema_path: str = None, db_url: str = None):
+    def __init__(self, schema_path: str = None, db_url: str = None, backend: str = None):
         # Use environment variables with fallback defaults
         self.schema_path = schema_path or os.getenv('PRISMA_SCHEMA_PATH') or os.path.expanduser("~/Projects/adhd-research-database/prisma/schema.prisma")
         self.db_url = db_url or os.getenv('DATABASE_URL')
@@ -22,145 +235,393 @@ class PrismaClient:
             )
 
         self.psql_path = os.getenv('PSQL_PATH', '/opt/homebrew/opt/postgresql@14/bin/psql')
-    
-    def query_raw(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
-        """Execute raw SQL query using psql
+
+        self.backend = (backend or os.getenv('DB_BACKEND') or ('pool' if ConnectionPool else 'psql')).lower()
+        if self.backend not in ('pool', 'psql'):
+            raise ValueError(f"Unknown DB_BACKEND '{self.backend}'. Expected 'pool' or 'psql'.")
+        if self.backend == 'pool' and ConnectionPool is None:
+            raise ValueError(
+                "DB_BACKEND=pool requires psycopg. "
+                "Install it with: pip install 'psycopg[binary,pool]'"
+            )
+
+        # Pool settings, only used by the pool backend
+        self.pool_min_size = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+        self.pool_max_size = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+        self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+        self.pool_max_idle = float(os.getenv('DB_POOL_MAX_IDLE', '300'))
+        self.pool_max_lifetime = float(os.getenv('DB_POOL_MAX_LIFETIME', '3600'))
+
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        """Connection pool, opened lazily on first use"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(
+                        _libpq_conninfo(self.db_url),
+                        min_size=self.pool_min_size,
+                        max_size=self.pool_max_size,
+                        timeout=self.pool_timeout,
+                        max_idle=self.pool_max_idle,
+                        max_lifetime=self.pool_max_lifetime,
+                        # Ping connections on checkout so a restarted server
+                        # never hands a dead connection to a request
+                        check=ConnectionPool.check_connection,
+                        kwargs={'row_factory': dict_row},
+                        name='adhd-research',
+                        open=True,
+                    )
+        return self._pool
+
+    def close(self):
+        """Close the connection pool, if one was opened"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
+    def query_raw(self, query: str, params: tuple = None, prepare: bool = None) -> List[Dict[str, Any]]:
+        """Execute raw SQL query
 
         Args:
-            query: SQL query string (use %s for parameterized queries)
+            query: SQL query string (use %s for parameterized queries and %% for a literal %)
             params: Optional tuple of parameters for parameterized queries
+            prepare: Prepare the statement on first use rather than after
+                psycopg's default threshold (pool backend only)
+
+        Raises:
+            psycopg.Error or subprocess.CalledProcessError (psql backend) if
+            the query fails; a failure is never reported as an empty result
         """
+        # Metrics are labelled with the PrismaClient method (or other caller) running the query
+        method = sys._getframe(1).f_code.co_name
+        started = time.perf_counter()
+        failed, rows = True, []
         try:
-            # If params are provided, escape them for PostgreSQL
-            if params:
-                # This is a simple approach - in production consider using psycopg2
-                escaped_params = []
-                for param in params:
-                    if param is None:
-                        escaped_params.append('NULL')
-                    elif isinstance(param, (int, float)):
-                        escaped_params.append(str(param))
-                    else:
-                        # Escape single quotes and wrap in quotes
-                        escaped_param = str(param).replace("'", "''")
-                        escaped_params.append(f"'{escaped_param}'")
-
-                # Replace %s placeholders with escaped values
-                formatted_query = query
-                for param in escaped_params:
-                    formatted_query = formatted_query.replace('%s', param, 1)
-                query = formatted_query
-
-            cmd = [
-                self.psql_path,
-                self.db_url,
-                "-c", query,
-                "-t",  # tuples only
-                "--csv"  # CSV output
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            
-            # Parse CSV output
-            lines = result.stdout.strip().split('\n')
-            if not lines or not lines[0]:
-                return []
-            
-            # Handle simple single value results (like COUNT)
-            if len(lines) == 1 and lines[0].strip() and not ',' in lines[0]:
-                # Single value result (like COUNT)
-                return [{'count': int(lines[0].strip())}]
-            
-            # Handle CSV data (no headers in psql CSV output)
-            data = []
-            for line in lines:
-                if line.strip():
-                    # Split by comma, but handle quoted fields
-                    import csv
-                    import io
-                    csv_reader = csv.reader(io.StringIO(line))
-                    values = next(csv_reader)
-                    
-                    # For now, return as simple dict with indexed keys
-                    # This is a simplified approach - in production you'd want proper column names
-                    if len(values) == 1:
-                        row = {"result": values[0]}
-                    else:
-                        row = {f"col_{i}": value for i, value in enumerate(values)}
-                    data.append(row)
-            
-            return data
-        except subprocess.CalledProcessError as e:
+            if self.backend == 'psql':
+                rows = self._query_psql(query, params)
+            else:
+                rows = self._query_pool(query, params, prepare)
+            failed = False
+        except QUERY_ERRORS as e:
             print(f"Database query error: {e}")
-            print(f"Command output: {e.stdout}")
-            print(f"Command error: {e.stderr}")
-            return []
-    
+            if isinstance(e, subprocess.CalledProcessError):
+                print(f"Command output: {e.stdout}")
+                print(f"Command error: {e.stderr}")
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            observe_query(method, elapsed, len(rows), failed)
+            if query_tracer.enabled:
+                query_tracer.record(query, params, method, elapsed, len(rows), failed, self.explain)
+        return rows
+
+    def _query_pool(self, query: str, params: tuple = None, prepare: bool = None) -> List[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            # psycopg sends params separately from the SQL text, so the
+            # server binds them ($1, $2, ...) rather than us quoting them
+            cur = conn.execute(query, params, prepare=prepare)
+            if cur.description is None:
+                return []
+            return cur.fetchall()
+
+    def ping(self, timeout: float = 5) -> None:
+        """One round trip to the database; raises if it does not answer within timeout seconds"""
+        if self.backend == 'psql':
+            subprocess.run(
+                [self.psql_path, _libpq_conninfo(self.db_url), '-c', 'SELECT 1', '--quiet'],
+                capture_output=True, check=True, timeout=timeout,
+            )
+            return
+        with self.pool.connection(timeout=timeout) as conn:
+            conn.execute('SELECT 1')
+
+    def explain(self, query: str, params: tuple = None, timeout: float = 10) -> List[str]:
+        """Lines of EXPLAIN (ANALYZE, BUFFERS) for a query, run read-only and rolled back
+
+        ANALYZE executes the query, so this is for SELECTs; the read-only
+        transaction makes anything else fail rather than write. Raises on
+        errors, including exceeding ``timeout`` seconds.
+        """
+        explain_sql = 'EXPLAIN (ANALYZE, BUFFERS) ' + query
+        timeout_ms = int(timeout * 1000)
+        if self.backend == 'psql':
+            if params:
+                explain_sql = self._interpolate(explain_sql, params)
+            elif '%%' in explain_sql:
+                explain_sql = explain_sql.replace('%%', '%')
+            # Each -c runs in the same session; psql discards it on exit
+            result = subprocess.run(
+                [
+                    self.psql_path, _libpq_conninfo(self.db_url), '--quiet', '--csv',
+                    '-c', f'SET statement_timeout = {timeout_ms}',
+                    '-c', 'SET default_transaction_read_only = on',
+                    '-c', explain_sql,
+                ],
+                capture_output=True, text=True, check=True, timeout=timeout + 5,
+            )
+            return [row['QUERY PLAN'] for row in decode_csv(result.stdout)]
+        with self.pool.connection(timeout=timeout) as conn:
+            with conn.transaction(force_rollback=True):
+                conn.execute('SET TRANSACTION READ ONLY')
+                conn.execute(f'SET LOCAL statement_timeout = {timeout_ms}')
+                cur = conn.execute(explain_sql, params)
+                return [row['QUERY PLAN'] for row in cur.fetchall()]
+
+    @staticmethod
+    def _interpolate(query: str, params: tuple) -> str:
+        """Inline params into query for the psql backend, which cannot bind them"""
+        escaped_params = []
+        for param in params:
+            if param is None:
+                escaped_params.append('NULL')
+            elif isinstance(param, bool):
+                escaped_params.append('TRUE' if param else 'FALSE')
+            elif isinstance(param, (int, float)):
+                escaped_params.append(str(param))
+            elif isinstance(param, (list, tuple)):
+                items = ("'" + str(item).replace("'", "''") + "'" for item in param)
+                escaped_params.append(f"ARRAY[{', '.join(items)}]" if param else "'{}'")
+            else:
+                # Escape single quotes and wrap in quotes
+                escaped_param = str(param).replace("'", "''")
+                escaped_params.append(f"'{escaped_param}'")
+
+        remaining = iter(escaped_params)
+
+        def substitute(match):
+            if match.group(0) == '%%':
+                return '%'
+            return next(remaining)
+
+        return _PLACEHOLDER_RE.sub(substitute, query)
+
+    def _query_psql(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+        """Execute raw SQL query using psql (fallback backend)"""
+        # psql cannot bind parameters, so escape and inline them
+        if params:
+            query = self._interpolate(query, params)
+        elif '%%' in query:
+            query = query.replace('%%', '%')
+
+        cmd = [
+            self.psql_path,
+            _libpq_conninfo(self.db_url),
+            "-c", query,
+            "--quiet",  # no command status lines
+            "--csv",  # CSV output with a header row
+            "--pset", f"null={NULL_SENTINEL}",
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return decode_csv(result.stdout)
+
     def find_many_research_entries(self, include_relations: bool = True) -> List[Dict[str, Any]]:
         """Get all research entries with related data"""
-        if include_relations:
-            query = """
-            SELECT 
-                re.id, re.title, re.authors::text, re.journal, re."publicationDate"::text,
-                re.doi, re."studyType", re."evidenceLevel", re."sampleSize"::text,
-                tp."ageRange", tp.gender, tp.occupation, tp."adhdSubtype",
-                m.design, m.duration,
-                kf."primaryResults", kf."clinicalSignificance",
-                wr."productivityImpact", wr."careerImplications",
-                qa."riskOfBias", qa."gradeRating",
-                ca."diagnosticUtility"
-            FROM research_entries re
-            LEFT JOIN target_populations tp ON re."targetPopulationId" = tp.id
-            LEFT JOIN methodologies m ON re."methodologyId" = m.id
-            LEFT JOIN key_findings kf ON re."keyFindingsId" = kf.id
-            LEFT JOIN workplace_relevance wr ON re."workplaceRelevanceId" = wr.id
-            LEFT JOIN quality_assessments qa ON re."qualityAssessmentId" = qa.id
-            LEFT JOIN clinical_applications ca ON re."clinicalApplicationsId" = ca.id
-            ORDER BY re."publicationDate" DESC;
-            """
-        else:
-            query = """SELECT id, title, authors::text, journal, "publicationDate"::text, doi, "studyType", "evidenceLevel", "sampleSize"::text FROM research_entries ORDER BY "publicationDate" DESC;"""
-        
-        raw_data = self.query_raw(query)
-        
-        # Convert the generic column data to proper field names
-        if include_relations:
-            column_names = [
-                'id', 'title', 'authors', 'journal', 'publicationDate', 'doi', 'studyType', 'evidenceLevel', 'sampleSize',
-                'ageRange', 'gender', 'occupation', 'adhdSubtype', 'design', 'duration',
-                'primaryResults', 'clinicalSignificance', 'productivityImpact', 'careerImplications',
-                'riskOfBias', 'gradeRating', 'diagnosticUtility'
-            ]
-        else:
-            column_names = ['id', 'title', 'authors', 'journal', 'publicationDate', 'doi', 'studyType', 'evidenceLevel', 'sampleSize']
-        
-        result = []
-        for row in raw_data:
-            if 'col_0' in row:  # Generic column names
-                new_row = {}
-                for i, col_name in enumerate(column_names):
-                    col_key = f'col_{i}'
-                    if col_key in row:
-                        # Handle special cases
-                        if col_name == 'authors' and row[col_key]:
-                            # Convert PostgreSQL array string back to list
-                            authors_str = row[col_key].strip('{}')
-                            if authors_str:
-                                new_row[col_name] = [a.strip('\"\'') for a in authors_str.split(',')]
-                            else:
-                                new_row[col_name] = []
-                        elif col_name in ['sample_size'] and row[col_key]:
-                            try:
-                                new_row[col_name] = int(row[col_key])
-                            except:
-                                new_row[col_name] = row[col_key]
-                        else:
-                            new_row[col_name] = row[col_key]
-                result.append(new_row)
+        fields = RESEARCH_ENTRY_DEFAULT_FIELDS if include_relations else RESEARCH_ENTRY_BASE_FIELDS
+        rows, _ = self.find_research_entries(fields=fields)
+        return rows
+
+    def find_research_entries(
+        self,
+        fields: Iterable[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        evidence_level: Optional[str] = None,
+        workplace_focus: bool = False,
+        search: Optional[str] = None,
+        ids: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get research entries newest first, optionally one keyset page at a time
+
+        Only the joins needed by the requested ``fields`` and filters are
+        added to the query. Pages are ordered by (publicationDate, id) and
+        ``cursor`` is the ``next_cursor`` returned with the previous page.
+
+        With ``search``, entries are matched against the full-text
+        ``searchVector`` index (every word as a prefix), ordered by
+        relevance first and returned with a ``searchRank``. ``ids``
+        restricts the listing to those entries.
+
+        Returns:
+            (rows, next_cursor) where next_cursor is None on the last page
+        """
+        fields = list(fields) if fields else list(RESEARCH_ENTRY_DEFAULT_FIELDS)
+        if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+        built = self._research_entries_query(fields, limit, cursor, evidence_level, workplace_focus, search, ids)
+        if built is None:
+            return [], None
+        query, params, selected, ranked = built
+
+        rows = self.query_raw(query, params)
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1], ranked=ranked)
+        if 'publicationDate' not in fields and 'publicationDate' in selected:
+            for row in rows:
+                del row['publicationDate']
+        return rows, next_cursor
+
+    def stream_research_entries(
+        self,
+        fields: Iterable[str] = None,
+        evidence_level: Optional[str] = None,
+        workplace_focus: bool = False,
+        search: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Iterate over every matching research entry in batches of ``batch_size`` rows
+
+        Same filters and ordering as find_research_entries. The pool backend
+        reads through a server-side cursor; the psql backend walks keyset
+        pages. Either way only one batch is held in memory at a time.
+        Arguments are validated before the first batch is requested.
+        """
+        fields = list(fields) if fields else list(RESEARCH_ENTRY_DEFAULT_FIELDS)
+        built = self._research_entries_query(fields, None, None, evidence_level, workplace_focus, search)
+        if built is None:
+            return iter(())
+
+        if self.backend == 'psql':
+            return self._stream_research_pages(fields, evidence_level, workplace_focus, search, batch_size)
+        query, params, _, _ = built
+        return self._stream_server_side(query, params, batch_size)
+
+    def _stream_server_side(self, query: str, params: tuple, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        with self.pool.connection() as conn:
+            # A named cursor keeps the result set on the server; the
+            # transaction it needs is rolled back when the connection returns
+            with conn.cursor(name='research_export') as cur:
+                cur.execute(query, params)
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+
+    def _stream_research_pages(self, fields, evidence_level, workplace_focus, search, batch_size):
+        cursor = None
+        batch_size = min(batch_size, MAX_PAGE_SIZE)
+        while True:
+            rows, cursor = self.find_research_entries(
+                fields=fields,
+                limit=batch_size,
+                cursor=cursor,
+                evidence_level=evidence_level,
+                workplace_focus=workplace_focus,
+                search=search,
+            )
+            if rows:
+                yield rows
+            if cursor is None:
+                break
+
+    def _research_entries_query(self, fields, limit, cursor, evidence_level, workplace_focus, search, ids=None):
+        """Build the research entry listing query
+
+        Returns:
+            (query, params, selected field names, ranked), or None when the
+            search term has no searchable words
+        """
+        unknown = [name for name in fields if name not in RESEARCH_ENTRY_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+
+        # id is always returned; publicationDate is needed to build the next cursor
+        selected = ['id'] + [name for name in fields if name != 'id']
+        if limit is not None and 'publicationDate' not in selected:
+            selected.append('publicationDate')
+
+        aliases = {RESEARCH_ENTRY_FIELDS[name][1] for name in selected}
+        conditions = []
+        params = []
+        order_by = ['re."publicationDate" DESC', 're.id DESC']
+        keyset = ['re."publicationDate"', 're.id']
+        keyset_params = ['%s::timestamp', '%s']
+
+        tsquery = None
+        if search is not None:
+            tsquery = prefix_tsquery(search)
+            if tsquery is None:
+                return None
+            conditions.append('re."searchVector" @@ to_tsquery(\'english\', %s)')
+            params.append(tsquery)
+            order_by.insert(0, '"searchRank" DESC')
+            keyset.insert(0, SEARCH_RANK_SQL)
+            keyset_params.insert(0, '%s::real')
+
+        if evidence_level:
+            conditions.append('re."evidenceLevel" = %s')
+            params.append(evidence_level)
+        if ids is not None:
+            conditions.append('re.id = ANY(%s::text[])')
+            params.append(list(ids))
+        if workplace_focus:
+            aliases.add('wr')
+            conditions.append("""wr."productivityImpact" IS NOT NULL AND wr."productivityImpact" != ''""")
+        if cursor:
+            key = decode_cursor(cursor, ranked=tsquery is not None)
+            conditions.append(f"({', '.join(keyset)}) < ({', '.join(keyset_params)})")
+            if tsquery is not None:
+                # The rank expression binds the tsquery before the cursor values
+                params.extend([tsquery, key[2], key[0], key[1]])
             else:
-                result.append(row)
-        
-        return result
+                params.extend(key)
+
+        columns = [f'{RESEARCH_ENTRY_FIELDS[name][0]} AS "{name}"' for name in selected]
+        select_params = []
+        if tsquery is not None:
+            columns.append(f'{SEARCH_RANK_SQL} AS "searchRank"')
+            select_params.append(tsquery)
+        columns = ',\n                '.join(columns)
+        joins = '\n            '.join(sql for alias, sql in RESEARCH_ENTRY_JOINS.items() if alias in aliases)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        query = f"""
+            SELECT
+                {columns}
+            FROM research_entries re
+            {joins}
+            {where}
+            ORDER BY {', '.join(order_by)}
+        """
+        if limit is not None:
+            # One extra row tells us whether another page exists
+            query += 'LIMIT %s'
+            params.append(limit + 1)
+
+        return query, tuple(select_params + params), selected, tsquery is not None
     
+    def find_research_entries_by_ids(self, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Get the full detail view of research entries in one round trip
+
+        Rows come back in the order of ``ids``; unknown ids are skipped and
+        duplicates are returned once.
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        if len(ids) > MAX_BATCH_IDS:
+            raise ValueError(f"At most {MAX_BATCH_IDS} ids can be requested at once")
+
+        rows = self.query_raw(RESEARCH_ENTRY_DETAIL_SQL, (ids,), prepare=True)
+        by_id = {row['id']: row for row in rows}
+        return [by_id[research_id] for research_id in ids if research_id in by_id]
+
+    def find_research_facet_rows(self) -> List[Dict[str, Any]]:
+        """id, evidenceLevel, studyType, workplaceFocus (0/1) and tags of every entry, newest first"""
+        return self.query_raw(RESEARCH_FACET_ROWS_SQL)
+
+    def find_research_text_rows(self) -> List[Dict[str, Any]]:
+        """id, title, findings, workplace text and tags of every entry, by id"""
+        return self.query_raw(RESEARCH_TEXT_ROWS_SQL)
+
     def find_many_treatment_recommendations(self) -> List[Dict[str, Any]]:
         """Get all treatment recommendations"""
         query = "SELECT * FROM treatment_recommendations ORDER BY recommendation_strength, evidence_level;"
@@ -172,39 +633,67 @@ class PrismaClient:
         return self.query_raw(query)
     
     def search_research_entries(self, search_term: str) -> List[Dict[str, Any]]:
-        """Search research entries by title, authors, or journal
+        """Full-text search of research entries, most relevant first
+
+        Matches title, authors, journal and key findings through the
+        ``searchVector`` GIN index; each word in ``search_term`` is
+        matched as a prefix.
 
         SECURITY: Uses parameterized query to prevent SQL injection
         """
-        # Use parameterized query with %s placeholders
+        rows, _ = self.find_research_entries(fields=RESEARCH_ENTRY_BASE_FIELDS, search=search_term)
+        return rows
+    
+    def get_research_stats(self) -> Dict[str, Any]:
+        """Get database statistics in a single round trip"""
         query = """
-        SELECT * FROM research_entries
-        WHERE title ILIKE '%' || %s || '%'
-           OR array_to_string(authors, ', ') ILIKE '%' || %s || '%'
-           OR journal ILIKE '%' || %s || '%'
-        ORDER BY publication_date DESC;
+        WITH
+            evidence_levels AS (
+                SELECT "evidenceLevel", COUNT(*) AS count
+                FROM research_entries
+                GROUP BY "evidenceLevel"
+            ),
+            study_types AS (
+                SELECT "studyType", COUNT(*) AS count
+                FROM research_entries
+                GROUP BY "studyType"
+            ),
+            recent AS (
+                SELECT title, "addedDate"
+                FROM research_entries
+                ORDER BY "addedDate" DESC
+                LIMIT 5
+            )
+        SELECT json_build_object(
+            'total_research_entries', (SELECT COUNT(*) FROM research_entries),
+            'total_treatment_recommendations', (SELECT COUNT(*) FROM treatment_recommendations),
+            'total_assessment_tools', (SELECT COUNT(*) FROM assessment_tools),
+            'evidence_level_distribution',
+                (SELECT coalesce(json_agg(e ORDER BY e."evidenceLevel"), '[]') FROM evidence_levels e),
+            'study_type_distribution',
+                (SELECT coalesce(json_agg(s ORDER BY s.count DESC), '[]') FROM study_types s),
+            'recent_additions',
+                (SELECT coalesce(json_agg(r ORDER BY r."addedDate" DESC), '[]') FROM recent r)
+        ) AS stats;
         """
-        return self.query_raw(query, (search_term, search_term, search_term))
+        rows = self.query_raw(query)
+        return rows[0]['stats'] if rows else {}
     
     def get_research_by_evidence_level(self, evidence_level: str) -> List[Dict[str, Any]]:
         """Get research entries by evidence level
 
         SECURITY: Uses parameterized query to prevent SQL injection
         """
-        query = "SELECT * FROM research_entries WHERE evidence_level = %s ORDER BY publication_date DESC;"
-        return self.query_raw(query, (evidence_level,))
+        rows, _ = self.find_research_entries(fields=RESEARCH_ENTRY_BASE_FIELDS, evidence_level=evidence_level)
+        return rows
     
     def get_workplace_focused_research(self) -> List[Dict[str, Any]]:
         """Get research entries with workplace relevance"""
-        query = """
-        SELECT re.*, wr.productivity_impact, wr.accommodation_needs, wr.career_implications
-        FROM research_entries re
-        JOIN workplace_relevance wr ON re.workplace_relevance_id = wr.id
-        WHERE wr.productivity_impact IS NOT NULL AND wr.productivity_impact != ''
-        ORDER BY re.publication_date DESC;
-        """
-        return self.query_raw(query)
+        fields = RESEARCH_ENTRY_BASE_FIELDS + ['productivityImpact', 'accommodationNeeds', 'careerImplications']
+        rows, _ = self.find_research_entries(fields=fields, workplace_focus=True)
+        return rows
 
 # Global instance
 prisma = PrismaClient()
+register_pool('sync', lambda: prisma._pool)
 
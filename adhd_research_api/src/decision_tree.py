@@ -0,0 +1,502 @@
+"""Compiled evaluator for the treatment decision tree
+
+``phase4/decision_trees/treatment_decision_tree.json`` routes a patient
+profile through nodes whose branches carry conditions such as
+
+    score >= 26 && score <= 50
+
+Conditions are parsed once, when the tree is loaded, into nested closures;
+nothing is ever passed to ``eval``. When every branch of a node is a range
+test on the same numeric field (the usual case), the node is further
+compiled into an interval table: the branch boundaries are sorted once and
+routing a value is one ``bisect`` (or one ``np.searchsorted`` for a whole
+batch of profiles).
+
+Condition grammar:
+
+    expr       := and ('||' and)*
+    and        := unary ('&&' unary)*
+    unary      := '!' unary | '(' expr ')' | comparison | operand
+    comparison := operand op operand
+    op         := < | <= | > | >= | == | !=
+    operand    := number | "string" | 'string' | true | false | field
+
+A field is a profile key, dotted for nested objects (``labs.tsh``). A bare
+field is true when the profile value is truthy, which is how the list
+conditions of ``treatment_pathways`` (``no_contraindications``) are read.
+Comparisons against a missing or non-numeric value are false.
+
+A node routes by its ``branches`` (first matching ``condition``) or its
+``treatment_pathways`` (first pathway whose ``conditions`` all hold); the
+``next_node`` of a clinical pathway step is followed unconditionally.
+"""
+
+import json
+import math
+import operator
+import os
+import re
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_DECISION_TREE_JSON = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'phase4', 'decision_trees', 'treatment_decision_tree.json',
+)
+
+OPERATORS = {
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    '==': operator.eq, '!=': operator.ne,
+}
+# a op b  <=>  b FLIPPED[op] a
+FLIPPED = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '==': '==', '!=': '!='}
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<string>"[^"]*"|'[^']*')
+      | (?P<op>&&|\|\||<=|>=|==|!=|<|>|!|\(|\))
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)
+    )""", re.VERBOSE)
+
+
+class ConditionError(ValueError):
+    """A branch condition that cannot be parsed"""
+
+
+def _tokenize(condition: str) -> List[Tuple[str, Any]]:
+    tokens, position = [], 0
+    condition = condition.rstrip()
+    while position < len(condition):
+        match = _TOKEN_RE.match(condition, position)
+        if match is None:
+            raise ConditionError(f"Unexpected character {condition[position:].lstrip()[:1]!r} in {condition!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'number':
+            tokens.append(('const', float(text) if '.' in text else int(text)))
+        elif kind == 'string':
+            tokens.append(('const', text[1:-1]))
+        elif kind == 'name' and text in ('true', 'false'):
+            tokens.append(('const', text == 'true'))
+        else:
+            tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing a small tuple AST
+
+    ('or', [..]) | ('and', [..]) | ('not', x) | ('cmp', left, op, right) |
+    ('field', path) | ('const', value)
+    """
+
+    def __init__(self, condition: str):
+        self.condition = condition
+        self.tokens = _tokenize(condition)
+        self.pos = 0
+
+    def parse(self):
+        if not self.tokens:
+            raise ConditionError('Empty condition')
+        node = self._or()
+        if self.pos != len(self.tokens):
+            raise ConditionError(f"Unexpected {self.tokens[self.pos][1]!r} in {self.condition!r}")
+        return node
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos][1] if self.pos < len(self.tokens) and self.tokens[self.pos][0] == 'op' else None
+
+    def _or(self):
+        items = [self._and()]
+        while self._peek() == '||':
+            self.pos += 1
+            items.append(self._and())
+        return items[0] if len(items) == 1 else ('or', items)
+
+    def _and(self):
+        items = [self._unary()]
+        while self._peek() == '&&':
+            self.pos += 1
+            items.append(self._unary())
+        return items[0] if len(items) == 1 else ('and', items)
+
+    def _unary(self):
+        if self._peek() == '!':
+            self.pos += 1
+            return ('not', self._unary())
+        if self._peek() == '(':
+            self.pos += 1
+            node = self._or()
+            if self._peek() != ')':
+                raise ConditionError(f"Expected ')' to close '(' in {self.condition!r}")
+            self.pos += 1
+            return node
+        left = self._operand()
+        op = self._peek()
+        if op in OPERATORS:
+            self.pos += 1
+            return ('cmp', left, op, self._operand())
+        return left
+
+    def _operand(self):
+        if self.pos >= len(self.tokens):
+            raise ConditionError(f"Condition {self.condition!r} ends early")
+        kind, value = self.tokens[self.pos]
+        if kind == 'op':
+            raise ConditionError(f"Expected a field or a value but found {value!r} in {self.condition!r}")
+        self.pos += 1
+        return ('const', value) if kind == 'const' else ('field', tuple(value.split('.')))
+
+
+def parse_condition(condition: str):
+    """AST of one condition string (see the module docstring for the grammar)"""
+    return _Parser(condition).parse()
+
+
+_MISSING = object()
+
+
+def _field_getter(path: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Any]:
+    if len(path) == 1:
+        key = path[0]
+        return lambda profile: profile.get(key, _MISSING)
+
+    def get(profile):
+        value = profile
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                return _MISSING
+            value = value[key]
+        return value
+    return get
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def compile_condition(node) -> Callable[[Dict[str, Any]], bool]:
+    """Predicate over a profile dict for a parsed condition"""
+    kind = node[0]
+    if kind == 'const':
+        value = bool(node[1])
+        return lambda profile: value
+    if kind == 'field':
+        get = _field_getter(node[1])
+
+        def truthy(profile):
+            value = get(profile)
+            return value is not _MISSING and bool(value)
+        return truthy
+    if kind == 'not':
+        inner = compile_condition(node[1])
+        return lambda profile: not inner(profile)
+    if kind in ('and', 'or'):
+        items = tuple(compile_condition(item) for item in node[1])
+        combine = all if kind == 'and' else any
+        return lambda profile: combine(item(profile) for item in items)
+
+    _, left, op, right = node
+    if left[0] == 'const' and right[0] == 'field':
+        left, op, right = right, FLIPPED[op], left
+    compare = OPERATORS[op]
+    if left[0] == 'field' and right[0] == 'const' and _is_number(right[1]):
+        get, constant = _field_getter(left[1]), right[1]
+
+        def numeric(profile):
+            value = get(profile)
+            return _is_number(value) and compare(value, constant)
+        return numeric
+
+    get_left, get_right = (_operand_getter(item) for item in (left, right))
+
+    def general(profile):
+        a, b = get_left(profile), get_right(profile)
+        if a is _MISSING or b is _MISSING:
+            return False
+        try:
+            return compare(a, b)
+        except TypeError:
+            return False
+    return general
+
+
+def _operand_getter(node):
+    if node[0] == 'const':
+        value = node[1]
+        return lambda profile: value
+    return _field_getter(node[1])
+
+
+# Interval: (low, low_inclusive, high, high_inclusive)
+_FULL = (-math.inf, False, math.inf, False)
+
+
+def _intervals(node) -> Optional[Tuple[Tuple[str, ...], List[tuple]]]:
+    """(field path, union of intervals) when node is a range test on one numeric field, else None"""
+    kind = node[0]
+    if kind == 'cmp':
+        _, left, op, right = node
+        if left[0] == 'const' and right[0] == 'field':
+            left, op, right = right, FLIPPED[op], left
+        if left[0] != 'field' or right[0] != 'const' or not _is_number(right[1]) or op == '!=':
+            return None
+        c = right[1]
+        interval = {
+            '<': (-math.inf, False, c, False), '<=': (-math.inf, False, c, True),
+            '>': (c, False, math.inf, False), '>=': (c, True, math.inf, False), '==': (c, True, c, True),
+        }[op]
+        return left[1], [interval]
+    if kind in ('and', 'or'):
+        parts = [_intervals(item) for item in node[1]]
+        if any(part is None for part in parts) or len({path for path, _ in parts}) != 1:
+            return None
+        path = parts[0][0]
+        if kind == 'or':
+            return path, [interval for _, intervals in parts for interval in intervals]
+        result = [_FULL]
+        for _, intervals in parts:
+            result = [merged for a in result for b in intervals if (merged := _intersect(a, b)) is not None]
+        return path, result
+    return None
+
+
+def _intersect(a, b):
+    low, low_inclusive = max((a[0], not a[1]), (b[0], not b[1]))
+    low_inclusive = not low_inclusive
+    high, high_inclusive = min((a[2], a[3]), (b[2], b[3]))
+    if low > high or (low == high and not (low_inclusive and high_inclusive)):
+        return None
+    return low, low_inclusive, high, high_inclusive
+
+
+def _contains(interval, value) -> bool:
+    low, low_inclusive, high, high_inclusive = interval
+    return (low < value or (low_inclusive and low == value)) and (value < high or (high_inclusive and value == high))
+
+
+class IntervalLookup:
+    """First matching branch for a numeric field, as a sorted boundary table
+
+    With boundaries b0 < b1 < ... the number line splits into regions
+    (-inf, b0), [b0], (b0, b1), [b1], ..., (bn, inf); every branch
+    condition is constant within a region, so each region stores the first
+    branch that matches it (-1 for none).
+    """
+
+    def __init__(self, path: Tuple[str, ...], branch_intervals: List[List[tuple]]):
+        self.path = path
+        self.get = _field_getter(path)
+        self.boundaries = sorted({
+            bound for intervals in branch_intervals for interval in intervals
+            for bound in (interval[0], interval[2]) if math.isfinite(bound)
+        })
+        samples = []
+        for i, bound in enumerate(self.boundaries):
+            previous = self.boundaries[i - 1] if i else bound - 1
+            samples += [(previous + bound) / 2, bound]
+        samples.append(self.boundaries[-1] + 1 if self.boundaries else 0)
+        self.table = [
+            next((index for index, intervals in enumerate(branch_intervals)
+                  if any(_contains(interval, sample) for interval in intervals)), -1)
+            for sample in samples
+        ]
+        self._boundaries = np.asarray(self.boundaries, dtype=np.float64)
+        self._table = np.asarray(self.table, dtype=np.int64)
+
+    def branch(self, profile: Dict[str, Any]) -> int:
+        value = self.get(profile)
+        if not _is_number(value) or value != value:
+            return -1
+        i = bisect_left(self.boundaries, value)
+        return self.table[2 * i + 1 if i < len(self.boundaries) and self.boundaries[i] == value else 2 * i]
+
+    def branches(self, profiles: List[Dict[str, Any]]) -> np.ndarray:
+        """Branch index (-1 for none) of every profile, vectorized"""
+        get = self.get
+        values = np.fromiter(
+            ((value if _is_number(value) else math.nan) for value in map(get, profiles)),
+            dtype=np.float64, count=len(profiles),
+        )
+        i = np.searchsorted(self._boundaries, values, side='left')
+        exact = np.zeros(len(values), dtype=bool)
+        inside = i < len(self._boundaries)
+        exact[inside] = self._boundaries[i[inside]] == values[inside]
+        result = self._table[2 * i + exact]
+        result[np.isnan(values)] = -1
+        return result
+
+
+class _Node:
+    __slots__ = ('node_id', 'branches', 'lookup', 'default_next')
+
+    def __init__(self, node_id, branches, lookup, default_next):
+        self.node_id = node_id
+        # (predicate, label, next node id)
+        self.branches = branches
+        self.lookup = lookup
+        self.default_next = default_next
+
+    def route(self, profile) -> Optional[int]:
+        if self.lookup is not None:
+            index = self.lookup.branch(profile)
+            return None if index < 0 else index
+        for index, (predicate, _, _) in enumerate(self.branches):
+            if predicate(profile):
+                return index
+        return None
+
+
+class DecisionTree:
+    """A decision tree document with every condition compiled"""
+
+    def __init__(self, document: Dict[str, Any]):
+        self.tree_id = document.get('decision_tree_id')
+        self.name = document.get('name')
+        nodes = document.get('decision_nodes') or []
+        if not nodes:
+            raise ValueError('Decision tree has no decision_nodes')
+        self.root = nodes[0]['node_id']
+        self.nodes: Dict[str, _Node] = {}
+        for node in nodes:
+            self.nodes[node['node_id']] = self._compile_node(node)
+        self.missing_nodes = sorted({
+            target for node in self.nodes.values()
+            for target in [next_id for _, _, next_id in node.branches] + [node.default_next]
+            if target is not None and target not in self.nodes
+        })
+
+    @staticmethod
+    def _compile_node(node: Dict[str, Any]) -> _Node:
+        asts, branches = [], []
+        for branch in node.get('branches') or []:
+            try:
+                ast = parse_condition(branch['condition'])
+            except ConditionError as e:
+                raise ConditionError(f"Node {node['node_id']!r}: {e}") from None
+            asts.append(ast)
+            branches.append((compile_condition(ast), branch.get('label'), branch.get('next_node')))
+        for pathway in node.get('treatment_pathways') or []:
+            try:
+                ast = ('and', [parse_condition(condition) for condition in pathway.get('conditions') or ['true']])
+            except ConditionError as e:
+                raise ConditionError(f"Node {node['node_id']!r}: {e}") from None
+            asts.append(ast)
+            branches.append((compile_condition(ast), pathway.get('name'), pathway.get('next_node')))
+
+        lookup = None
+        ranges = [_intervals(ast) for ast in asts]
+        if ranges and all(ranges) and len({path for path, _ in ranges}) == 1:
+            lookup = IntervalLookup(ranges[0][0], [intervals for _, intervals in ranges])
+
+        default_next = None
+        if not branches:
+            default_next = next((step['next_node'] for step in node.get('steps') or [] if step.get('next_node')), None)
+        return _Node(node['node_id'], branches, lookup, default_next)
+
+    @classmethod
+    def load(cls, path: str = None) -> 'DecisionTree':
+        path = path or os.getenv('DECISION_TREE_JSON') or DEFAULT_DECISION_TREE_JSON
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _step(self, node_id: str, index: Optional[int]):
+        """(label, next node id) leaving node_id through branch index (None: no branch matched)"""
+        node = self.nodes[node_id]
+        if node.branches:
+            if index is None:
+                return None, None
+            _, label, next_id = node.branches[index]
+            return label, next_id
+        return None, node.default_next
+
+    def route(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Path of one profile from the root
+
+        Returns:
+            {'path': [node ids], 'labels': [label of each branch taken],
+             'status': 'complete' | 'no_match' | 'missing_node'}
+        """
+        node_id, path, labels = self.root, [self.root], []
+        while True:
+            node = self.nodes[node_id]
+            index = node.route(profile) if node.branches else None
+            label, next_id = self._step(node_id, index)
+            if next_id is None:
+                status = 'no_match' if node.branches else 'complete'
+                return {'path': path, 'labels': labels, 'status': status}
+            if label is not None:
+                labels.append(label)
+            path.append(next_id)
+            if next_id not in self.nodes:
+                return {'path': path, 'labels': labels, 'status': 'missing_node'}
+            if len(path) > len(self.nodes) + 1:
+                raise ValueError(f'Decision tree has a cycle through {next_id!r}')
+            node_id = next_id
+
+    def route_batch(self, profiles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """route() for many profiles, level by level
+
+        Profiles waiting at the same node are routed together, so interval
+        nodes cost one ``np.searchsorted`` per node per batch, and profiles
+        taking the same branch are moved on as a group.
+        """
+        profiles = list(profiles)
+        paths = [[self.root] for _ in profiles]
+        labels: List[List[str]] = [[] for _ in profiles]
+        status = ['complete'] * len(profiles)
+        waiting = {self.root: list(range(len(profiles)))} if profiles else {}
+        for _ in range(len(self.nodes) + 1):
+            if not waiting:
+                return [
+                    {'path': path, 'labels': taken, 'status': state}
+                    for path, taken, state in zip(paths, labels, status)
+                ]
+            moved: Dict[str, List[int]] = {}
+            for node_id, members in waiting.items():
+                node = self.nodes[node_id]
+                if not node.branches:
+                    groups = {None: members} if node.default_next is not None else {}
+                else:
+                    if node.lookup is not None:
+                        indices = node.lookup.branches([profiles[m] for m in members]).tolist()
+                    else:
+                        indices = [node.route(profiles[m]) for m in members]
+                    groups = {}
+                    for member, index in zip(members, indices):
+                        groups.setdefault(None if index is None or index < 0 else index, []).append(member)
+                    for member in groups.pop(None, ()):
+                        status[member] = 'no_match'
+
+                for index, group in groups.items():
+                    label, next_id = self._step(node_id, index)
+                    for member in group:
+                        paths[member].append(next_id)
+                        if label is not None:
+                            labels[member].append(label)
+                    if next_id in self.nodes:
+                        moved.setdefault(next_id, []).extend(group)
+                    else:
+                        for member in group:
+                            status[member] = 'missing_node'
+            waiting = moved
+        raise ValueError('Decision tree has a cycle')
+
+
+_tree = None
+_tree_lock = threading.Lock()
+
+
+def get_decision_tree() -> DecisionTree:
+    """Process-wide tree, loaded and compiled on first use"""
+    global _tree
+    if _tree is None:
+        with _tree_lock:
+            if _tree is None:
+                _tree = DecisionTree.load()
+    return _tree
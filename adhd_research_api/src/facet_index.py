@@ -0,0 +1,194 @@
+"""Bitmap facet index over the research entries
+
+``GET /api/research/facets`` returns a page of results together with
+per-facet counts for the active filter. Running a ``GROUP BY`` per facet
+for every request would cost several times the search itself, so each
+API process keeps the facet values of every entry in memory instead: one
+Python-int bitmap per evidence level, study type and tag, with rows in
+listing order (newest first). The index is rebuilt from a single query
+whenever the data version moves on.
+
+Counts are disjunctive: each facet is counted with every filter applied
+except its own, so a UI can show how many results the other values of a
+selected facet would give.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.bitmaps import from_positions, iter_bits
+from src.data_version import data_version
+from src.database_config import PrismaClient, prisma
+
+# Facet name in responses -> column of find_research_facet_rows()
+FACET_COLUMNS = {
+    'evidenceLevel': 'evidenceLevel',
+    'studyType': 'studyType',
+    'tags': 'tags',
+}
+MULTI_VALUED_FACETS = {'tags'}
+
+
+class ResearchFacetIndex:
+    """Facet bitmaps for one snapshot of the research entries"""
+
+    def __init__(self, rows: List[Dict[str, Any]], version: Optional[int] = None):
+        self.version = version
+        self.ids = [row['id'] for row in rows]
+        self.size = len(rows)
+        self.universe = (1 << self.size) - 1
+        self.positions = {research_id: position for position, research_id in enumerate(self.ids)}
+
+        self.bitmaps: Dict[str, Dict[str, int]] = {}
+        for facet, column in FACET_COLUMNS.items():
+            positions: Dict[str, List[int]] = {}
+            for position, row in enumerate(rows):
+                values = row[column] if facet in MULTI_VALUED_FACETS else (row[column],)
+                for value in values or ():
+                    if value is not None:
+                        positions.setdefault(value, []).append(position)
+            self.bitmaps[facet] = {
+                value: from_positions(value_positions, self.size) for value, value_positions in positions.items()
+            }
+        self.workplace_focus = from_positions(
+            (position for position, row in enumerate(rows) if int(row['workplaceFocus'])), self.size
+        )
+
+    def select(self, facet: str, values: Iterable[str]) -> int:
+        """Entries having any of values for facet (OR within a facet)"""
+        bitmaps = self.bitmaps[facet]
+        result = 0
+        for value in values:
+            result |= bitmaps.get(value, 0)
+        return result
+
+    def from_ids(self, ids: Iterable[str]) -> int:
+        """Bitmap of the given entry ids; ids not in the index are ignored"""
+        positions = self.positions
+        return from_positions((positions[i] for i in ids if i in positions), self.size)
+
+    def search(
+        self,
+        filters: Dict[str, List[str]],
+        base: Optional[int] = None,
+        facet_limit: Optional[int] = None,
+    ) -> Tuple[int, Dict[str, Dict[str, int]]]:
+        """Apply facet filters and count every facet
+
+        Args:
+            filters: facet name -> selected values; empty or missing means unfiltered
+            base: bitmap every result must also be in (workplace focus, search hits)
+            facet_limit: keep only the most frequent values of each facet
+
+        Returns:
+            (bitmap of matching entries, {facet: {value: count}})
+        """
+        base = self.universe if base is None else base
+        selected = {facet: self.select(facet, values) for facet, values in filters.items() if values}
+
+        matches = base
+        for bitmap in selected.values():
+            matches &= bitmap
+
+        counts = {}
+        for facet, bitmaps in self.bitmaps.items():
+            others = base
+            for other, bitmap in selected.items():
+                if other != facet:
+                    others &= bitmap
+            facet_counts = [(value, (bitmap & others).bit_count()) for value, bitmap in bitmaps.items()]
+            facet_counts = sorted((item for item in facet_counts if item[1]), key=lambda item: (-item[1], item[0]))
+            counts[facet] = dict(facet_counts[:facet_limit] if facet_limit else facet_counts)
+        counts['workplaceFocus'] = (self.workplace_focus & matches).bit_count()
+        return matches, counts
+
+    def page(self, bitmap: int, offset: int, limit: int, order: Optional[List[str]] = None) -> List[str]:
+        """Ids of one page of bitmap, in listing order or in the order of the ``order`` ids"""
+        ids = []
+        if order is None:
+            for index, position in enumerate(iter_bits(bitmap)):
+                if index >= offset + limit:
+                    break
+                if index >= offset:
+                    ids.append(self.ids[position])
+            return ids
+
+        skipped = 0
+        for research_id in order:
+            position = self.positions.get(research_id)
+            if position is None or not (bitmap >> position) & 1:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            ids.append(research_id)
+            if len(ids) >= limit:
+                break
+        return ids
+
+
+class FacetIndexCache:
+    """Process-wide ResearchFacetIndex, rebuilt when the data version changes"""
+
+    def __init__(self, client: PrismaClient, version=None):
+        self.client = client
+        self.version = version
+        self._index = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ResearchFacetIndex:
+        """Index for the current data version; a failed facet query raises and nothing is stored"""
+        version = self.version() if self.version else None
+        index = self._index
+        if index is None or index.version != version:
+            with self._lock:
+                index = self._index
+                if index is None or index.version != version:
+                    index = ResearchFacetIndex(self.client.find_research_facet_rows(), version)
+                    self._index = index
+        return index
+
+
+# Global instance
+facet_index = FacetIndexCache(prisma, version=data_version.current)
+
+
+def faceted_search(
+    filters: Dict[str, List[str]],
+    workplace_focus: bool = False,
+    search: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    limit: int = 50,
+    offset: int = 0,
+    facet_limit: Optional[int] = None,
+    client: PrismaClient = prisma,
+    cache: FacetIndexCache = None,
+) -> Dict[str, Any]:
+    """One page of research entries plus facet counts for the same filter
+
+    Facet filtering and counting happen on the in-memory bitmaps; the
+    database is only asked for the search hits (when ``search`` is given)
+    and for the rows of the requested page.
+
+    Returns:
+        {'data': rows, 'total': matching entries, 'facets': {facet: {value: count}}}
+    """
+    index = (cache or facet_index).get()
+    base = index.universe
+    if workplace_focus:
+        base &= index.workplace_focus
+
+    order = None
+    if search is not None:
+        hits, _ = client.find_research_entries(fields=['id'], search=search)
+        order = [row['id'] for row in hits]
+        base &= index.from_ids(order)
+
+    matches, facets = index.search(filters, base, facet_limit)
+    page_ids = index.page(matches, offset, limit, order)
+    rows = []
+    if page_ids:
+        rows, _ = client.find_research_entries(fields=fields, search=search, ids=page_ids)
+        by_id = {row['id']: row for row in rows}
+        rows = [by_id[research_id] for research_id in page_ids if research_id in by_id]
+    return {'data': rows, 'total': matches.bit_count(), 'facets': facets}
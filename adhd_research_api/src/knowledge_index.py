@@ -0,0 +1,359 @@
+"""In-memory, bitmap-indexed view of the basic knowledge base
+
+``data/knowledge_base/knowledge_base.json`` is small (281 entries) and
+read-only at runtime, so it is loaded once into column arrays. Each facet
+is dictionary-encoded and indexed with one bitmap per distinct value,
+where a bitmap is a Python int with bit ``i`` set for entry ``i``. Filter
+expressions then evaluate to a handful of bitwise operations:
+
+    domain = "Workplace & Career Impact" AND evidence_level >= Medium AND NOT relevance = High
+
+Grammar (keywords are case-insensitive):
+
+    expr       := term (OR term)*
+    term       := factor (AND factor)*
+    factor     := NOT factor | '(' expr ')' | comparison
+    comparison := facet op value
+    op         := = | != | >= | <= | > | <
+    value      := "quoted" | 'quoted' | bare-word
+
+Ordering comparisons are only allowed on the facets in ORDINAL_SCALES and
+never match entries whose value is not on the scale.
+"""
+
+import json
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.bitmaps import from_positions, iter_bits
+from src.related_index import RelatedIndex, tokenize
+
+DEFAULT_KNOWLEDGE_BASE_JSON = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'knowledge_base', 'knowledge_base.json',
+)
+
+# Free-text fields compared by KnowledgeIndex.related()
+RELATED_TEXT_FIELDS = ('title', 'summary', 'full_knowledge_point', 'key_findings')
+
+FACETS = (
+    'domain', 'evidence_level', 'professional_relevance',
+    'implementation_difficulty', 'time_to_benefit', 'certainty_grade',
+)
+
+# Lowest to highest
+ORDINAL_SCALES = {
+    'evidence_level': ('Low', 'Medium', 'Medium-High', 'High'),
+    'professional_relevance': ('Low', 'Medium', 'High', 'Very High'),
+    'implementation_difficulty': ('Low', 'Medium', 'High'),
+    'certainty_grade': ('Very Low', 'Low', 'Low to Moderate', 'Moderate', 'Moderate to High', 'High'),
+}
+
+# Short names accepted in filter expressions
+FACET_ALIASES = {
+    'evidence': 'evidence_level',
+    'relevance': 'professional_relevance',
+    'difficulty': 'implementation_difficulty',
+    'time': 'time_to_benefit',
+    'certainty': 'certainty_grade',
+}
+
+NULL_CODE = 0xFFFF
+
+# Distinct filter expressions whose bitmaps are kept per index
+FILTER_CACHE_SIZE = 1024
+
+# "Moderate (due to heterogeneity ...)" and "Very Low (...); Moderate (...)" grade as their first rating
+_QUALIFIER_RE = re.compile(r'\s*[(;].*$', re.DOTALL)
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<op>!=|>=|<=|=|>|<)
+      | (?P<paren>[()])
+      | "(?P<dq>(?:[^"\\]|\\.)*)"
+      | '(?P<sq>(?:[^'\\]|\\.)*)'
+      | (?P<word>[^\s()=!<>"']+)
+    )""", re.VERBOSE)
+
+
+class QueryError(ValueError):
+    """A filter expression that cannot be parsed or refers to an unknown facet"""
+
+
+def normalize_facet_value(facet: str, value: Any) -> Optional[str]:
+    """Facet value as indexed: stringified, with certainty qualifiers stripped"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if facet == 'certainty_grade':
+        value = _QUALIFIER_RE.sub('', value)
+    return value or None
+
+
+class _Facet:
+    """One dictionary-encoded column and its per-value bitmaps"""
+
+    def __init__(self, name: str, values: List[Optional[str]]):
+        self.name = name
+        self.dictionary = sorted({value for value in values if value is not None})
+        lookup = {value: code for code, value in enumerate(self.dictionary)}
+        self.codes = array('H', (NULL_CODE if value is None else lookup[value] for value in values))
+
+        positions = [[] for _ in self.dictionary]
+        for position, code in enumerate(self.codes):
+            if code != NULL_CODE:
+                positions[code].append(position)
+        self.bitmaps = [from_positions(rows, len(values)) for rows in positions]
+        self.lookup = {value.lower(): code for value, code in lookup.items()}
+
+        # Bitmaps of every value at or above / at or below each scale rank
+        scale = ORDINAL_SCALES.get(name)
+        self.scale = [level.lower() for level in scale] if scale else None
+        if self.scale:
+            by_rank = [self.bitmap(level) for level in self.scale]
+            self.at_least, self.at_most = [0] * len(by_rank), [0] * len(by_rank)
+            running = 0
+            for rank in range(len(by_rank) - 1, -1, -1):
+                running |= by_rank[rank]
+                self.at_least[rank] = running
+            running = 0
+            for rank, bitmap in enumerate(by_rank):
+                running |= bitmap
+                self.at_most[rank] = running
+
+    def bitmap(self, value: str) -> int:
+        code = self.lookup.get(value.lower())
+        return 0 if code is None else self.bitmaps[code]
+
+    def value(self, position: int) -> Optional[str]:
+        code = self.codes[position]
+        return None if code == NULL_CODE else self.dictionary[code]
+
+    def compare(self, op: str, value: str, universe: int) -> int:
+        if op == '=':
+            return self.bitmap(value)
+        if op == '!=':
+            return universe & ~self.bitmap(value)
+        if self.scale is None:
+            raise QueryError(f"'{self.name}' is not ordinal; only = and != are supported")
+        try:
+            rank = self.scale.index(value.lower())
+        except ValueError:
+            levels = ', '.join(ORDINAL_SCALES[self.name])
+            raise QueryError(f"'{value}' is not a valid {self.name} (expected one of: {levels})") from None
+        if op == '>=':
+            return self.at_least[rank]
+        if op == '<=':
+            return self.at_most[rank]
+        if op == '>':
+            return self.at_least[rank + 1] if rank + 1 < len(self.scale) else 0
+        return self.at_most[rank - 1] if rank > 0 else 0
+
+
+class KnowledgeIndex:
+    """Column store over the knowledge base entries with bitmap facet indexes"""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = entries
+        self.universe = (1 << len(entries)) - 1
+        self.facets = {
+            name: _Facet(name, [normalize_facet_value(name, entry.get(name)) for entry in entries])
+            for name in FACETS
+        }
+        self._filter_cache: 'OrderedDict[str, int]' = OrderedDict()
+        self._filter_lock = threading.Lock()
+        self._positions = {}
+        self._related = None
+        self._related_lock = threading.Lock()
+        for position, entry in enumerate(entries):
+            for key in ('knowledge_id', 'id'):
+                if entry.get(key) is not None:
+                    self._positions.setdefault(str(entry[key]), position)
+
+    @classmethod
+    def load(cls, path: str = None) -> 'KnowledgeIndex':
+        path = path or os.getenv('KNOWLEDGE_BASE_JSON') or DEFAULT_KNOWLEDGE_BASE_JSON
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        if not isinstance(entries, list):
+            raise ValueError(f'{path} must contain a JSON list of entries')
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Entry by knowledge_id (e.g. ADD-Workplace-001) or numeric id"""
+        position = self._positions.get(key)
+        return None if position is None else self.entries[position]
+
+    def filter(self, expression: Optional[str]) -> int:
+        """Bitmap of the entries matching a filter expression (all entries if empty)"""
+        if not expression or not expression.strip():
+            return self.universe
+        with self._filter_lock:
+            bitmap = self._filter_cache.get(expression)
+            if bitmap is not None:
+                self._filter_cache.move_to_end(expression)
+                return bitmap
+        # Parsing costs more than evaluating, so repeated filters skip it
+        bitmap = _Parser(self, expression).parse()
+        with self._filter_lock:
+            self._filter_cache[expression] = bitmap
+            while len(self._filter_cache) > FILTER_CACHE_SIZE:
+                self._filter_cache.popitem(last=False)
+        return bitmap
+
+    def query(self, expression: Optional[str] = None, limit: Optional[int] = None,
+              offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Matching entries in file order, paginated, plus the total match count"""
+        bitmap = self.filter(expression)
+        rows = []
+        for index, position in enumerate(iter_bits(bitmap)):
+            if index < offset:
+                continue
+            if limit is not None and len(rows) >= limit:
+                break
+            rows.append(self.entries[position])
+        return rows, bitmap.bit_count()
+
+    def facet_counts(self, bitmap: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """Per-facet value counts within bitmap (all entries by default), zero counts omitted"""
+        bitmap = self.universe if bitmap is None else bitmap
+        counts = {}
+        for name, facet in self.facets.items():
+            counts[name] = {}
+            for value, value_bitmap in zip(facet.dictionary, facet.bitmaps):
+                count = (value_bitmap & bitmap).bit_count()
+                if count:
+                    counts[name][value] = count
+        return counts
+
+    def related(self, key: str, k: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """Up to k entries most similar to the entry with key, each with a ``similarity``; None if unknown
+
+        Uses a TF-IDF index over RELATED_TEXT_FIELDS and the domain, built on first use.
+        """
+        position = self._positions.get(key)
+        if position is None:
+            return None
+        if self._related is None:
+            with self._related_lock:
+                if self._related is None:
+                    self._related = RelatedIndex.build(
+                        (str(row), self._related_tokens(entry)) for row, entry in enumerate(self.entries)
+                    )
+        return [
+            dict(self.entries[int(row)], similarity=similarity)
+            for row, similarity in self._related.related(str(position), k)
+        ]
+
+    @staticmethod
+    def _related_tokens(entry: Dict[str, Any]) -> List[str]:
+        tokens = []
+        for field in RELATED_TEXT_FIELDS:
+            tokens.extend(tokenize(str(entry.get(field) or '')))
+        if entry.get('domain'):
+            tokens.append(f"#{entry['domain'].lower()}")
+        return tokens
+
+    def resolve_facet(self, name: str) -> '_Facet':
+        facet = self.facets.get(FACET_ALIASES.get(name.lower(), name.lower()))
+        if facet is None:
+            known = ', '.join(list(FACETS) + list(FACET_ALIASES))
+            raise QueryError(f"Unknown facet '{name}' (expected one of: {known})")
+        return facet
+
+
+class _Parser:
+    """Recursive-descent parser evaluating straight to bitmaps"""
+
+    def __init__(self, index: KnowledgeIndex, expression: str):
+        self.index = index
+        self.tokens = self._tokenize(expression)
+        self.pos = 0
+
+    @staticmethod
+    def _tokenize(expression: str) -> List[Tuple[str, str]]:
+        tokens = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _TOKEN_RE.match(expression, position)
+            if not match or match.end() == position:
+                raise QueryError(f'Unexpected character at position {position} in filter')
+            position = match.end()
+            kind = match.lastgroup
+            if kind in ('dq', 'sq'):
+                tokens.append(('value', re.sub(r'\\(.)', r'\1', match.group(kind))))
+            elif kind == 'word' and match.group(kind).upper() in ('AND', 'OR', 'NOT'):
+                tokens.append((match.group(kind).upper(), match.group(kind)))
+            else:
+                tokens.append((kind, match.group(kind)))
+        return tokens
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def _take(self, *kinds: str) -> str:
+        if self._peek() not in kinds:
+            found = self.tokens[self.pos][1] if self.pos < len(self.tokens) else 'end of filter'
+            expected = {'word': 'a facet name', 'op': 'a comparison operator', 'value': 'a value'}
+            raise QueryError(f"Expected {' or '.join(expected.get(kind, kind) for kind in kinds)} but found '{found}'")
+        self.pos += 1
+        return self.tokens[self.pos - 1][1]
+
+    def parse(self) -> int:
+        result = self._expr()
+        if self._peek() is not None:
+            raise QueryError(f"Unexpected '{self.tokens[self.pos][1]}' in filter")
+        return result
+
+    def _expr(self) -> int:
+        result = self._term()
+        while self._peek() == 'OR':
+            self.pos += 1
+            result |= self._term()
+        return result
+
+    def _term(self) -> int:
+        result = self._factor()
+        while self._peek() == 'AND':
+            self.pos += 1
+            result &= self._factor()
+        return result
+
+    def _factor(self) -> int:
+        kind = self._peek()
+        if kind == 'NOT':
+            self.pos += 1
+            return self.index.universe & ~self._factor()
+        if kind == 'paren' and self.tokens[self.pos][1] == '(':
+            self.pos += 1
+            result = self._expr()
+            if self._peek() != 'paren' or self.tokens[self.pos][1] != ')':
+                raise QueryError("Expected ')' to close '('")
+            self.pos += 1
+            return result
+        facet = self.index.resolve_facet(self._take('word'))
+        op = self._take('op')
+        value = self._take('word', 'value')
+        return facet.compare(op, normalize_facet_value(facet.name, value) or '', self.index.universe)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_knowledge_index() -> KnowledgeIndex:
+    """Process-wide index, loaded on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = KnowledgeIndex.load()
+    return _index
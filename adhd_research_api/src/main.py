@@ -3,33 +3,63 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from datetime import date
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from src.routes.research import research_bp
+from src import metrics
+from src.routes.assessments import assessments_bp
+from src.routes.decision_tree import decision_tree_bp
+from src.routes.knowledge import knowledge_bp
+from src.routes.monitoring import monitoring_bp
+from src.static_files import StaticAssets
+
+
+class ISODateJSONProvider(DefaultJSONProvider):
+    """Serialize dates as ISO 8601 instead of Flask's default HTTP date format"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+app.json = ISODateJSONProvider(app)
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
 # Enable CORS for all routes
 CORS(app)
 
-app.register_blueprint(research_bp)
+# API_MODE=knowledge serves only the file-backed endpoints (knowledge base, decision tree, assessment scoring), with no database
+if os.getenv('API_MODE', 'full').lower() != 'knowledge':
+    from src.routes.admin import admin_bp
+    from src.routes.research import research_bp
+    app.register_blueprint(research_bp)
+    app.register_blueprint(admin_bp)
+app.register_blueprint(knowledge_bp)
+app.register_blueprint(decision_tree_bp)
+app.register_blueprint(assessments_bp)
+app.register_blueprint(monitoring_bp)
+metrics.init_app(app)
+
+# Read once here, so serving the frontend never touches the filesystem
+static_assets = StaticAssets.load(app.static_folder)
+
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
+    if app.static_folder is None:
             return "Static folder not configured", 404
 
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
+    static_file = static_assets.get(path) if path != "" else None
+    if static_file is None:
+        static_file = static_assets.get('index.html')
+        if static_file is None:
             return "index.html not found", 404
+    return static_assets.response(static_file)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,383 @@
+"""Prometheus-style metrics without a client library
+
+Counters, gauges and histograms live in a process-wide ``registry`` and are
+rendered by ``/metrics`` in the text exposition format (version 0.0.4):
+
+    http_request_duration_seconds   per route, method and status
+    db_query_duration_seconds       per PrismaClient method
+    db_query_rows                   rows returned, per PrismaClient method
+    cache_requests_total            hits and misses per response cache
+    db_pool_*                       connection pool size, use and waits
+
+Values that other objects already keep (cache hit counts, pool stats) are
+copied in by collectors registered with ``register_collector`` just before
+a snapshot is taken.
+
+Under gunicorn every worker has its own registry. When ``METRICS_DIR`` is
+set (gunicorn.conf.py sets it), each worker writes a JSON snapshot there at
+most every ``METRICS_FLUSH_SECONDS``, and ``/metrics`` sums the snapshots of
+all workers, so it does not matter which worker answers the scrape.
+Counters of exited workers are folded into ``exited.json`` by the master
+(``mark_process_dead``) so they never go backwards; their gauges are
+dropped.
+"""
+
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Seconds: 1 ms to 10 s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+EXITED_FILE = 'exited.json'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {json.dumps(labels): self._copy(value) for labels, value in self._values.items()}
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    @staticmethod
+    def merge(into: Dict[str, object], values: Dict[str, object]):
+        for key, value in values.items():
+            into[key] = into.get(key, 0) + value
+
+    def render(self, values: Dict[str, object]) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for key in sorted(values):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, json.loads(key))} {_format_value(values[key])}')
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set_total(self, labels: LabelValues, value: float):
+        """Mirror a cumulative count kept elsewhere (collectors only)"""
+        with self._lock:
+            self._values[labels] = value
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, labels: LabelValues, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, labels: LabelValues, value: float):
+        # Stored as [count per bucket..., count above the last bucket, sum]
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    @staticmethod
+    def _copy(value):
+        return list(value)
+
+    @staticmethod
+    def merge(into, values):
+        for key, counts in values.items():
+            if key in into:
+                into[key] = [a + b for a, b in zip(into[key], counts)]
+            else:
+                into[key] = list(counts)
+
+    def render(self, values) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        bounds = [_format_value(bound) for bound in self.buckets] + ['+Inf']
+        for key in sorted(values):
+            labels, counts = json.loads(key), values[key]
+            cumulative = 0
+            for bound, count in zip(bounds, counts[:-1]):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(counts[-1])}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+
+class Registry:
+    """The metrics of one process, and the merged view over METRICS_DIR"""
+
+    def __init__(self, directory: str = None, flush_interval: float = None):
+        self.directory = directory
+        self.flush_interval = flush_interval if flush_interval is not None else float(
+            os.getenv('METRICS_FLUSH_SECONDS', '1')
+        )
+        self.metrics: Dict[str, _Metric] = {}
+        self.collectors: List[Callable[[], None]] = []
+        self._pid = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def _add(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def register_collector(self, collector: Callable[[], None]):
+        """Call collector() before every snapshot; it copies external values into metrics"""
+        self.collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        for collector in self.collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"Metrics collector error: {e}")
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    # -- multi-process ---------------------------------------------------
+
+    def start(self):
+        """Begin flushing snapshots to METRICS_DIR from this process (idempotent, fork-aware)"""
+        if not self.directory or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            self._pid = os.getpid()
+            # The random part keeps a reused pid from colliding with an exited worker
+            self._file = os.path.join(self.directory, f'{self._pid}-{uuid.uuid4().hex[:8]}.json')
+            threading.Thread(target=self._flush_forever, name='metrics-flush', daemon=True).start()
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Metrics flush error: {e}")
+
+    def flush(self):
+        if self._file is not None and self._pid == os.getpid():
+            _write_json(self._file, self.snapshot())
+
+    def merged(self) -> Dict[str, Dict[str, object]]:
+        """This process's values plus every other worker's latest snapshot"""
+        if not self.directory:
+            return self.snapshot()
+        self.start()
+        self.flush()
+        totals: Dict[str, Dict[str, object]] = {name: {} for name in self.metrics}
+        names = [name for name in os.listdir(self.directory) if name.endswith('.json') and name != EXITED_FILE]
+        snapshots = {}
+        for name in names:
+            snapshot = _read_json(os.path.join(self.directory, name))
+            if snapshot is not None:
+                snapshots[name] = snapshot
+        # Read last: a worker file already folded in here is skipped
+        exited = _read_json(os.path.join(self.directory, EXITED_FILE)) or {'files': [], 'metrics': {}}
+        folded = set(exited['files'])
+        for name, snapshot in list(snapshots.items()) + [(None, exited['metrics'])]:
+            if name in folded:
+                continue
+            for metric_name, values in snapshot.items():
+                metric = self.metrics.get(metric_name)
+                if metric is not None:
+                    metric.merge(totals[metric_name], values)
+        return totals
+
+    def render(self) -> str:
+        values = self.merged()
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.extend(metric.render(values.get(name, {})))
+        return '\n'.join(lines) + '\n'
+
+
+def _write_json(path: str, data):
+    fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+
+def _read_json(path: str):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def clear_directory(directory: str = None):
+    """Remove every snapshot (gunicorn master, at startup)"""
+    directory = directory or registry.directory
+    if directory and os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith(('.json', '.tmp')):
+                os.remove(os.path.join(directory, name))
+
+
+def mark_process_dead(pid: int, directory: str = None):
+    """Fold an exited worker's counters and histograms into exited.json and drop its gauges (gunicorn master)"""
+    directory = directory or registry.directory
+    if not directory or not os.path.isdir(directory):
+        return
+    path = os.path.join(directory, EXITED_FILE)
+    exited = _read_json(path) or {'files': [], 'metrics': {}}
+    names = [name for name in os.listdir(directory) if name.startswith(f'{pid}-') and name.endswith('.json')]
+    for name in names:
+        snapshot = _read_json(os.path.join(directory, name)) or {}
+        for metric_name, values in snapshot.items():
+            metric = registry.metrics.get(metric_name)
+            if metric is None or isinstance(metric, Gauge):
+                continue
+            metric.merge(exited['metrics'].setdefault(metric_name, {}), values)
+        exited['files'].append(name)
+    if names:
+        _write_json(path, exited)
+        for name in names:
+            os.remove(os.path.join(directory, name))
+
+
+registry = Registry(os.getenv('METRICS_DIR') or None)
+
+request_duration = registry.histogram(
+    'http_request_duration_seconds', 'Time spent handling HTTP requests', ('method', 'route', 'status'),
+)
+query_duration = registry.histogram(
+    'db_query_duration_seconds', 'Time spent in database queries', ('method',),
+)
+query_rows = registry.histogram(
+    'db_query_rows', 'Rows returned by database queries', ('method',), buckets=ROW_BUCKETS,
+)
+query_errors = registry.counter(
+    'db_query_errors_total', 'Database queries that raised an error', ('method',),
+)
+cache_requests = registry.counter(
+    'cache_requests_total', 'Cache lookups by result', ('cache', 'result'),
+)
+cache_entries = registry.gauge(
+    'cache_entries', 'Entries currently held by a cache', ('cache',),
+)
+pool_connections = registry.gauge(
+    'db_pool_connections', 'Pool connections by state (max, open, idle, waiting requests)', ('pool', 'state'),
+)
+pool_requests = registry.counter(
+    'db_pool_requests_total', 'Connection requests to a pool, by outcome (served, queued, errors)', ('pool', 'outcome'),
+)
+pool_wait_seconds = registry.counter(
+    'db_pool_wait_seconds_total', 'Time requests spent waiting for a pool connection', ('pool',),
+)
+
+
+def observe_query(method: str, seconds: float, rows: int = None, error: bool = False):
+    registry.start()
+    query_duration.observe((method,), seconds)
+    if error:
+        query_errors.inc((method,))
+    elif rows is not None:
+        query_rows.observe((method,), rows)
+
+
+def register_cache(name: str, cache):
+    """Export a cache's ``hits``, ``misses`` and size"""
+    def collect():
+        cache_requests.set_total((name, 'hit'), cache.hits)
+        cache_requests.set_total((name, 'miss'), cache.misses)
+        cache_entries.set((name,), len(cache))
+    registry.register_collector(collect)
+
+
+def register_pool(name: str, get_pool: Callable[[], object]):
+    """Export a psycopg pool's stats; get_pool() returns None until the pool is opened"""
+    def collect():
+        pool = get_pool()
+        if pool is None:
+            return
+        stats = pool.get_stats()
+        for state, key in (('max', 'pool_max'), ('open', 'pool_size'), ('idle', 'pool_available'),
+                           ('waiting', 'requests_waiting')):
+            pool_connections.set((name, state), stats.get(key, 0))
+        for outcome, key in (('served', 'requests_num'), ('queued', 'requests_queued'), ('errors', 'requests_errors')):
+            pool_requests.set_total((name, outcome), stats.get(key, 0))
+        pool_wait_seconds.set_total((name,), stats.get('requests_wait_ms', 0) / 1000)
+    registry.register_collector(collect)
+
+
+def init_app(app):
+    """Time every request of ``app`` into http_request_duration_seconds"""
+    from flask import g, request
+
+    @app.before_request
+    def start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            registry.start()
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            request_duration.observe((request.method, route, str(response.status_code)), time.perf_counter() - started)
+        return response
@@ -0,0 +1,229 @@
+"""Opt-in tracing of the SQL sent through PrismaClient
+
+With ``QUERY_TRACE=1`` every query is reduced to a fingerprint (the SQL
+with literals and placeholders replaced by ``?``, lists collapsed and
+whitespace normalized) and its calls, duration, rows and callers are added
+up per fingerprint:
+
+    SELECT re.id FROM research_entries re WHERE re."evidenceLevel" = %s LIMIT 21
+    -> SELECT re.id FROM research_entries re WHERE re."evidenceLevel" = ? LIMIT ?
+
+Queries slower than ``QUERY_TRACE_SLOW_MS`` also go into a ring buffer of
+the last ``QUERY_TRACE_SLOW_BUFFER`` slow queries. For read-only ones
+(SELECT / WITH) a background thread re-runs them under
+``EXPLAIN (ANALYZE, BUFFERS)`` in a read-only transaction that is rolled
+back, at most once per fingerprint every ``QUERY_TRACE_EXPLAIN_INTERVAL``
+seconds, and attaches the plan. The request that ran the slow query never
+waits for its EXPLAIN.
+
+Both are per process; ``GET /api/admin/queries`` shows the answering
+worker's (see ``src.routes.admin``).
+"""
+
+import functools
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import has_request_context, request
+
+# Distinct fingerprints kept; later ones are added up under OTHER_FINGERPRINT
+MAX_FINGERPRINTS = 1000
+OTHER_FINGERPRINT = '<other>'
+# Slow queries waiting for an EXPLAIN; more are recorded without a plan
+EXPLAIN_QUEUE_SIZE = 16
+# Characters of each bound parameter kept in slow query records
+MAX_PARAM_LENGTH = 200
+
+# One token of SQL that fingerprinting cares about; everything else is kept as is
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<identifier>"(?:[^"]|"")*")
+    | (?P<literal>[Ee]?'(?:[^']|'')*'|\$\d+|%s|\b\d+(?:\.\d+)?\b)
+    | (?P<space>\s+)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# (?, ?, ?) and ARRAY[?, ?] -> (...) and ARRAY[...]
+_LIST_RE = re.compile(r'(\(|\[)\s*\?(?:\s*,\s*\?)+\s*(\)|\])')
+_READ_ONLY_RE = re.compile(r'^\(*\s*(?:SELECT|WITH)\b', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(query: str) -> str:
+    """Normalized SQL identifying queries that differ only in literals, parameters or layout"""
+    def normalize(match):
+        if match.lastgroup == 'literal':
+            return '?'
+        if match.lastgroup == 'identifier':
+            return match.group(0)
+        return ' '
+    normalized = _TOKEN_RE.sub(normalize, query)
+    normalized = _LIST_RE.sub(lambda m: f'{m.group(1)}...{m.group(2)}', normalized)
+    return ' '.join(normalized.split()).rstrip(';').rstrip()
+
+
+def fingerprint_id(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+
+def is_read_only(fingerprinted: str) -> bool:
+    return bool(_READ_ONLY_RE.match(fingerprinted))
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() not in ('0', 'false', 'no')
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+class QueryTracer:
+    """Per-fingerprint query statistics and a ring buffer of slow queries with their plans"""
+
+    def __init__(self):
+        self.enabled = _env_flag('QUERY_TRACE', '0')
+        self.slow_ms = float(os.getenv('QUERY_TRACE_SLOW_MS', '100'))
+        self.explain_enabled = _env_flag('QUERY_TRACE_EXPLAIN', '1')
+        self.explain_interval = float(os.getenv('QUERY_TRACE_EXPLAIN_INTERVAL', '60'))
+        self.explain_timeout = float(os.getenv('QUERY_TRACE_EXPLAIN_TIMEOUT', '10'))
+        self.slow_queries = deque(maxlen=int(os.getenv('QUERY_TRACE_SLOW_BUFFER', '50')))
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._explained_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._queue = None
+        self._pid = None
+
+    def record(self, query: str, params: Optional[tuple], method: str, seconds: float, rows: int,
+               error: bool = False, explain: Callable[..., List[str]] = None) -> None:
+        """Add one executed query; ``explain(query, params, timeout)`` returns its plan lines"""
+        text = fingerprint(query)
+        ms = seconds * 1000
+        route = request.url_rule.rule if has_request_context() and request.url_rule else None
+        with self._lock:
+            stats = self._stats.get(text)
+            if stats is None:
+                key = OTHER_FINGERPRINT if len(self._stats) >= MAX_FINGERPRINTS else text
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = {
+                        'calls': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0, 'callers': {},
+                    }
+            stats['calls'] += 1
+            stats['errors'] += error
+            stats['total_ms'] += ms
+            stats['rows'] += rows
+            if ms > stats['max_ms']:
+                stats['max_ms'] = ms
+            caller = f'{method} {route}' if route else method
+            stats['callers'][caller] = stats['callers'].get(caller, 0) + 1
+
+            if ms < self.slow_ms:
+                return
+            entry = {
+                'fingerprint_id': fingerprint_id(text),
+                'fingerprint': text,
+                'query': ' '.join(query.split()),
+                'params': [repr(param)[:MAX_PARAM_LENGTH] for param in params or ()],
+                'duration_ms': round(ms, 3),
+                'rows': rows,
+                'error': bool(error),
+                'method': method,
+                'route': route,
+                'timestamp': _now(),
+                'plan': None,
+                'plan_note': None,
+            }
+            self.slow_queries.append(entry)
+            entry['plan_note'] = self._explain_skipped(text, error, explain)
+            if entry['plan_note'] is None:
+                self._explained_at[text] = time.monotonic()
+                entry['plan_note'] = 'pending'
+
+        if entry['plan_note'] == 'pending':
+            try:
+                self._explain_queue().put_nowait((entry, query, params, explain))
+            except queue.Full:
+                with self._lock:
+                    entry['plan_note'] = 'EXPLAIN queue full'
+                    self._explained_at.pop(text, None)
+
+    def _explain_skipped(self, text: str, error: bool, explain) -> Optional[str]:
+        """Why this slow query gets no EXPLAIN, or None if it should get one"""
+        if not self.explain_enabled or explain is None:
+            return 'EXPLAIN disabled'
+        if error:
+            return 'query failed'
+        if not is_read_only(text):
+            return 'not a SELECT'
+        explained_at = self._explained_at.get(text)
+        if explained_at is not None and time.monotonic() - explained_at < self.explain_interval:
+            return f'explained within the last {self.explain_interval:g}s'
+        return None
+
+    def _explain_queue(self) -> queue.Queue:
+        # Started on first use so each gunicorn worker gets its own thread
+        if self._queue is None or self._pid != os.getpid():
+            with self._lock:
+                if self._queue is None or self._pid != os.getpid():
+                    self._queue = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+                    threading.Thread(target=self._explain_worker, args=(self._queue,),
+                                     name='query-explain', daemon=True).start()
+                    self._pid = os.getpid()
+        return self._queue
+
+    def _explain_worker(self, pending: queue.Queue):
+        while True:
+            entry, query, params, explain = pending.get()
+            try:
+                plan, note = explain(query, params, timeout=self.explain_timeout), None
+            except Exception as e:
+                plan, note = None, f'EXPLAIN failed: {e}'.strip()
+            with self._lock:
+                entry['plan'], entry['plan_note'] = plan, note
+
+    def report(self, limit: int = None) -> Dict[str, Any]:
+        """Fingerprints by total time (the first ``limit``) and slow queries newest first"""
+        with self._lock:
+            queries = [
+                {
+                    'fingerprint_id': fingerprint_id(text),
+                    'fingerprint': text,
+                    'calls': stats['calls'],
+                    'errors': stats['errors'],
+                    'total_ms': round(stats['total_ms'], 3),
+                    'mean_ms': round(stats['total_ms'] / stats['calls'], 3),
+                    'max_ms': round(stats['max_ms'], 3),
+                    'rows': stats['rows'],
+                    'callers': dict(stats['callers']),
+                }
+                for text, stats in self._stats.items()
+            ]
+            slow = [dict(entry) for entry in reversed(self.slow_queries)]
+        queries.sort(key=lambda q: q['total_ms'], reverse=True)
+        return {
+            'enabled': self.enabled,
+            'pid': os.getpid(),
+            'slow_threshold_ms': self.slow_ms,
+            'fingerprint_count': len(queries),
+            'queries': queries[:limit] if limit else queries,
+            'slow_queries': slow,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._explained_at.clear()
+            self.slow_queries.clear()
+
+
+# Global instance
+query_tracer = QueryTracer()
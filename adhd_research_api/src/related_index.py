@@ -0,0 +1,165 @@
+"""TF-IDF vectors for "related entries" lookups
+
+Each entry becomes one row of a sparse TF-IDF matrix (sublinear term
+frequency, smoothed inverse document frequency), L2-normalized so the dot
+product of two rows is their cosine similarity. The entries related to one
+entry are then a single sparse matrix-vector product against its row
+(a gather, a multiply and ``np.add.reduceat`` over the row boundaries) plus
+``argpartition`` for the top k, with no per-candidate Python work.
+
+The matrix is stored in CSR form as plain NumPy arrays, so it can be saved
+as ``.npy`` files and memory-mapped: every API worker shares the same pages
+of the OS file cache instead of holding its own copy.
+"""
+
+import json
+import os
+import re
+import secrets
+import tempfile
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MANIFEST_NAME = 'related_index.json'
+ARRAYS = ('indptr', 'indices', 'weights')
+
+_TOKEN_RE = re.compile(r'[a-z][a-z0-9]+')
+
+STOP_WORDS = frozenset("""
+    a about after all also an and any are as at be been being between both but by can could did do does
+    during each either for from had has have having he her his how if in into is it its may more most
+    much no not of on or other our over per she should such than that the their them then there these
+    they this those through to under up upon was we were what when where which while who whom why will
+    with within would you your
+""".split())
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased words of at least two characters, stop words removed"""
+    if not text:
+        return []
+    return [word for word in _TOKEN_RE.findall(text.lower()) if word not in STOP_WORDS]
+
+
+class RelatedIndex:
+    """L2-normalized TF-IDF matrix in CSR form, keyed by entry id
+
+    Column indices are stored as ``intp`` because NumPy gathers with native
+    indices several times faster than with int32 ones.
+    """
+
+    def __init__(self, ids: Sequence[str], indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                 dimensions: int, version: Optional[int] = None):
+        self.ids = list(ids)
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.dimensions = dimensions
+        self.version = version
+        self.size = len(self.ids)
+        self.positions = {entry_id: position for position, entry_id in enumerate(self.ids)}
+        # reduceat runs over the rows that have terms: their starts are strictly
+        # increasing and in range, and each segment ends where the next one starts
+        self._nonempty = np.flatnonzero(indptr[:-1] != indptr[1:])
+        self._starts = indptr[:-1][self._nonempty]
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, Iterable[str]]], version: Optional[int] = None) -> 'RelatedIndex':
+        """Index (entry id, tokens) pairs; later duplicates of an id are ignored"""
+        vocabulary: Dict[str, int] = {}
+        ids, indptr, indices, counts = [], [0], [], []
+        seen = set()
+        for entry_id, tokens in documents:
+            if entry_id in seen:
+                continue
+            seen.add(entry_id)
+            ids.append(entry_id)
+            for term, count in Counter(tokens).items():
+                indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                counts.append(count)
+            indptr.append(len(indices))
+
+        size, dimensions = len(ids), len(vocabulary)
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.intp)
+        rows = np.repeat(np.arange(size, dtype=np.int32), np.diff(indptr))
+
+        document_frequency = np.bincount(indices, minlength=dimensions)
+        idf = np.log((1 + size) / (1 + document_frequency)) + 1
+        weights = (1 + np.log(np.asarray(counts, dtype=np.float64))) * idf[indices]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=size))
+        weights /= np.where(norms > 0, norms, 1)[rows]
+        return cls(ids, indptr, indices, weights.astype(np.float32), dimensions, version)
+
+    def related(self, entry_id: str, k: int = 10) -> Optional[List[Tuple[str, float]]]:
+        """Up to k (id, cosine similarity) pairs most similar to entry_id, best first
+
+        Entries sharing no terms with entry_id are never returned. Returns
+        None when entry_id is not in the index.
+        """
+        position = self.positions.get(entry_id)
+        if position is None:
+            return None
+        k = min(k, self.size - 1)
+        if k <= 0:
+            return []
+
+        start, end = self.indptr[position], self.indptr[position + 1]
+        query = np.zeros(self.dimensions, dtype=np.float32)
+        query[self.indices[start:end]] = self.weights[start:end]
+        scores = np.zeros(self.size, dtype=np.float32)
+        scores[self._nonempty] = np.add.reduceat(self.weights * query[self.indices], self._starts)
+        scores[position] = 0
+
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.ids[i], round(float(scores[i]), 6)) for i in top if scores[i] > 1e-9]
+
+    def save(self, directory: str) -> None:
+        """Write the arrays as .npy files plus a manifest, replacing any previous index atomically
+
+        Array files carry a random suffix and the manifest is replaced last,
+        so processes that already memory-mapped the old files keep reading
+        them until they reload.
+        """
+        os.makedirs(directory, exist_ok=True)
+        suffix = secrets.token_hex(4)
+        files = {}
+        for name in ARRAYS:
+            files[name] = f'related.{suffix}.{name}.npy'
+            _write_atomic(directory, files[name], lambda f, name=name: np.save(f, getattr(self, name)))
+        manifest = {'version': self.version, 'dimensions': self.dimensions, 'files': files, 'ids': self.ids}
+        _write_atomic(directory, MANIFEST_NAME, lambda f: f.write(json.dumps(manifest).encode('utf-8')))
+
+        current = set(files.values())
+        for name in os.listdir(directory):
+            if name.startswith('related.') and name.endswith('.npy') and name not in current:
+                os.remove(os.path.join(directory, name))
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> Optional['RelatedIndex']:
+        """Index saved in directory (arrays memory-mapped read-only), or None if there is none"""
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            arrays = {
+                name: np.load(os.path.join(directory, manifest['files'][name]), mmap_mode='r' if mmap else None)
+                for name in ARRAYS
+            }
+        except FileNotFoundError:
+            return None
+        return cls(manifest['ids'], dimensions=manifest['dimensions'], version=manifest['version'], **arrays)
+
+
+def _write_atomic(directory: str, name: str, write) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, os.path.join(directory, name))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
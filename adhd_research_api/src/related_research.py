@@ -0,0 +1,136 @@
+"""Related research entries from a persisted TF-IDF index
+
+The index (see ``src.related_index``) covers each entry's title, key
+findings, clinical significance, workplace impact text and tags. It is
+built once per data version, normally right after ingest:
+
+    python -m src.related_research build
+
+and saved under ``RELATED_INDEX_DIR`` as memory-mapped ``.npy`` files. API
+workers load the saved index when its version matches the current data
+version; if it is missing or stale, the first worker to notice rebuilds it
+under a file lock while the others wait and then load its result.
+"""
+
+import fcntl
+import os
+import sys
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from src.data_version import data_version
+from src.database_config import PrismaClient, prisma
+from src.related_index import RelatedIndex, tokenize
+
+DEFAULT_RELATED_INDEX_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'processed', 'related',
+)
+
+TEXT_COLUMNS = ('title', 'primaryResults', 'clinicalSignificance', 'productivityImpact', 'careerImplications')
+
+
+def entry_tokens(row) -> List[str]:
+    """Terms indexed for one row of find_research_text_rows(); tags are kept whole as #tag"""
+    tokens = []
+    for column in TEXT_COLUMNS:
+        tokens.extend(tokenize(row.get(column)))
+    tokens.extend(f'#{tag}' for tag in row.get('tags') or ())
+    return tokens
+
+
+def build_related_index(client: PrismaClient, version: Optional[int] = None) -> RelatedIndex:
+    """TF-IDF index over every research entry in the database
+
+    A failed row query raises; it is never indexed as an empty corpus.
+    """
+    rows = client.find_research_text_rows()
+    return RelatedIndex.build(((row['id'], entry_tokens(row)) for row in rows), version)
+
+
+class RelatedIndexCache:
+    """Process-wide RelatedIndex, loaded from (or rebuilt into) directory when the data version changes"""
+
+    def __init__(self, client: PrismaClient, directory: str = None, version=None):
+        self.client = client
+        self.directory = directory or os.getenv('RELATED_INDEX_DIR') or DEFAULT_RELATED_INDEX_DIR
+        self.version = version
+        self._index = None
+        self._lock = threading.Lock()
+
+    def get(self) -> RelatedIndex:
+        version = self.version() if self.version else None
+        index = self._index
+        if index is None or index.version != version:
+            with self._lock:
+                index = self._index
+                if index is None or index.version != version:
+                    index = self._load_or_build(version)
+                    self._index = index
+        return index
+
+    def rebuild(self) -> RelatedIndex:
+        """Build and save the index for the current data version, whether or not it is stale"""
+        version = self.version() if self.version else None
+        with self._lock:
+            self._index = self._load_or_build(version, force=True)
+        return self._index
+
+    def _load_or_build(self, version, force: bool = False) -> RelatedIndex:
+        index = None if force else RelatedIndex.load(self.directory)
+        if index is not None and index.version == version:
+            return index
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            lock = open(os.path.join(self.directory, '.build.lock'), 'a')
+        except OSError:
+            # Read-only deployment: each process keeps its own in-memory index
+            return build_related_index(self.client, version)
+
+        with lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if not force:
+                # Another process may have finished the build while we waited for the lock
+                index = RelatedIndex.load(self.directory)
+                if index is not None and index.version == version:
+                    return index
+            # Raises before anything is saved if the database query fails
+            index = build_related_index(self.client, version)
+            index.save(self.directory)
+        return RelatedIndex.load(self.directory) or index
+
+
+# Global instance
+related_index = RelatedIndexCache(prisma, version=data_version.current)
+
+
+def related(entry_id: str, k: int = 10, cache: RelatedIndexCache = None) -> Optional[List[Tuple[str, float]]]:
+    """Up to k (id, similarity) pairs for the entries most similar to entry_id, or None if it is unknown"""
+    return (cache or related_index).get().related(entry_id, k)
+
+
+def related_entries(entry_id: str, k: int = 10, fields: Optional[Iterable[str]] = None,
+                    client: PrismaClient = prisma, cache: RelatedIndexCache = None) -> Optional[list]:
+    """Rows of the entries related to entry_id, most similar first, each with a ``similarity``"""
+    matches = related(entry_id, k, cache)
+    if not matches:
+        return matches
+    rows, _ = client.find_research_entries(fields=fields, ids=[match_id for match_id, _ in matches])
+    by_id = {row['id']: row for row in rows}
+    result = []
+    for match_id, similarity in matches:
+        row = by_id.get(match_id)
+        if row is not None:
+            row['similarity'] = similarity
+            result.append(row)
+    return result
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] != ['build']:
+        sys.exit('usage: python -m src.related_research build')
+    start = time.perf_counter()
+    index = related_index.rebuild()
+    print(f"Indexed {index.size} research entries ({index.dimensions} terms, {len(index.indices)} non-zeros) "
+          f"for data version {index.version} in {time.perf_counter() - start:.1f}s -> {related_index.directory}")
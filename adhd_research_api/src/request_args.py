@@ -0,0 +1,23 @@
+"""Query string parsing shared by the API blueprints
+
+Parsers raise ValueError with a message meant for the client; the routes
+turn that into a 400 response.
+"""
+
+
+def parse_int_arg(name, value, default, minimum=0, maximum=None):
+    """Parse an integer query parameter bounded to [minimum, maximum]
+
+    A missing or empty value gives default, which is not range-checked
+    (None means no limit, for example).
+    """
+    if value is None or value == '':
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer') from None
+    if number < minimum or (maximum is not None and number > maximum):
+        bound = f'between {minimum} and {maximum}' if maximum is not None else f'at least {minimum}'
+        raise ValueError(f'{name} must be {bound}')
+    return number
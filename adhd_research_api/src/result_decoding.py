@@ -0,0 +1,90 @@
+"""Decode psql CSV output into typed, column-named rows
+
+The pool backend gets native Python values straight from psycopg. The psql
+fallback only sees text, so this module maps each column name to a decoder
+derived from ``prisma/schema.prisma`` and applies it while streaming the
+whole result through a single ``csv.reader``.
+"""
+
+import csv
+import io
+import json
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# psql is invoked with ``-P null=\N`` so NULL is distinguishable from ''
+NULL_SENTINEL = '\\N'
+
+# One array element: a double-quoted string with backslash escapes, or a bare token
+_ARRAY_ITEM_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|([^,]+)')
+_ARRAY_ESCAPE_RE = re.compile(r'\\(.)')
+
+
+def parse_pg_array(text: str) -> List[Optional[str]]:
+    """Parse a one-dimensional PostgreSQL array literal such as {a,"b c",NULL}"""
+    if len(text) <= 2:
+        return []
+
+    if '"' not in text:
+        return [None if item == 'NULL' else item for item in text[1:-1].split(',')]
+
+    items = []
+    for quoted, bare in _ARRAY_ITEM_RE.findall(text, 1, len(text) - 1):
+        if bare:
+            items.append(None if bare == 'NULL' else bare)
+        elif '\\' in quoted:
+            items.append(_ARRAY_ESCAPE_RE.sub(r'\1', quoted))
+        else:
+            items.append(quoted)
+    return items
+
+
+INT_COLUMNS = {'sampleSize', 'administrationTime', 'count'}
+FLOAT_COLUMNS = {'effectSize', 'minimumDetectableChange', 'searchRank'}
+TIMESTAMP_COLUMNS = {'publicationDate', 'addedDate', 'lastReviewed', 'createdAt', 'updatedAt'}
+ARRAY_COLUMNS = {
+    'authors', 'primaryOutcomes', 'secondaryOutcomes', 'limitations',
+    'accommodationNeeds', 'treatmentRecommendations', 'monitoringParameters',
+    'contraindications', 'sideEffects', 'monitoringRequirements', 'domains', 'tags',
+}
+JSON_COLUMNS = {'effectSizes', 'psychometricProperties', 'stats'}
+
+COLUMN_DECODERS: Dict[str, Callable[[str], Any]] = {}
+COLUMN_DECODERS.update(dict.fromkeys(INT_COLUMNS, int))
+COLUMN_DECODERS.update(dict.fromkeys(FLOAT_COLUMNS, float))
+COLUMN_DECODERS.update(dict.fromkeys(TIMESTAMP_COLUMNS, datetime.fromisoformat))
+COLUMN_DECODERS.update(dict.fromkeys(ARRAY_COLUMNS, parse_pg_array))
+COLUMN_DECODERS.update(dict.fromkeys(JSON_COLUMNS, json.loads))
+
+
+def decode_csv(output: str) -> List[Dict[str, Any]]:
+    """Decode ``psql --csv`` output (with header row) into a list of dicts
+
+    Decoders are resolved once per result from the header, and only the
+    columns that need conversion are touched per row.
+    """
+    if not output:
+        return []
+
+    reader = csv.reader(io.StringIO(output))
+    try:
+        names = next(reader)
+    except StopIteration:
+        return []
+
+    decoded = [(i, COLUMN_DECODERS[name]) for i, name in enumerate(names) if name in COLUMN_DECODERS]
+    positions = range(len(names))
+
+    rows = []
+    for values in reader:
+        if NULL_SENTINEL in values:
+            for i in positions:
+                if values[i] == NULL_SENTINEL:
+                    values[i] = None
+        for i, decode in decoded:
+            value = values[i]
+            if value is not None:
+                values[i] = decode(value)
+        rows.append(dict(zip(names, values)))
+    return rows
@@ -0,0 +1,55 @@
+import hmac
+import os
+from flask import Blueprint, jsonify, request
+from src.query_trace import query_tracer
+from src.request_args import parse_int_arg
+
+admin_bp = Blueprint('admin', __name__)
+
+# Admin endpoints answer 404 unless ADMIN_TOKEN is set, and 401 without it
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+
+@admin_bp.before_request
+def require_admin_token():
+    if not ADMIN_TOKEN:
+        return jsonify({
+            'success': False,
+            'error': 'Not found'
+        }), 404
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(token.strip().encode(), ADMIN_TOKEN.encode()):
+        return jsonify({
+            'success': False,
+            'error': 'Admin token required'
+        }), 401
+
+
+@admin_bp.route('/api/admin/queries', methods=['GET'])
+def get_query_trace():
+    """This worker's query statistics by fingerprint and its recent slow queries with their plans"""
+    try:
+        limit = parse_int_arg('limit', request.args.get('limit'), 50, 1)
+        return jsonify({
+            'success': True,
+            'data': query_tracer.report(limit)
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@admin_bp.route('/api/admin/queries', methods=['DELETE'])
+def reset_query_trace():
+    """Forget this worker's query statistics and slow queries"""
+    query_tracer.reset()
+    return jsonify({
+        'success': True
+    })
@@ -0,0 +1,56 @@
+from flask import Blueprint, jsonify, request
+from src.assessment_scoring import get_assessment_scorer
+
+assessments_bp = Blueprint('assessments', __name__)
+
+MAX_BATCH_ASSESSMENTS = 10000
+
+
+@assessments_bp.route('/api/assessments/score', methods=['POST'])
+def score_assessments():
+    """Score one ASRS assessment ({"assessment": {...}}) or many ({"assessments": [...]})"""
+    try:
+        body = request.get_json(silent=True) or {}
+        if not isinstance(body, dict):
+            raise ValueError('Request body must be a JSON object')
+        scorer = get_assessment_scorer()
+        weights = body.get('weights')
+        if weights is not None:
+            if not isinstance(weights, dict) or not all(
+                isinstance(value, (int, float)) and not isinstance(value, bool) for value in weights.values()
+            ):
+                raise ValueError('weights must map section ids to numbers')
+            scorer = scorer.with_weights(weights)
+
+        if 'assessments' in body:
+            assessments = body['assessments']
+            if not isinstance(assessments, list):
+                raise ValueError('assessments must be a list of objects')
+            if len(assessments) > MAX_BATCH_ASSESSMENTS:
+                raise ValueError(f'At most {MAX_BATCH_ASSESSMENTS} assessments can be scored at once')
+            data = scorer.score_batch(assessments)
+            return jsonify({
+                'success': True,
+                'data': data,
+                'count': len(data),
+                'weights': scorer.weights
+            })
+
+        assessment = body.get('assessment')
+        if not isinstance(assessment, dict):
+            raise ValueError('Request body must contain an "assessment" object or an "assessments" list')
+        return jsonify({
+            'success': True,
+            'data': scorer.score(assessment),
+            'weights': scorer.weights
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -0,0 +1,47 @@
+from flask import Blueprint, jsonify, request
+from src.decision_tree import get_decision_tree
+
+decision_tree_bp = Blueprint('decision_tree', __name__)
+
+MAX_BATCH_PROFILES = 10000
+
+
+@decision_tree_bp.route('/api/decision-tree/route', methods=['POST'])
+def route_profiles():
+    """Route one patient profile ({"profile": {...}}) or many ({"profiles": [...]}) through the treatment tree"""
+    try:
+        body = request.get_json(silent=True) or {}
+        if not isinstance(body, dict):
+            raise ValueError('Request body must be a JSON object')
+        tree = get_decision_tree()
+
+        if 'profiles' in body:
+            profiles = body['profiles']
+            if not isinstance(profiles, list) or not all(isinstance(profile, dict) for profile in profiles):
+                raise ValueError('profiles must be a list of objects')
+            if len(profiles) > MAX_BATCH_PROFILES:
+                raise ValueError(f'At most {MAX_BATCH_PROFILES} profiles can be routed at once')
+            data = tree.route_batch(profiles)
+            return jsonify({
+                'success': True,
+                'data': data,
+                'count': len(data)
+            })
+
+        profile = body.get('profile')
+        if not isinstance(profile, dict):
+            raise ValueError('Request body must contain a "profile" object or a "profiles" list')
+        return jsonify({
+            'success': True,
+            'data': tree.route(profile)
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
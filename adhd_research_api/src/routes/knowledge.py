@@ -0,0 +1,114 @@
+from flask import Blueprint, jsonify, request
+from src.knowledge_index import get_knowledge_index
+from src.request_args import parse_int_arg
+
+knowledge_bp = Blueprint('knowledge', __name__)
+
+MAX_PAGE_SIZE = 500
+MAX_RELATED = 100
+
+
+@knowledge_bp.route('/api/knowledge', methods=['GET'])
+def query_knowledge():
+    """Filter the basic knowledge base, e.g. ?q=domain="Workplace & Career Impact" AND evidence>=Medium"""
+    try:
+        limit = parse_int_arg('limit', request.args.get('limit'), None, 1, MAX_PAGE_SIZE)
+        offset = parse_int_arg('offset', request.args.get('offset'), 0)
+        data, total = get_knowledge_index().query(request.args.get('q'), limit=limit, offset=offset)
+
+        return jsonify({
+            'success': True,
+            'data': data,
+            'count': len(data),
+            'total': total
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@knowledge_bp.route('/api/knowledge/facets', methods=['GET'])
+def get_knowledge_facets():
+    """Filter the knowledge base and count each facet's values among the matches"""
+    try:
+        limit = parse_int_arg('limit', request.args.get('limit'), 50, 1, MAX_PAGE_SIZE)
+        offset = parse_int_arg('offset', request.args.get('offset'), 0)
+        index = get_knowledge_index()
+        expression = request.args.get('q')
+        data, total = index.query(expression, limit=limit, offset=offset)
+
+        return jsonify({
+            'success': True,
+            'data': data,
+            'count': len(data),
+            'total': total,
+            'facets': index.facet_counts(index.filter(expression))
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@knowledge_bp.route('/api/knowledge/<knowledge_id>/related', methods=['GET'])
+def get_related_knowledge(knowledge_id):
+    """Get the knowledge base entries most similar to one entry"""
+    try:
+        k = parse_int_arg('k', request.args.get('k'), 10, 1, MAX_RELATED)
+        data = get_knowledge_index().related(knowledge_id, k)
+        if data is None:
+            return jsonify({
+                'success': False,
+                'error': 'Knowledge base entry not found'
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'data': data,
+            'count': len(data)
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@knowledge_bp.route('/api/knowledge/<knowledge_id>', methods=['GET'])
+def get_knowledge_entry(knowledge_id):
+    """Get one knowledge base entry by knowledge_id or numeric id"""
+    try:
+        entry = get_knowledge_index().get(knowledge_id)
+        if entry is None:
+            return jsonify({
+                'success': False,
+                'error': 'Knowledge base entry not found'
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'data': entry
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
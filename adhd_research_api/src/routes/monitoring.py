@@ -0,0 +1,41 @@
+import os
+from datetime import datetime, timezone
+from flask import Blueprint, Response, jsonify
+from src.metrics import CONTENT_TYPE, registry
+
+monitoring_bp = Blueprint('monitoring', __name__)
+
+HEALTH_DB_TIMEOUT = float(os.getenv('HEALTH_DB_TIMEOUT', '5'))
+
+
+@monitoring_bp.route('/health', methods=['GET'])
+def health():
+    """Liveness and database reachability, for container and load balancer health checks"""
+    components = {'api': 'operational'}
+    error = None
+    if os.getenv('API_MODE', 'full').lower() == 'knowledge':
+        components['database'] = 'not used'
+    else:
+        from src.database_config import prisma
+        try:
+            prisma.ping(timeout=HEALTH_DB_TIMEOUT)
+            components['database'] = 'connected'
+        except Exception as e:
+            components['database'] = 'disconnected'
+            error = f'Database connection failed: {e}'
+
+    body = {
+        'status': 'unhealthy' if error else 'healthy',
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z'),
+        'components': components,
+    }
+    if error:
+        body['error'] = error
+        return jsonify(body), 503
+    return jsonify(body)
+
+
+@monitoring_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Request, query, cache and pool metrics in the Prometheus text format"""
+    return Response(registry.render(), content_type=CONTENT_TYPE)
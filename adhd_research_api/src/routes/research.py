@@ -1,31 +1,183 @@
-from flask import Blueprint, jsonify, request
-from src.database_config import prisma
+import os
+import zlib
+from flask import Blueprint, Response, current_app, jsonify, request
+from src.async_database import get_research_stats as fetch_research_stats
+from src.cache import ResponseCache, TTLCache
+from src.data_version import data_version
+from src.database_config import MAX_PAGE_SIZE, prisma
+from src.facet_index import faceted_search
+from src.metrics import register_cache
+from src.related_research import related_entries
+from src.request_args import parse_int_arg
 
 research_bp = Blueprint('research', __name__)
 
+MAX_RELATED = 100
+
+# Dashboards poll /api/research/stats; recompute at most once per TTL or data version
+stats_cache = TTLCache(ttl=float(os.getenv('STATS_CACHE_TTL', '60')))
+
+# Rendered responses for the read-only routes, dropped whenever the data version bumps
+response_cache = ResponseCache(
+    max_entries=int(os.getenv('RESPONSE_CACHE_SIZE', '256')),
+    version=data_version.current,
+)
+register_cache('research_stats', stats_cache)
+register_cache('research_responses', response_cache)
+
+def _parse_fields(value):
+    """Parse the comma-separated ?fields= projection; None means default fields"""
+    if not value:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
 @research_bp.route('/api/research', methods=['GET'])
+@response_cache.cached
 def get_all_research():
-    """Get all research entries with optional filtering"""
+    """Get research entries with optional filtering, projection and keyset pagination"""
     try:
         # Get query parameters
         evidence_level = request.args.get('evidence_level')
         search = request.args.get('search')
         workplace_focus = request.args.get('workplace_focus', '').lower() == 'true'
+        fields = _parse_fields(request.args.get('fields'))
+        limit = parse_int_arg('limit', request.args.get('limit'), None, 1, MAX_PAGE_SIZE)
+        cursor = request.args.get('cursor')
         
-        if evidence_level:
-            data = prisma.get_research_by_evidence_level(evidence_level.upper())
-        elif search:
-            data = prisma.search_research_entries(search)
-        elif workplace_focus:
-            data = prisma.get_workplace_focused_research()
-        else:
-            data = prisma.find_many_research_entries()
+        data, next_cursor = prisma.find_research_entries(
+            fields=fields,
+            limit=limit,
+            cursor=cursor,
+            evidence_level=evidence_level.upper() if evidence_level else None,
+            workplace_focus=workplace_focus,
+            search=search or None,
+        )
         
         return jsonify({
             'success': True,
             'data': data,
-            'count': len(data)
+            'count': len(data),
+            'next_cursor': next_cursor
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@research_bp.route('/api/research/facets', methods=['GET'])
+@response_cache.cached
+def get_research_facets():
+    """Get one page of research entries with evidence level, study type and tag counts for the same filter"""
+    try:
+        filters = {
+            'evidenceLevel': [value.upper() for value in request.args.getlist('evidence_level') if value],
+            'studyType': [value.upper() for value in request.args.getlist('study_type') if value],
+            'tags': [value for value in request.args.getlist('tag') if value],
+        }
+        search = request.args.get('search')
+
+        result = faceted_search(
+            filters,
+            workplace_focus=request.args.get('workplace_focus', '').lower() == 'true',
+            search=search or None,
+            fields=_parse_fields(request.args.get('fields')),
+            limit=parse_int_arg('limit', request.args.get('limit'), 50, 1, MAX_PAGE_SIZE),
+            offset=parse_int_arg('offset', request.args.get('offset'), 0),
+            facet_limit=parse_int_arg('facet_limit', request.args.get('facet_limit'), 50, 1),
+        )
+
+        return jsonify({
+            'success': True,
+            'data': result['data'],
+            'count': len(result['data']),
+            'total': result['total'],
+            'facets': result['facets']
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@research_bp.route('/api/research/export', methods=['GET'])
+def export_research():
+    """Stream every matching research entry as NDJSON, gzip-compressed if the client accepts it"""
+    try:
+        evidence_level = request.args.get('evidence_level')
+        search = request.args.get('search')
+        batches = prisma.stream_research_entries(
+            fields=_parse_fields(request.args.get('fields')),
+            evidence_level=evidence_level.upper() if evidence_level else None,
+            workplace_focus=request.args.get('workplace_focus', '').lower() == 'true',
+            search=search or None,
+        )
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+    dumps = current_app.json.dumps
+    gzip = request.accept_encodings['gzip'] > 0
+
+    def generate():
+        # One chunk per fetched batch keeps memory flat and the first byte early
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+        for rows in batches:
+            chunk = ''.join(dumps(row) + '\n' for row in rows).encode()
+            if compressor:
+                chunk = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield chunk
+        if compressor:
+            yield compressor.flush()
+
+    response = Response(generate(), mimetype='application/x-ndjson')
+    response.headers['Vary'] = 'Accept-Encoding'
+    if gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+@research_bp.route('/api/research/batch', methods=['POST'])
+def get_research_batch():
+    """Get the detail view of several research entries by ID in one query"""
+    try:
+        body = request.get_json(silent=True) or {}
+        if not isinstance(body, dict):
+            raise ValueError('Request body must be a JSON object')
+        ids = body.get('ids')
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, str) for i in ids):
+            raise ValueError('ids must be a non-empty list of research entry IDs')
+        
+        data = prisma.find_research_entries_by_ids(ids)
+        found = {row['id'] for row in data}
+        
+        return jsonify({
+            'success': True,
+            'data': data,
+            'count': len(data),
+            'missing': [i for i in dict.fromkeys(ids) if i not in found]
         })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -33,29 +185,11 @@ def get_all_research():
         }), 500
 
 @research_bp.route('/api/research/<research_id>', methods=['GET'])
+@response_cache.cached
 def get_research_by_id(research_id):
     """Get specific research entry by ID"""
     try:
-        query = f"""
-        SELECT 
-            re.*,
-            tp.age_range, tp.gender, tp.occupation, tp.adhd_subtype,
-            m.design, m.duration, m.primary_outcomes, m.secondary_outcomes,
-            kf.primary_results, kf.effect_sizes, kf.clinical_significance, kf.limitations,
-            wr.productivity_impact, wr.accommodation_needs, wr.career_implications,
-            qa.risk_of_bias, qa.grade_rating, qa.reviewer_notes,
-            ca.diagnostic_utility, ca.treatment_recommendations, ca.monitoring_parameters
-        FROM research_entries re
-        LEFT JOIN target_populations tp ON re.target_population_id = tp.id
-        LEFT JOIN methodologies m ON re.methodology_id = m.id
-        LEFT JOIN key_findings kf ON re.key_findings_id = kf.id
-        LEFT JOIN workplace_relevance wr ON re.workplace_relevance_id = wr.id
-        LEFT JOIN quality_assessments qa ON re.quality_assessment_id = qa.id
-        LEFT JOIN clinical_applications ca ON re.clinical_applications_id = ca.id
-        WHERE re.id = '{research_id}';
-        """
-        
-        data = prisma.query_raw(query)
+        data = prisma.find_research_entries_by_ids([research_id])
         
         if not data:
             return jsonify({
@@ -73,43 +207,47 @@ def get_research_by_id(research_id):
             'error': str(e)
         }), 500
 
+@research_bp.route('/api/research/<research_id>/related', methods=['GET'])
+@response_cache.cached
+def get_related_research(research_id):
+    """Get the research entries most similar to one entry (TF-IDF cosine similarity)"""
+    try:
+        data = related_entries(
+            research_id,
+            k=parse_int_arg('k', request.args.get('k'), 10, 1, MAX_RELATED),
+            fields=_parse_fields(request.args.get('fields')),
+        )
+        if data is None:
+            return jsonify({
+                'success': False,
+                'error': 'Research entry not found'
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'data': data,
+            'count': len(data)
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @research_bp.route('/api/research/stats', methods=['GET'])
 def get_research_stats():
     """Get research database statistics"""
     try:
-        stats = {}
-        
-        # Total counts
-        stats['total_research_entries'] = len(prisma.query_raw("SELECT COUNT(*) FROM research_entries;"))
-        stats['total_treatment_recommendations'] = len(prisma.query_raw("SELECT COUNT(*) FROM treatment_recommendations;"))
-        stats['total_assessment_tools'] = len(prisma.query_raw("SELECT COUNT(*) FROM assessment_tools;"))
-        
-        # Evidence level distribution
-        evidence_levels = prisma.query_raw("""
-            SELECT "evidenceLevel", COUNT(*) as count 
-            FROM research_entries 
-            GROUP BY "evidenceLevel" 
-            ORDER BY "evidenceLevel";
-        """)
-        stats['evidence_level_distribution'] = evidence_levels
-        
-        # Study type distribution
-        study_types = prisma.query_raw("""
-            SELECT "studyType", COUNT(*) as count 
-            FROM research_entries 
-            GROUP BY "studyType" 
-            ORDER BY count DESC;
-        """)
-        stats['study_type_distribution'] = study_types
-        
-        # Recent additions
-        recent = prisma.query_raw("""
-            SELECT title, "addedDate" 
-            FROM research_entries 
-            ORDER BY "addedDate" DESC 
-            LIMIT 5;
-        """)
-        stats['recent_additions'] = recent
+        version = data_version.current()
+        stats = stats_cache.get('stats', version)
+        if stats is None:
+            stats = fetch_research_stats()
+            stats_cache.set('stats', stats, version)
         
         return jsonify({
             'success': True,
@@ -122,6 +260,7 @@ def get_research_stats():
         }), 500
 
 @research_bp.route('/api/treatments', methods=['GET'])
+@response_cache.cached
 def get_treatment_recommendations():
     """Get all treatment recommendations"""
     try:
@@ -138,6 +277,7 @@ def get_treatment_recommendations():
         }), 500
 
 @research_bp.route('/api/assessments', methods=['GET'])
+@response_cache.cached
 def get_assessment_tools():
     """Get all assessment tools"""
     try:
@@ -154,6 +294,7 @@ def get_assessment_tools():
         }), 500
 
 @research_bp.route('/api/tags', methods=['GET'])
+@response_cache.cached
 def get_all_tags():
     """Get all available tags"""
     try:
@@ -0,0 +1,167 @@
+"""In-memory static file serving for the frontend
+
+Every file under the static folder is read once, when the app starts, along
+with gzip (and, if the optional ``brotli`` package is installed, brotli)
+variants of the compressible ones. Requests are then answered from a dict:
+no ``os.path.exists``, ``stat`` or ``open`` per hit.
+
+Variants are taken from ``<file>.gz`` / ``<file>.br`` on disk when a build
+step wrote them (and they are not older than the file), and compressed at
+startup otherwise:
+
+    python -m src.static_files compress [static dir]
+
+Caching: file names carrying a content hash (``app.3f9a1c2b.js``,
+``chunk-5e8d0a7f.css``) never change content, so they are sent with a
+year-long ``immutable`` Cache-Control. Everything else, ``index.html``
+included, is ``no-cache`` and revalidated with its ETag (a 304 costs no
+body).
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+from typing import Dict, NamedTuple, Optional
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# name.<hash>.ext or name-<hash>.ext, with at least 8 hex digits of hash
+_HASHED_NAME_RE = re.compile(r'[.-][0-9a-fA-F]{8,}\.[A-Za-z0-9]+$')
+_COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'application/xml',
+                       'image/svg+xml', 'image/x-icon', 'image/vnd.microsoft.icon', 'application/manifest+json')
+# Below this, compression saves less than the headers it adds
+MIN_COMPRESS_SIZE = 1024
+# Preference order when the client accepts several encodings
+ENCODINGS = ('br', 'gzip')
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+class StaticFile(NamedTuple):
+    mimetype: str
+    cache_control: str
+    # encoding ('identity', 'gzip', 'br') -> (body, etag)
+    variants: Dict[str, tuple]
+
+
+def is_hashed(name: str) -> bool:
+    return bool(_HASHED_NAME_RE.search(name))
+
+
+def _compressible(mimetype: str) -> bool:
+    return mimetype.startswith(_COMPRESSIBLE_TYPES)
+
+
+def _compress(encoding: str, body: bytes) -> Optional[bytes]:
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    if encoding == 'br' and brotli is not None:
+        return brotli.compress(body, quality=11)
+    return None
+
+
+def _etag(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class StaticAssets:
+    """The static folder's files, their compressed variants and headers, held in memory"""
+
+    def __init__(self, files: Dict[str, StaticFile]):
+        self.files = files
+
+    @classmethod
+    def load(cls, directory: Optional[str]) -> 'StaticAssets':
+        files = {}
+        if directory and os.path.isdir(directory):
+            for root, _, names in os.walk(directory):
+                for name in names:
+                    if name.endswith(tuple(SUFFIXES.values())) and os.path.exists(os.path.join(root, name[:-3])):
+                        continue  # a precompressed variant, picked up with its original
+                    path = os.path.join(root, name)
+                    relative = os.path.relpath(path, directory).replace(os.sep, '/')
+                    files[relative] = cls._load_file(path, name)
+        return cls(files)
+
+    @staticmethod
+    def _load_file(path: str, name: str) -> StaticFile:
+        with open(path, 'rb') as f:
+            body = f.read()
+        mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        variants = {'identity': (body, _etag(body))}
+        if _compressible(mimetype) and len(body) >= MIN_COMPRESS_SIZE:
+            for encoding in ENCODINGS:
+                precompressed = path + SUFFIXES[encoding]
+                if os.path.exists(precompressed) and os.path.getmtime(precompressed) >= os.path.getmtime(path):
+                    with open(precompressed, 'rb') as f:
+                        compressed = f.read()
+                else:
+                    compressed = _compress(encoding, body)
+                if compressed is not None and len(compressed) < len(body):
+                    variants[encoding] = (compressed, f'{variants["identity"][1]}-{encoding}')
+        cache_control = IMMUTABLE_CACHE_CONTROL if is_hashed(name) else REVALIDATE_CACHE_CONTROL
+        return StaticFile(mimetype, cache_control, variants)
+
+    def get(self, path: str) -> Optional[StaticFile]:
+        return self.files.get(path)
+
+    def response(self, static_file: StaticFile):
+        """Response for the current request: best accepted encoding, ETag, Cache-Control, 304 if unchanged"""
+        encoding = 'identity'
+        if len(static_file.variants) > 1:
+            accepted = request.accept_encodings
+            encoding = next((e for e in ENCODINGS if e in static_file.variants and accepted[e]), 'identity')
+        body, etag = static_file.variants[encoding]
+
+        # A plain ETag check: these bodies are small and never served by range
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(body, mimetype=static_file.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = static_file.cache_control
+        if len(static_file.variants) > 1:
+            response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+
+def write_precompressed(directory: str) -> int:
+    """Write .gz (and .br) variants next to every compressible file; returns the number written"""
+    written = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.endswith(tuple(SUFFIXES.values())):
+                continue
+            mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            path = os.path.join(root, name)
+            if not _compressible(mimetype) or os.path.getsize(path) < MIN_COMPRESS_SIZE:
+                continue
+            with open(path, 'rb') as f:
+                body = f.read()
+            for encoding in ENCODINGS:
+                compressed = _compress(encoding, body)
+                if compressed is not None and len(compressed) < len(body):
+                    with open(path + SUFFIXES[encoding], 'wb') as f:
+                        f.write(compressed)
+                    written += 1
+    return written
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'compress':
+        print('Usage: python -m src.static_files compress [static dir]')
+        sys.exit(1)
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    print(f'Wrote {write_precompressed(target)} precompressed files in {target}')
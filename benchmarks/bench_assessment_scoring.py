@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: matrix ASRS scoring vs scoring one assessment at a time
+
+Scores random answer sets to phase4/assessments/asrs_professional.json
+three ways: a Python loop that sums each section and applies the
+composite formula per assessment, score_batch() as used by
+/api/assessments/score (answer objects in, result objects out), and
+score_matrix() re-scoring an already-built N x Q array with new section
+weights, which is what a population-level re-score after a weight change
+costs. All must agree.
+
+Usage:
+    python benchmarks/bench_assessment_scoring.py [--assessments 100000]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'adhd_research_api'))
+
+from src.assessment_scoring import AssessmentScorer  # noqa: E402
+
+ROLES = ['Engineer', 'Designer', 'Executive', 'Teacher', 'Military', None]
+
+
+def python_score(document, weights, assessment):
+    """Reference scorer: per-section sums and the composite formula in plain Python"""
+    composite = 0.0
+    for section in document['sections']:
+        total = sum(assessment['responses'][question['id']] for question in section['questions'])
+        maximum = sum(max(option['value'] for option in question['options']) for question in section['questions'])
+        composite += weights[section['section_id']] * 100.0 * total / maximum
+    role = (assessment.get('role') or '').lower()
+    modifier = next((m['modifier'] for m in document['professional_modifiers'].values()
+                     if role in (r.lower() for r in m['roles'])), 0)
+    return min(max(composite + modifier, 0.0), 100.0)
+
+
+def timed_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--assessments', type=int, default=100000, help='assessments per run')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per mode')
+    args = parser.parse_args()
+
+    scorer = AssessmentScorer.load()
+    rng = random.Random(5)
+    assessments = [
+        {'responses': {question_id: rng.randint(0, 4) for question_id in scorer.question_ids}, 'role': rng.choice(ROLES)}
+        for _ in range(args.assessments)
+    ]
+    reweighted = scorer.with_weights({'core_adhd': 0.5, 'workplace_impact': 0.3, 'life_management': 0.2})
+    responses = scorer.response_matrix(a['responses'] for a in assessments)
+    codes = np.array([scorer.modifier_code(a['role']) for a in assessments])
+
+    expected = [python_score(scorer.document, reweighted.weights, a) for a in assessments]
+    assert np.allclose(reweighted.score_matrix(responses, codes)['score'], expected, atol=0.005)
+    expected = [python_score(scorer.document, scorer.weights, a) for a in assessments[:1000]]
+    assert np.allclose([r['score'] for r in scorer.score_batch(assessments[:1000])], expected, atol=0.005)
+
+    rows = [
+        ('python loop', timed_ms(lambda: [python_score(scorer.document, scorer.weights, a) for a in assessments], args.repeat)),
+        ('score_batch', timed_ms(lambda: scorer.score_batch(assessments), args.repeat)),
+        ('re-score matrix', timed_ms(lambda: scorer.with_weights(reweighted.weights).score_matrix(responses, codes), args.repeat)),
+    ]
+    print(f"Median ms to score {args.assessments:,} assessments ({len(scorer.question_ids)} questions)\n")
+    baseline = rows[0][1]
+    for label, ms in rows:
+        print(f"{label:<18}{ms:>10.1f}{baseline / ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/research/stats queries in sequence vs fanned out with asyncio
+
+Times the statistics behind /api/research/stats three ways: the single
+CTE statement PrismaClient.get_research_stats() sends (PostgreSQL runs its
+parts one after another in one backend), the six queries of
+src.async_database.RESEARCH_STATS_QUERIES one after another on the sync
+pool, and the same six through AsyncPrismaClient.gather(), each on its own
+connection.
+
+--rtt-ms adds that much simulated network round trip to every query
+(client-side sleep before it is sent), as for a database on another host.
+Fan-out only overlaps server work when PostgreSQL has spare cores, so on a
+single-core machine expect it to win only through the round trips.
+
+Usage:
+    DATABASE_URL=... python benchmarks/bench_async_stats.py [--runs 30] [--rtt-ms 0,2]
+"""
+
+import argparse
+import asyncio
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'adhd_research_api'))
+
+from src.async_database import RESEARCH_STATS_QUERIES, async_prisma  # noqa: E402
+from src.database_config import prisma  # noqa: E402
+
+
+def timed(fn, runs):
+    fn()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[math.ceil(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=30, help='timed runs per mode')
+    parser.add_argument('--rtt-ms', default='0,2', help='comma-separated simulated round trips per query')
+    args = parser.parse_args()
+
+    queries = list(RESEARCH_STATS_QUERIES.values())
+
+    for rtt_ms in [float(value) for value in args.rtt_ms.split(',')]:
+        rtt = rtt_ms / 1000
+
+        def single_statement():
+            time.sleep(rtt)
+            prisma.get_research_stats()
+
+        def sequential():
+            for query, params in queries:
+                time.sleep(rtt)
+                prisma.query_raw(query, params)
+
+        async def one(query, params):
+            await asyncio.sleep(rtt)
+            return await async_prisma.query_raw(query, params)
+
+        async def fan_out():
+            return await asyncio.gather(*(one(query, params) for query, params in queries))
+
+        print(f"Median (p95) ms per stats computation, {rtt_ms:g} ms round trip per query\n")
+        rows = [
+            ('one CTE statement', timed(single_statement, args.runs)),
+            ('6 queries in turn', timed(sequential, args.runs)),
+            ('6 queries gathered', timed(lambda: async_prisma.run(fan_out()), args.runs)),
+        ]
+        for label, (p50, p95) in rows:
+            print(f"{label:<22}{f'{p50:.2f} ({p95:.2f})':>18}")
+        print()
+
+    assert async_prisma.run(async_prisma.get_research_stats())['total_research_entries'] == \
+        prisma.get_research_stats()['total_research_entries']
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiled decision tree routing vs parsing conditions per call
+
+Routes random patient profiles (ASRS score 0-100 plus treatment pathway
+flags) through phase4/decision_trees/treatment_decision_tree.json three
+ways: parsing and evaluating each branch condition on every call (what an
+engine without a compile step does), the compiled tree one profile at a
+time, and the compiled tree in batch mode. All three must agree.
+
+Usage:
+    python benchmarks/bench_decision_tree.py [--profiles 10000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'adhd_research_api'))
+
+from src.decision_tree import (  # noqa: E402
+    DEFAULT_DECISION_TREE_JSON, DecisionTree, compile_condition, parse_condition,
+)
+
+FLAGS = [
+    'moderate_to_severe_symptoms', 'significant_workplace_impact', 'no_contraindications',
+    'mild_to_moderate_symptoms', 'patient_preference_therapy', 'medication_contraindications',
+]
+
+
+def parse_per_call(document, profile):
+    """Reference router that re-parses every condition it evaluates"""
+    nodes = {node['node_id']: node for node in document['decision_nodes']}
+    node_id, path = document['decision_nodes'][0]['node_id'], []
+    while node_id in nodes:
+        path.append(node_id)
+        node = nodes[node_id]
+        choices = [(branch['condition'], branch['next_node']) for branch in node.get('branches') or []]
+        choices += [(' && '.join(pathway['conditions']), pathway['next_node'])
+                    for pathway in node.get('treatment_pathways') or []]
+        if choices:
+            node_id = next((target for condition, target in choices
+                            if compile_condition(parse_condition(condition))(profile)), None)
+        else:
+            node_id = next((step['next_node'] for step in node.get('steps') or [] if step.get('next_node')), None)
+    if node_id is not None:
+        path.append(node_id)
+    return path
+
+
+def per_profile_us(fn, profiles, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(profiles)
+        timings.append((time.perf_counter() - start) * 1e6 / len(profiles))
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', type=int, default=10000, help='profiles per run')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per mode')
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    profiles = [
+        dict({'score': rng.randint(0, 100)}, **{flag: rng.random() < 0.6 for flag in FLAGS})
+        for _ in range(args.profiles)
+    ]
+    tree = DecisionTree.load()
+    with open(DEFAULT_DECISION_TREE_JSON, encoding='utf-8') as f:
+        document = json.load(f)
+
+    batch = tree.route_batch(profiles)
+    for profile, result in zip(profiles, batch):
+        assert tree.route(profile) == result
+        assert parse_per_call(document, profile) == result['path']
+
+    print(f"Median microseconds per profile over {args.profiles:,} profiles\n")
+    rows = [
+        ('parse per call', per_profile_us(lambda ps: [parse_per_call(document, p) for p in ps], profiles, args.repeat)),
+        ('compiled', per_profile_us(lambda ps: [tree.route(p) for p in ps], profiles, args.repeat)),
+        ('compiled batch', per_profile_us(tree.route_batch, profiles, args.repeat)),
+    ]
+    baseline = rows[0][1]
+    for label, us in rows:
+        print(f"{label:<18}{us:>10.2f}{baseline / us:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bitmap facet counts vs GROUP BY queries per request
+
+For a few filters, times what /api/research/facets does (a warm
+ResearchFacetIndex plus one page query) against computing the same counts
+in SQL: the page query plus one filtered GROUP BY per facet (evidence
+level, study type, tags). Runs against the database in DATABASE_URL, so
+load a realistic number of entries first (see migrate_data.js).
+
+Usage:
+    DATABASE_URL=... python benchmarks/bench_facets.py [--repeat 20]
+"""
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'adhd_research_api'))
+
+from src.database_config import PrismaClient, prefix_tsquery  # noqa: E402
+from src.facet_index import FacetIndexCache, faceted_search  # noqa: E402
+
+# (label, facet filters, search term)
+CASES = [
+    ('no filter', {}, None),
+    ('evidence level', {'evidenceLevel': ['LEVEL_1A']}, None),
+    ('study type + tag', {'studyType': ['RCT'], 'tags': ['cbt']}, None),
+    ('search', {}, 'stress'),
+    ('search + evidence', {'evidenceLevel': ['LEVEL_2B']}, 'workplace'),
+]
+
+GROUP_BY_SQL = {
+    'evidenceLevel': 'SELECT re."evidenceLevel" AS value, COUNT(*) AS count FROM research_entries re {where} GROUP BY 1',
+    'studyType': 'SELECT re."studyType" AS value, COUNT(*) AS count FROM research_entries re {where} GROUP BY 1',
+    'tags': """
+        SELECT t.name AS value, COUNT(*) AS count
+        FROM research_entries re
+        JOIN "_ResearchEntryTags" rt ON rt."A" = re.id JOIN tags t ON t.id = rt."B"
+        {where} GROUP BY 1 ORDER BY 2 DESC LIMIT 50
+    """,
+}
+
+
+def sql_where(filters, search):
+    """WHERE clause and params equivalent to the facet filters"""
+    conditions, params = [], []
+    if search:
+        conditions.append('re."searchVector" @@ to_tsquery(\'english\', %s)')
+        params.append(prefix_tsquery(search))
+    if filters.get('evidenceLevel'):
+        conditions.append('re."evidenceLevel"::text = ANY(%s)')
+        params.append(filters['evidenceLevel'])
+    if filters.get('studyType'):
+        conditions.append('re."studyType"::text = ANY(%s)')
+        params.append(filters['studyType'])
+    if filters.get('tags'):
+        conditions.append("""re.id IN (SELECT rt."A" FROM "_ResearchEntryTags" rt JOIN tags t ON t.id = rt."B"
+                             WHERE t.name = ANY(%s))""")
+        params.append(filters['tags'])
+    return ('WHERE ' + ' AND '.join(conditions)) if conditions else '', params
+
+
+def sql_facets(client, filters, search):
+    where, params = sql_where(filters, search)
+    counts = {facet: client.query_raw(sql.format(where=where), tuple(params)) for facet, sql in GROUP_BY_SQL.items()}
+    page = client.query_raw(
+        f'SELECT re.id, re.title FROM research_entries re {where} '
+        'ORDER BY re."publicationDate" DESC, re.id DESC LIMIT 50', tuple(params)
+    )
+    return page, counts
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    p95 = sorted(timings)[math.ceil(len(timings) * 0.95) - 1]
+    return statistics.median(timings), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='executions per case')
+    args = parser.parse_args()
+
+    client = PrismaClient()
+    cache = FacetIndexCache(client)
+    start = time.perf_counter()
+    size = cache.get().size
+    print(f"Built the facet index over {size:,} entries in {(time.perf_counter() - start) * 1000:.0f} ms "
+          "(once per data version)\n")
+
+    print("Median (p95) latency in ms for one page of 50 plus facet counts\n")
+    print(f"{'case':<22}{'GROUP BY':>18}{'bitmaps':>18}{'speedup':>9}{'matches':>9}")
+    for label, filters, search in CASES:
+        sql_p50, sql_p95 = timed(lambda: sql_facets(client, filters, search), args.repeat)
+        bitmap_p50, bitmap_p95 = timed(
+            lambda: faceted_search(filters, search=search, fields=['id', 'title'], client=client, cache=cache),
+            args.repeat,
+        )
+        total = faceted_search(filters, search=search, fields=['id'], limit=1, client=client, cache=cache)['total']
+        print(f"{label:<22}{f'{sql_p50:.2f} ({sql_p95:.2f})':>18}{f'{bitmap_p50:.2f} ({bitmap_p95:.2f})':>18}"
+              f"{sql_p50 / bitmap_p50:>8.1f}x{total:>9}")
+    client.close()
+
+
+if __name__ == '__main__':
+    main()
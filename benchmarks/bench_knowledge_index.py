@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bitmap-indexed knowledge base filters vs scanning the entry list
+
+Loads data/knowledge_base/knowledge_base.json (or --replicate copies of it,
+to see how both approaches scale) into KnowledgeIndex and times a few
+filter expressions three ways: a Python list comprehension over the
+entries, a first (parsed) evaluation, and a repeated (cached) evaluation.
+No database is needed.
+
+Usage:
+    python benchmarks/bench_knowledge_index.py [--replicate 1] [--repeat 200]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'adhd_research_api'))
+
+from src.knowledge_index import DEFAULT_KNOWLEDGE_BASE_JSON, ORDINAL_SCALES, KnowledgeIndex  # noqa: E402
+
+EVIDENCE = {level: rank for rank, level in enumerate(ORDINAL_SCALES['evidence_level'])}
+DIFFICULTY = {level: rank for rank, level in enumerate(ORDINAL_SCALES['implementation_difficulty'])}
+RELEVANCE = {level: rank for rank, level in enumerate(ORDINAL_SCALES['professional_relevance'])}
+
+# (filter expression, equivalent list scan predicate)
+CASES = [
+    ('evidence>=Medium-High', lambda e: EVIDENCE.get(e['evidence_level'], -1) >= 2),
+    ('domain="Workplace & Career Impact" AND evidence>=Medium AND difficulty<=Medium',
+     lambda e: e['domain'] == 'Workplace & Career Impact' and EVIDENCE.get(e['evidence_level'], -1) >= 1
+     and DIFFICULTY.get(e['implementation_difficulty'], 9) <= 1),
+    ('(evidence=High OR relevance="Very High") AND NOT domain="Evidence-Based Treatments"',
+     lambda e: (e['evidence_level'] == 'High' or e['professional_relevance'] == 'Very High')
+     and e['domain'] != 'Evidence-Based Treatments'),
+    ('relevance>High AND evidence=Low', lambda e: RELEVANCE.get(e['professional_relevance'], -1) > 2
+     and e['evidence_level'] == 'Low'),
+]
+
+
+def median_us(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--replicate', type=int, default=1, help='copies of the knowledge base to index')
+    parser.add_argument('--repeat', type=int, default=200, help='timed runs per case')
+    args = parser.parse_args()
+
+    with open(DEFAULT_KNOWLEDGE_BASE_JSON, encoding='utf-8') as f:
+        entries = json.load(f) * args.replicate
+    start = time.perf_counter()
+    index = KnowledgeIndex(entries)
+    print(f"Indexed {len(entries)} entries in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    print("Median microseconds to compute the matching set (match counts agree)\n")
+    print(f"{'expression':<60}{'scan':>10}{'parsed':>10}{'cached':>10}{'hits':>8}")
+    for expression, predicate in CASES:
+        scan = median_us(lambda: [e for e in entries if predicate(e)], args.repeat)
+
+        def parsed():
+            index._filter_cache.clear()
+            return index.filter(expression)
+        parse = median_us(parsed, args.repeat)
+        cached = median_us(lambda: index.filter(expression), args.repeat)
+
+        hits = index.filter(expression).bit_count()
+        assert hits == sum(1 for e in entries if predicate(e)), expression
+        label = expression if len(expression) <= 58 else expression[:55] + '...'
+        print(f"{label:<60}{scan:>10.1f}{parse:>10.1f}{cached:>10.2f}{hits:>8}")
+
+
+if __name__ == '__main__':
+    main()
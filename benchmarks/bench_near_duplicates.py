@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MinHash/LSH near-duplicate detection vs comparing every pair
+
+Synthesizes --entries knowledge base entries (titles and summaries drawn
+from the vocabulary of data/knowledge_base/knowledge_base.json), of which
+--duplicates are edited copies of another entry (about one word in
+twenty replaced). Times find_clusters() on all of them, reports how many
+of the planted copies whose exact Jaccard similarity reaches the
+threshold it recovered, and extrapolates the cost of exact all-pairs Jaccard from a
+sample. No database is needed.
+
+Usage:
+    python benchmarks/bench_near_duplicates.py [--entries 100000] [--duplicates 5000]
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'data' / 'tools'))
+
+from near_duplicates import DEFAULT_INPUT, entry_text, find_clusters, shingle_hashes  # noqa: E402
+
+
+def synthesize(count, duplicates, seed=7):
+    """Random entries plus edited copies; returns (entries, {copy index: original index})"""
+    rng = random.Random(seed)
+    base = json.loads(Path(DEFAULT_INPUT).read_text(encoding='utf-8'))
+    vocabulary = sorted({word for entry in base for word in entry_text(entry).lower().split()})
+
+    entries = []
+    for index in range(count - duplicates):
+        words = rng.choices(vocabulary, k=rng.randint(25, 60))
+        entries.append({'id': str(index), 'title': ' '.join(words[:8]), 'summary': ' '.join(words[8:])})
+
+    planted = {}
+    for _ in range(duplicates):
+        original = rng.randrange(count - duplicates)
+        words = entry_text(entries[original]).split()
+        for _ in range(max(len(words) // 20, 1)):
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        planted[len(entries)] = original
+        entries.append({'id': str(len(entries)), 'title': ' '.join(words[:8]), 'summary': ' '.join(words[8:])})
+    return entries, planted
+
+
+def jaccard(first, second):
+    first, second = set(shingle_hashes(entry_text(first)).tolist()), set(shingle_hashes(entry_text(second)).tolist())
+    return len(first & second) / len(first | second)
+
+
+def exact_pairs_per_second(entries, threshold, sample=1500):
+    sets = [set(shingle_hashes(entry_text(entry)).tolist()) for entry in entries[:sample]]
+    start = time.perf_counter()
+    pairs = 0
+    for first, second in itertools.combinations(sets, 2):
+        _ = len(first & second) / len(first | second) >= threshold
+        pairs += 1
+    return pairs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=100000, help='entries to synthesize')
+    parser.add_argument('--duplicates', type=int, default=5000, help='of which edited copies')
+    parser.add_argument('--threshold', type=float, default=0.7, help='similarity threshold')
+    args = parser.parse_args()
+
+    entries, planted = synthesize(args.entries, args.duplicates)
+    start = time.perf_counter()
+    clusters = find_clusters(entries, args.threshold)
+    elapsed = time.perf_counter() - start
+
+    cluster_of = {index: number for number, cluster in enumerate(clusters) for index, _ in cluster}
+    expected = [
+        (copy, original) for copy, original in planted.items()
+        if jaccard(entries[copy], entries[original]) >= args.threshold
+    ]
+    found = sum(1 for copy, original in expected if copy in cluster_of and cluster_of[copy] == cluster_of.get(original))
+    flagged = sum(len(cluster) for cluster in clusters)
+
+    rate = exact_pairs_per_second(entries, args.threshold)
+    all_pairs = args.entries * (args.entries - 1) // 2
+    print(f"{args.entries:,} entries, {args.duplicates:,} planted near-duplicates, threshold {args.threshold}\n")
+    print(f"MinHash/LSH:        {elapsed:8.1f} s   {len(clusters):,} clusters, {flagged:,} entries flagged, "
+          f"{found:,}/{len(expected):,} planted copies at or above the threshold found")
+    print(f"Exact all-pairs:    {all_pairs / rate:8.0f} s   (estimated: {all_pairs:,} pairs at {rate:,.0f} pairs/s)")
+
+
+if __name__ == '__main__':
+    main()
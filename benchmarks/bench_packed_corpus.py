@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: packed, memory-mapped corpus vs loading every enhanced JSON file
+
+Times four access patterns against the per-file ``json.load`` the corpus
+scripts do today, reporting median wall time and peak traced allocations:
+
+    titles      the hot title/domain/evidence columns for every entry
+    tier 1      one section (tier 1) of every entry
+    full        every section of every entry
+    listing     EnhancedEntry objects (enhanced_entries.py) reading each
+                entry's title, original_entry and tier 1, against a full
+                per-file parse, which is what listing costs without the pack
+
+Run ``python data/tools/corpus_pack.py`` first to build the pack.
+
+Usage:
+    python benchmarks/bench_packed_corpus.py [--source DIR] [--pack FILE] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'tools'))
+
+from corpus_pack import (  # noqa: E402
+    DEFAULT_PACK_PATH, DEFAULT_SOURCE_DIR, HOT_FIELDS, PackedCorpus, load_source_directory,
+)
+from enhanced_entries import EnhancedCorpus  # noqa: E402
+
+
+def json_titles(source):
+    entries, _, _ = load_source_directory(source)
+    return [[entry['sections']['original_entry'].get(field) for field in HOT_FIELDS] for entry in entries]
+
+
+def json_tier1(source):
+    entries, _, _ = load_source_directory(source)
+    return [entry['sections'].get('tier_1_essential_enhancement') for entry in entries]
+
+
+def json_full(source):
+    entries, _, _ = load_source_directory(source)
+    return entries
+
+
+def pack_titles(pack):
+    with PackedCorpus(pack) as corpus:
+        return list(zip(*(corpus.column(field) for field in HOT_FIELDS)))
+
+
+def pack_tier1(pack):
+    with PackedCorpus(pack) as corpus:
+        return [corpus.read_section(position, 'tier_1_essential_enhancement') for position in range(len(corpus))]
+
+
+def pack_full(pack):
+    with PackedCorpus(pack) as corpus:
+        return [corpus.read_entry(position) for position in range(len(corpus))]
+
+
+def lazy_listing(pack):
+    with EnhancedCorpus(pack) as corpus:
+        return [(entry.id, entry.title, entry.original_entry, entry.tier_1_essential_enhancement) for entry in corpus]
+
+
+def measure(fn, arg, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default=DEFAULT_SOURCE_DIR, help='directory of enhanced entry JSON files')
+    parser.add_argument('--pack', default=DEFAULT_PACK_PATH, help='packed corpus built by corpus_pack.py')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case')
+    args = parser.parse_args()
+
+    if not Path(args.pack).exists():
+        sys.exit(f"{args.pack} not found; run python data/tools/corpus_pack.py first")
+
+    source_bytes = sum(path.stat().st_size for path in Path(args.source).glob('*.json'))
+    with PackedCorpus(args.pack) as corpus:
+        entry_count = len(corpus)
+    print(f"{entry_count} entries: {source_bytes / 1024:.0f} KiB of JSON, "
+          f"{os.path.getsize(args.pack) / 1024:.0f} KiB packed\n")
+
+    print("Median wall time in ms, peak traced allocations in KiB\n")
+    print(f"{'case':<10}{'JSON files':>14}{'packed':>12}{'speedup':>9}{'JSON peak':>12}{'packed peak':>13}")
+    for label, json_fn, pack_fn in (
+        ('titles', json_titles, pack_titles),
+        ('tier 1', json_tier1, pack_tier1),
+        ('full', json_full, pack_full),
+        ('listing', json_full, lazy_listing),
+    ):
+        json_ms, json_peak = measure(json_fn, args.source, args.repeat)
+        pack_ms, pack_peak = measure(pack_fn, args.pack, args.repeat)
+        print(f"{label:<10}{json_ms:>14.1f}{pack_ms:>12.2f}{json_ms / pack_ms:>8.1f}x"
+              f"{json_peak:>12.0f}{pack_peak:>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
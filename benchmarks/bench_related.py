@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: related-entry lookups over the TF-IDF matrix vs a Python scan
+
+Builds the related research index from the database in DATABASE_URL, then
+times, for a sample of entries, the top-k lookup used by
+/api/research/<id>/related (one sparse matrix-vector product plus
+argpartition, on the memory-mapped .npy arrays) against scoring every
+entry with Python dict vectors and sorting. Also reports what a worker
+pays to get an index: memory-mapping the saved files vs rebuilding.
+
+Usage:
+    DATABASE_URL=... python benchmarks/bench_related.py [--sample 50] [-k 10]
+"""
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'adhd_research_api'))
+
+from src.database_config import PrismaClient  # noqa: E402
+from src.related_index import RelatedIndex  # noqa: E402
+from src.related_research import build_related_index  # noqa: E402
+
+
+def python_vectors(index):
+    """Each row of the matrix as a {term: weight} dict"""
+    vectors = []
+    for row in range(index.size):
+        start, end = index.indptr[row], index.indptr[row + 1]
+        vectors.append(dict(zip(index.indices[start:end].tolist(), index.weights[start:end].tolist())))
+    return vectors
+
+
+def python_related(vectors, ids, position, k):
+    query = vectors[position]
+    scores = []
+    for other, vector in enumerate(vectors):
+        if other != position:
+            score = sum(weight * vector.get(term, 0.0) for term, weight in query.items())
+            if score > 1e-9:
+                scores.append((score, ids[other]))
+    scores.sort(reverse=True)
+    return scores[:k]
+
+
+def timed(fn, items):
+    timings = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        timings.append((time.perf_counter() - start) * 1000)
+    p95 = sorted(timings)[math.ceil(len(timings) * 0.95) - 1]
+    return statistics.median(timings), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sample', type=int, default=50, help='entries to look up')
+    parser.add_argument('-k', type=int, default=10, help='related entries per lookup')
+    args = parser.parse_args()
+
+    client = PrismaClient()
+    start = time.perf_counter()
+    built = build_related_index(client)
+    build_ms = (time.perf_counter() - start) * 1000
+    client.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        built.save(directory)
+        start = time.perf_counter()
+        index = RelatedIndex.load(directory)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{index.size:,} entries, {index.dimensions:,} terms, {len(index.indices):,} non-zeros")
+        print(f"Rebuild from the database: {build_ms:.0f} ms; memory-map saved index: {load_ms:.1f} ms\n")
+
+        step = max(index.size // args.sample, 1)
+        positions = list(range(0, index.size, step))[:args.sample]
+        vectors = python_vectors(index)
+
+        print(f"Median (p95) ms per top-{args.k} lookup over {len(positions)} entries\n")
+        scan_p50, scan_p95 = timed(lambda p: python_related(vectors, index.ids, p, args.k), positions)
+        matrix_p50, matrix_p95 = timed(lambda p: index.related(index.ids[p], args.k), positions)
+        print(f"{'python scan':<16}{f'{scan_p50:.2f} ({scan_p95:.2f})':>18}")
+        print(f"{'tf-idf matrix':<16}{f'{matrix_p50:.2f} ({matrix_p95:.2f})':>18}{scan_p50 / matrix_p50:>8.1f}x")
+
+        for position in positions:
+            expected = [round(score, 4) for score, _ in python_related(vectors, index.ids, position, args.k)]
+            got = [round(score, 4) for _, score in index.related(index.ids[position], args.k)]
+            assert all(math.isclose(a, b, abs_tol=2e-4) for a, b in zip(expected, got)), index.ids[position]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: psql result decoding, legacy per-line CSV parser vs result_decoding
+
+Runs the full research_entries join from PrismaClient.find_many_research_entries
+once through psql, then times both parsers over the captured output. If
+psycopg is installed, also reports the end-to-end pool backend fetch rate.
+
+Usage:
+    DATABASE_URL=... PSQL_PATH=... python benchmarks/bench_result_decoding.py [--repeat 50]
+"""
+
+import argparse
+import csv
+import io
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'adhd_research_api'))
+
+from src.database_config import PrismaClient, _libpq_conninfo  # noqa: E402
+from src.result_decoding import NULL_SENTINEL, decode_csv  # noqa: E402
+
+
+def legacy_parse(stdout):
+    """The query_raw parser result_decoding replaced, kept verbatim for comparison"""
+    lines = stdout.strip().split('\n')
+    if not lines or not lines[0]:
+        return []
+    data = []
+    for line in lines:
+        if line.strip():
+            csv_reader = csv.reader(io.StringIO(line))
+            values = next(csv_reader)
+            if len(values) == 1:
+                row = {"result": values[0]}
+            else:
+                row = {f"col_{i}": value for i, value in enumerate(values)}
+            data.append(row)
+    return data
+
+
+def legacy_remap(raw_data, column_names):
+    """The col_N remapping find_many_research_entries used to do on top of legacy_parse"""
+    result = []
+    for row in raw_data:
+        new_row = {}
+        for i, col_name in enumerate(column_names):
+            col_key = f'col_{i}'
+            if col_key in row:
+                if col_name == 'authors' and row[col_key]:
+                    authors_str = row[col_key].strip('{}')
+                    new_row[col_name] = [a.strip('\"\'') for a in authors_str.split(',')] if authors_str else []
+                else:
+                    new_row[col_name] = row[col_key]
+        result.append(new_row)
+    return result
+
+
+def capture_join_query(client):
+    """Return the SQL that find_many_research_entries sends"""
+    captured = []
+    original = client.query_raw
+    client.query_raw = lambda query, params=None: captured.append(query) or []
+    try:
+        client.find_many_research_entries()
+    finally:
+        client.query_raw = original
+    return captured[0]
+
+
+def run_psql(client, query, *flags):
+    cmd = [client.psql_path, _libpq_conninfo(client.db_url), "-c", query, *flags]
+    return subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+
+
+def time_it(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50, help='iterations per parser')
+    args = parser.parse_args()
+
+    client = PrismaClient(backend='psql')
+    query = capture_join_query(client)
+
+    legacy_output = run_psql(client, query, "-t", "--csv")
+    typed_output = run_psql(client, query, "--quiet", "--csv", "--pset", f"null={NULL_SENTINEL}")
+    column_names = next(csv.reader(io.StringIO(typed_output)))
+
+    legacy_s, legacy_rows = time_it(lambda: legacy_remap(legacy_parse(legacy_output), column_names), args.repeat)
+    typed_s, typed_rows = time_it(lambda: decode_csv(typed_output), args.repeat)
+
+    print(f"Output size: {len(typed_output) / 1024:.1f} KiB")
+    print(f"{'parser':<28}{'rows':>8}{'ms/parse':>12}{'rows/sec':>14}")
+    print(f"{'legacy csv + col_N remap':<28}{len(legacy_rows):>8}{legacy_s * 1000:>12.2f}{len(legacy_rows) / legacy_s:>14,.0f}")
+    print(f"{'result_decoding.decode_csv':<28}{len(typed_rows):>8}{typed_s * 1000:>12.2f}{len(typed_rows) / typed_s:>14,.0f}")
+    if len(legacy_rows) != len(typed_rows):
+        print(f"Note: legacy parser produced {len(legacy_rows) - len(typed_rows):+d} rows "
+              "(multi-line text fields are split into bogus rows)")
+
+    try:
+        pool_client = PrismaClient(backend='pool')
+    except ValueError as e:
+        print(f"Skipping pool backend: {e}")
+        return
+    pool_client.query_raw(query)  # open the pool and warm the connection
+    pool_s, pool_rows = time_it(lambda: pool_client.query_raw(query), args.repeat)
+    print(f"{'pool backend (end to end)':<28}{len(pool_rows):>8}{pool_s * 1000:>12.2f}{len(pool_rows) / pool_s:>14,.0f}")
+    pool_client.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full-text searchVector lookup vs the old ILIKE scan
+
+Builds a synthetic table in a scratch ``bench_search`` schema (100k rows by
+default) with the same weighted tsvector and GIN index the
+research_search_vector migration adds, then times the previous
+``ILIKE '%term%'`` query against the prefix tsquery for a few search terms.
+
+Usage:
+    DATABASE_URL=... python benchmarks/bench_search.py [--rows 100000] [--repeat 20] [--keep]
+"""
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'adhd_research_api'))
+
+from src.database_config import PrismaClient, prefix_tsquery  # noqa: E402
+
+VOCABULARY = [
+    'adhd', 'adult', 'workplace', 'stress', 'management', 'executive', 'function', 'stimulant',
+    'methylphenidate', 'atomoxetine', 'cognitive', 'behavioral', 'therapy', 'mindfulness', 'sleep',
+    'productivity', 'accommodation', 'career', 'burnout', 'anxiety', 'depression', 'comorbidity',
+    'attention', 'hyperactivity', 'impulsivity', 'meta', 'analysis', 'randomized', 'trial', 'cohort',
+    'professional', 'outcomes', 'quality', 'life', 'emotional', 'regulation', 'coaching', 'exercise',
+]
+SURNAMES = ['Ostinelli', 'Schulze', 'Zangani', 'Farhat', 'Yang', 'Zhang', 'Oscarsson', 'Carlbring', 'Andersson'] + [
+    f'Author{i}' for i in range(2000)
+]
+JOURNALS = ['The Lancet Psychiatry', 'Frontiers in Psychiatry', 'JMIR Formative Research', 'Journal of Attention Disorders']
+
+# (label, search term)
+TERMS = [
+    ('common word', 'stress'),
+    ('two words', 'workplace burnout'),
+    ('prefix', 'methylphen'),
+    ('author', 'Carlbring'),
+    ('rare author', 'Author1234'),
+    ('no match', 'zebrafish'),
+]
+
+SETUP_SQL = """
+DROP SCHEMA IF EXISTS bench_search CASCADE;
+CREATE SCHEMA bench_search;
+CREATE TABLE bench_search.research_entries (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    authors TEXT[],
+    journal TEXT NOT NULL,
+    findings TEXT NOT NULL,
+    "publicationDate" TIMESTAMP(3) NOT NULL,
+    "searchVector" tsvector
+);
+-- Each word slot is a domain term 5%% of the time and otherwise a filler
+-- word drawn from a skewed 20k-word distribution, roughly like real text
+CREATE FUNCTION bench_search.words(n INT) RETURNS TEXT LANGUAGE sql VOLATILE AS $$
+    SELECT string_agg(
+        CASE WHEN random() < 0.05
+             THEN %(vocab)s[1 + floor(random() * %(vocab_len)s)::int]
+             ELSE 'w' || floor(20000 * power(random(), 3))::int
+        END, ' ')
+    FROM generate_series(1, n)
+$$;
+INSERT INTO bench_search.research_entries (id, title, authors, journal, findings, "publicationDate")
+SELECT
+    'r' || g,
+    bench_search.words(8 + (g %% 5)),
+    ARRAY[%(surnames)s[1 + (g %% %(surnames_len)s)], %(surnames)s[1 + ((g * 7) %% %(surnames_len)s)]],
+    %(journals)s[1 + (g %% %(journals_len)s)],
+    bench_search.words(30 + (g %% 11)),
+    timestamp '2015-01-01' + (g %% 3650) * interval '1 day'
+FROM generate_series(1, %(rows)s) g;
+UPDATE bench_search.research_entries SET "searchVector" =
+    setweight(to_tsvector('english', title), 'A') ||
+    setweight(to_tsvector('english', array_to_string(authors, ' ')), 'B') ||
+    setweight(to_tsvector('english', journal), 'C') ||
+    setweight(to_tsvector('english', findings), 'D');
+CREATE INDEX ON bench_search.research_entries USING GIN ("searchVector");
+CREATE INDEX ON bench_search.research_entries ("publicationDate" DESC, id DESC);
+ANALYZE bench_search.research_entries;
+"""
+
+# The previous search_research_entries query, which returned every match
+ILIKE_SQL = """
+SELECT id, title FROM bench_search.research_entries
+WHERE title ILIKE '%%' || %s || '%%'
+   OR array_to_string(authors, ', ') ILIKE '%%' || %s || '%%'
+   OR journal ILIKE '%%' || %s || '%%'
+ORDER BY "publicationDate" DESC
+"""
+
+# What find_research_entries(search=...) sends, with and without ?limit=
+FTS_SQL = """
+SELECT id, title, ts_rank_cd("searchVector", to_tsquery('english', %s)) AS "searchRank"
+FROM bench_search.research_entries
+WHERE "searchVector" @@ to_tsquery('english', %s)
+ORDER BY "searchRank" DESC, "publicationDate" DESC, id DESC
+"""
+FTS_PAGE_SQL = FTS_SQL + "LIMIT 50"
+
+
+def sql_array(items):
+    """Literal SQL text[] so row generation stays entirely server side"""
+    return "(ARRAY[" + ", ".join("'" + item.replace("'", "''") + "'" for item in items) + "])"
+
+
+def time_query(conn, sql, params, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = conn.execute(sql, params).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    p95 = sorted(timings)[math.ceil(len(timings) * 0.95) - 1]
+    return statistics.median(timings), p95, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000, help='synthetic rows to generate')
+    parser.add_argument('--repeat', type=int, default=20, help='executions per query')
+    parser.add_argument('--keep', action='store_true', help='keep the bench_search schema afterwards')
+    args = parser.parse_args()
+
+    client = PrismaClient(backend='pool')
+    with client.pool.connection() as conn:
+        print(f"Building {args.rows:,} synthetic rows in schema bench_search...")
+        start = time.perf_counter()
+        setup = SETUP_SQL % {
+            'vocab': sql_array(VOCABULARY), 'vocab_len': len(VOCABULARY),
+            'surnames': sql_array(SURNAMES), 'surnames_len': len(SURNAMES),
+            'journals': sql_array(JOURNALS), 'journals_len': len(JOURNALS),
+            'rows': args.rows,
+        }
+        conn.execute(setup)
+        conn.commit()
+        print(f"Built in {time.perf_counter() - start:.1f}s\n")
+
+        print("Median (p95) latency in ms; hits are ILIKE / full-text matches\n")
+        print(f"{'term':<30}{'ILIKE':>18}{'full-text':>18}{'full-text page':>18}{'speedup':>9}{'hits':>15}")
+        try:
+            for label, term in TERMS:
+                # The old query matched the raw term as a substring of each column
+                ilike_p50, ilike_p95, ilike_hits = time_query(conn, ILIKE_SQL, (term, term, term), args.repeat)
+                tsquery = prefix_tsquery(term)
+                fts_p50, fts_p95, fts_hits = time_query(conn, FTS_SQL, (tsquery, tsquery), args.repeat)
+                page_p50, page_p95, _ = time_query(conn, FTS_PAGE_SQL, (tsquery, tsquery), args.repeat)
+                print(f"{label + ' (' + term + ')':<30}"
+                      f"{f'{ilike_p50:.2f} ({ilike_p95:.2f})':>18}"
+                      f"{f'{fts_p50:.2f} ({fts_p95:.2f})':>18}"
+                      f"{f'{page_p50:.2f} ({page_p95:.2f})':>18}"
+                      f"{ilike_p50 / fts_p50:>8.1f}x"
+                      f"{f'{ilike_hits} / {fts_hits}':>15}")
+        finally:
+            if not args.keep:
+                conn.execute("DROP SCHEMA bench_search CASCADE")
+                conn.commit()
+    client.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Load test: requests/sec on /api/research by server mode and worker count
+
+Starts the API under the single-threaded Werkzeug dev server (what
+`python adhd_research_api/src/main.py` runs) and then under gunicorn with
+adhd_research_api/gunicorn.conf.py at each --workers count, and drives
+each with --clients load-generating processes of --connections keep-alive
+connections for --duration seconds. Reports throughput and latency.
+
+The load generator runs on the same machine, so leave it CPU headroom:
+scaling flattens out once server workers and clients together saturate
+the cores.
+
+Usage:
+    DATABASE_URL=... python benchmarks/bench_serving.py [--workers 1,2,4] [--path /api/research?limit=20]
+"""
+
+import argparse
+import http.client
+import math
+import multiprocessing
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parents[1] / 'adhd_research_api'
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(port, path, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', path)
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server on port {port} did not answer {path} with 200')
+
+
+def start_server(mode, workers, threads, port):
+    if mode == 'werkzeug':
+        command = [sys.executable, '-c',
+                   f"from src.main import app; app.run(host='127.0.0.1', port={port}, threaded=False)"]
+    else:
+        command = ['gunicorn', '-c', str(API_DIR / 'gunicorn.conf.py'), '--bind', f'127.0.0.1:{port}',
+                   '--workers', str(workers), '--threads', str(threads)]
+    return subprocess.Popen(command, cwd=API_DIR, env=dict(os.environ, GUNICORN_ACCESS_LOG=''),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def client(port, path, connections, duration, results):
+    """One load-generating process: `connections` threads, each on one keep-alive connection"""
+    latencies, errors = [], [0]
+    deadline = time.monotonic() + duration
+
+    def run():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status == 200
+            except OSError:
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            if ok:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors[0] += 1
+
+    threads = [threading.Thread(target=run) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put((latencies, errors[0]))
+
+
+def load(port, path, clients, connections, duration):
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=client, args=(port, path, connections, duration, results))
+        for _ in range(clients)
+    ]
+    for process in processes:
+        process.start()
+    latencies, errors = [], 0
+    for _ in processes:
+        got, failed = results.get()
+        latencies += got
+        errors += failed
+    for process in processes:
+        process.join()
+    latencies.sort()
+    p95 = latencies[math.ceil(len(latencies) * 0.95) - 1] if latencies else float('nan')
+    return len(latencies) / duration, statistics.median(latencies) if latencies else float('nan'), p95, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default='/api/research?limit=20', help='request path')
+    parser.add_argument('--workers', default='1,2,4', help='comma-separated gunicorn worker counts')
+    parser.add_argument('--threads', type=int, default=2, help='threads per gunicorn worker')
+    parser.add_argument('--clients', type=int, default=2, help='load-generating processes')
+    parser.add_argument('--connections', type=int, default=8, help='connections per client process')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per run')
+    args = parser.parse_args()
+
+    runs = [('werkzeug', 1)] + [('gunicorn', int(count)) for count in args.workers.split(',')]
+    print(f"GET {args.path}, {args.clients} x {args.connections} connections, {args.duration:g} s per run, "
+          f"{os.cpu_count()} CPUs\n")
+    print(f"{'server':<24}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+    for mode, workers in runs:
+        port = free_port()
+        server = start_server(mode, workers, args.threads, port)
+        try:
+            wait_until_up(port, args.path)
+            load(port, args.path, 1, 2, 1)  # warm every worker's pool and caches
+            rate, p50, p95, errors = load(port, args.path, args.clients, args.connections, args.duration)
+        finally:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait()
+        label = 'werkzeug dev server' if mode == 'werkzeug' else f'gunicorn {workers}w x {args.threads}t'
+        print(f"{label:<24}{rate:>10.0f}{p50:>10.2f}{p95:>10.2f}{errors:>8}")
+
+
+if __name__ == '__main__':
+    main()
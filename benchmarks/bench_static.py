@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: in-memory static serving vs send_from_directory per request
+
+Requests the frontend (/, /favicon.ico and a client-side route that falls
+back to index.html) through Flask's test client, once with the previous
+catch-all view (os.path.exists plus send_from_directory on every hit) and
+once with src.static_files. Reports time per request, os.stat and open
+calls per request, and bytes sent to a client that accepts gzip.
+No database is needed.
+
+Usage:
+    python benchmarks/bench_static.py [--requests 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault('API_MODE', 'knowledge')
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'adhd_research_api'))
+
+from flask import Flask, send_from_directory  # noqa: E402
+from flask_cors import CORS  # noqa: E402
+
+from src.main import app  # noqa: E402
+
+PATHS = ['/', '/favicon.ico', '/research/some-entry']
+
+
+def legacy_app():
+    """The catch-all view as it was, serving the same static folder"""
+    legacy = Flask(__name__, static_folder=app.static_folder)
+    CORS(legacy)
+
+    @legacy.route('/', defaults={'path': ''})
+    @legacy.route('/<path:path>')
+    def serve(path):
+        static_folder_path = legacy.static_folder
+        if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
+            return send_from_directory(static_folder_path, path)
+        return send_from_directory(static_folder_path, 'index.html')
+
+    return legacy
+
+
+class FilesystemCalls:
+    """Counts os.stat calls (os.path.exists/isfile go through it) and file opens"""
+
+    def __init__(self):
+        self.stats = self.opens = 0
+        self._stat = os.stat
+        sys.addaudithook(self._audit)
+        self.active = False
+
+    def _audit(self, event, args):
+        if self.active and event == 'open':
+            self.opens += 1
+
+    def __enter__(self):
+        self.stats = self.opens = 0
+        real_stat = self._stat
+
+        def counting_stat(*args, **kwargs):
+            self.stats += 1
+            return real_stat(*args, **kwargs)
+
+        os.stat = counting_stat
+        self.active = True
+        return self
+
+    def __exit__(self, *exc):
+        os.stat = self._stat
+        self.active = False
+
+
+def run(client, requests, headers, counter):
+    sent = 0
+    with counter:
+        start = time.perf_counter()
+        for i in range(requests):
+            response = client.get(PATHS[i % len(PATHS)], headers=headers)
+            sent += len(response.get_data())
+            response.close()
+        elapsed = time.perf_counter() - start
+    return elapsed * 1e6 / requests, counter.stats / requests, counter.opens / requests, sent / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000, help='requests per mode')
+    args = parser.parse_args()
+
+    counter = FilesystemCalls()
+    headers = {'Accept-Encoding': 'gzip, deflate'}
+    rows = [
+        ('send_from_directory', run(legacy_app().test_client(), args.requests, headers, counter)),
+        ('in-memory', run(app.test_client(), args.requests, headers, counter)),
+    ]
+    print(f"{args.requests:,} requests over {', '.join(PATHS)}\n")
+    print(f"{'':<22}{'us/req':>10}{'stat/req':>10}{'open/req':>10}{'bytes/req':>11}")
+    for label, (us, stats, opens, sent) in rows:
+        print(f"{label:<22}{us:>10.1f}{stats:>10.1f}{opens:>10.1f}{sent:>11,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""
+Packed corpus format for the enhanced research entries
+
+``data/processed/enhanced/complete_enhanced/`` holds one deeply nested JSON
+document per finding. Consumers that only need titles or a single tier
+still have to parse every file in full. This module converts the directory
+into a single packed file that readers memory-map and decode piecemeal:
+
+    header      magic, format version, entry count and the offset/length
+                of each section below
+    data        every entry's sections (original_entry, each tier, ...)
+                as separate compact JSON blobs
+    index       (offset, length) u64 pairs per entry and section, so any
+                one section of any one entry is a slice of the map
+    ids         string table of entry ids, in index order
+    columns     hot original_entry fields stored column-wise: titles as a
+                string table, low-cardinality fields dictionary-encoded
+    meta        JSON: section and column layout, source file per entry,
+                and the files that were repaired or could not be read
+
+All integers are little-endian. The source documents use a dozen spellings
+for the same sections (``tier1_enhancement``, ``tier_1_essential_enhancement``,
+an ``enhancement_framework`` wrapper, ...), so they are normalized to the
+names in SECTIONS on the way in.
+
+Usage:
+    python data/tools/corpus_pack.py [--source DIR] [--output FILE] [--strict] [--report FILE]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_SOURCE_DIR = REPO_ROOT / 'data' / 'processed' / 'enhanced' / 'complete_enhanced'
+DEFAULT_PACK_PATH = REPO_ROOT / 'data' / 'processed' / 'enhanced' / 'enhanced_corpus.pack'
+
+MAGIC = b'ADHDPACK'
+FORMAT_VERSION = 1
+
+# magic, version, reserved, entry count, then (offset, length) of index, ids, columns, meta
+HEADER = struct.Struct('<8sHHI8Q')
+
+SECTIONS = (
+    'original_entry',
+    'tier_1_essential_enhancement',
+    'tier_2_strategic_enhancement',
+    'tier_3_future_enhancement',
+    'content_creation_framework',
+    'quality_assurance',
+    'extra',
+)
+
+# Hot original_entry fields stored column-wise; the others are dictionary-encoded
+HOT_FIELDS = ('title', 'domain', 'evidence_level', 'professional_relevance')
+STRING_COLUMNS = {'title'}
+
+NULL_CODE = 0xFFFF
+
+# Objects that some documents wrap their tiers in; their keys are lifted to the top level
+WRAPPER_KEYS = (
+    'enhanced_research_finding', 'enhanced_finding', 'enhanced_entry', 'enhancement_framework',
+    'enhancements', 'enhancement_tiers', 'enhancement_trio',
+)
+ID_KEYS = ('id', 'finding_id', 'findingId')
+TITLE_KEYS = ('title', 'research_finding_title', 'finding_title', 'findingTitle')
+SUMMARY_KEYS = (
+    'summary', 'original_finding', 'research_finding', 'original_research_finding', 'original_finding_summary',
+    'finding_description', 'finding_statement', 'findingStatement', 'research_finding_statement',
+)
+ORIGINAL_KEYS = ('original_entry', 'original_finding', 'original_research_finding', 'research_finding')
+
+_SECTION_PATTERNS = (
+    (re.compile(r'^tier_?1(?!\d)'), 'tier_1_essential_enhancement'),
+    (re.compile(r'^tier_?2(?!\d)'), 'tier_2_strategic_enhancement'),
+    (re.compile(r'^tier_?3(?!\d)'), 'tier_3_future_enhancement'),
+    (re.compile(r'^content_creation'), 'content_creation_framework'),
+    (re.compile(r'^quality_assurance$'), 'quality_assurance'),
+)
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+_FENCE_RE = re.compile(r"^(?:'''|```)(?:json)?\s*|\s*(?:'''|```)$")
+_BAD_ESCAPE_RE = re.compile(r'\\(?!["\\/bfnrtu])')
+_TITLE_PREFIX_RE = re.compile(r'^(?:enhanced research finding|tier \d[^:]*):\s*', re.IGNORECASE)
+# "... - Enhanced Research Finding v1.0", "...: A 3-Tier Enhancement Framework"
+_TITLE_SUFFIX_RE = re.compile(
+    r'\s*(?: - |: )(?:an? )?(?:(?:3-tier|comprehensive|professional) )*enhance(?:d|ment)\b.*$', re.IGNORECASE
+)
+_LENIENT_DECODER = json.JSONDecoder(strict=False)
+
+
+def parse_enhanced_document(text):
+    """Parse one enhanced entry file, repairing common generation glitches
+
+    Handles surrounding code fences, raw control characters inside strings,
+    unescaped backslashes and stray closing braces after the document.
+
+    Returns:
+        (document, repaired) where repaired says whether a fix was needed
+
+    Raises:
+        ValueError: the file cannot be read as a single JSON object
+    """
+    text = _FENCE_RE.sub('', text.lstrip('﻿').strip())
+    try:
+        document, repaired = json.loads(text), False
+    except ValueError:
+        document, end = _LENIENT_DECODER.raw_decode(_BAD_ESCAPE_RE.sub(r'\\\\', text))
+        if text[end:].strip().strip('}').strip():
+            raise ValueError(f'unexpected data after the document at char {end}') from None
+        repaired = True
+    if not isinstance(document, dict):
+        raise ValueError(f'expected a JSON object, got {type(document).__name__}')
+    return document, repaired
+
+
+def _section_name(key):
+    slug = _SLUG_RE.sub('_', key.lower()).strip('_')
+    for pattern, name in _SECTION_PATTERNS:
+        if pattern.match(slug):
+            return name
+    return None
+
+
+def _first_string(document, keys):
+    for key in keys:
+        value = document.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def _clean_title(title):
+    """Strip generation boilerplate from a title
+
+    Returns:
+        (title, summary) where summary is a finding sentence that was
+        appended to the title after " - ", or None
+    """
+    title = _TITLE_PREFIX_RE.sub('', title.strip().strip('"\'').strip())
+    summary = None
+    if ' - ' in title:
+        head, tail = (part.strip() for part in title.split(' - ', 1))
+        if tail.endswith('.'):
+            # "ADHD and Allergies - Allergies and ADHD may interact, ..."
+            title, summary = head, tail
+    return _TITLE_SUFFIX_RE.sub('', title), summary
+
+
+def normalize_enhanced_document(document, fallback_id):
+    """Map one parsed document onto SECTIONS
+
+    Returns:
+        (entry id, {section name: value}) with absent sections omitted
+    """
+    document = dict(document)
+    wrapper_title = None
+    for key in WRAPPER_KEYS + tuple(document):
+        wrapped = document.get(key)
+        if not isinstance(wrapped, dict):
+            continue
+        if key not in WRAPPER_KEYS:
+            # {"Enhanced Research Finding: Technology Tools for ADHD Management": {...}}
+            if not _TITLE_PREFIX_RE.match(key) or _section_name(key):
+                continue
+            wrapper_title = key
+        del document[key]
+        for inner_key, value in wrapped.items():
+            document.setdefault(inner_key, value)
+
+    sections = {}
+    extra = {}
+    section_titles = []
+    for key, value in document.items():
+        name = _section_name(key)
+        if name is None:
+            extra[key] = value
+            continue
+        if key != name:
+            section_titles.append(key)
+        if isinstance(value, dict):
+            # A few documents nest the later tiers inside tier 1
+            nested = {inner: _section_name(inner) for inner in value}
+            if any(section not in (None, name) for section in nested.values()):
+                value = dict(value)
+                for inner, section in nested.items():
+                    if section not in (None, name):
+                        sections.setdefault(section, value.pop(inner))
+        sections.setdefault(name, value)
+
+    original = {}
+    for key in ORIGINAL_KEYS:
+        if isinstance(extra.get(key), dict):
+            original = dict(extra.pop(key))
+            break
+    for key in list(original):
+        # {"research_finding": {"title": ..., "tier1_essential_enhancement": {...}, ...}}
+        name = _section_name(key)
+        if name is not None:
+            sections.setdefault(name, original.pop(key))
+
+    title = original.get('title') or _first_string(extra, TITLE_KEYS) or wrapper_title
+    summary = original.get('summary') or _first_string(extra, SUMMARY_KEYS)
+    if not title and summary and ' - ' in summary:
+        # "ADHD and Substance Use - Adults with ADHD have higher rates ..."
+        title, summary = (part.strip() for part in summary.split(' - ', 1))
+    if not title and section_titles and ':' in section_titles[0]:
+        # "Tier 1 - Essential Enhancement: ADHD and Impulse Control"
+        title = section_titles[0].split(':', 1)[1].strip()
+    if title:
+        original['title'], title_summary = _clean_title(title)
+        summary = summary or title_summary
+    if summary:
+        original['summary'] = summary
+
+    entry_id = original.get('id') or _first_string(extra, ID_KEYS) or fallback_id
+    original.setdefault('id', entry_id)
+    sections['original_entry'] = original
+    for key in ID_KEYS + TITLE_KEYS + SUMMARY_KEYS:
+        extra.pop(key, None)
+    if extra:
+        sections['extra'] = extra
+    return entry_id, sections
+
+
+def fallback_entry_id(path):
+    """Id for a document that does not carry one, from its file name
+
+    Files are named NNN_<random>_...; the first two parts are unique enough.
+    They are lowercased to fit the schema's id pattern.
+    """
+    return '_'.join(Path(path).stem.split('_')[:2]).lower()
+
+
+def load_source_directory(source_dir):
+    """Parse and normalize every *.json file in source_dir
+
+    Returns:
+        (entries, errors, repaired) where entries is a list of
+        {'id', 'source', 'sections'} dicts in file name order
+    """
+    entries, errors, repaired = [], [], []
+    seen_ids = {}
+    for path in sorted(Path(source_dir).glob('*.json')):
+        try:
+            document, was_repaired = parse_enhanced_document(path.read_text(encoding='utf-8'))
+        except (ValueError, UnicodeDecodeError) as e:
+            errors.append({'file': path.name, 'error': str(e)})
+            continue
+        if was_repaired:
+            repaired.append(path.name)
+
+        entry_id, sections = normalize_enhanced_document(document, fallback_entry_id(path))
+        if entry_id in seen_ids:
+            seen_ids[entry_id] += 1
+            entry_id = f'{entry_id}_{seen_ids[entry_id]}'
+        seen_ids[entry_id] = 1
+        entries.append({'id': entry_id, 'source': path.name, 'sections': sections})
+    return entries, errors, repaired
+
+
+def _encode_strings(values):
+    """u32 count, u32 offsets[count + 1], UTF-8 blob"""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = array('I', [0])
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    if sys.byteorder == 'big':
+        offsets.byteswap()
+    return struct.pack('<I', len(encoded)) + offsets.tobytes() + b''.join(encoded)
+
+
+def _encode_codes(values):
+    """Dictionary encoding: distinct values as a string table plus u16 codes"""
+    dictionary = sorted({value for value in values if value is not None})
+    lookup = {value: code for code, value in enumerate(dictionary)}
+    codes = array('H', (NULL_CODE if value is None else lookup[value] for value in values))
+    if sys.byteorder == 'big':
+        codes.byteswap()
+    return _encode_strings(dictionary), codes.tobytes()
+
+
+def write_pack(entries, path, errors=(), repaired=(), source_dir=None, validation=None):
+    """Write entries (as returned by load_source_directory) to a packed file
+
+    The file is written to a temporary name and renamed into place, so
+    readers never see a partial pack. validation is the schema report from
+    validate_entries(), stored in the metadata as is.
+    """
+    path = Path(path)
+    data = bytearray()
+    index = array('Q')
+    offset = HEADER.size
+    for entry in entries:
+        for name in SECTIONS:
+            value = entry['sections'].get(name)
+            if value is None:
+                index.extend((0, 0))
+                continue
+            blob = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            index.extend((offset + len(data), len(blob)))
+            data += blob
+    if sys.byteorder == 'big':
+        index.byteswap()
+
+    index_offset = offset + len(data)
+    index_bytes = index.tobytes()
+    ids_offset = index_offset + len(index_bytes)
+    ids_bytes = _encode_strings(entry['id'] for entry in entries)
+
+    columns_offset = ids_offset + len(ids_bytes)
+    columns = bytearray()
+    layout = {}
+    for field in HOT_FIELDS:
+        values = []
+        for entry in entries:
+            value = entry['sections']['original_entry'].get(field)
+            values.append(str(value) if value is not None else None)
+        if field in STRING_COLUMNS:
+            layout[field] = {'kind': 'string', 'offset': columns_offset + len(columns)}
+            columns += _encode_strings(value or '' for value in values)
+        else:
+            dictionary, codes = _encode_codes(values)
+            layout[field] = {'kind': 'dictionary', 'offset': columns_offset + len(columns)}
+            columns += dictionary
+            layout[field]['codes_offset'] = columns_offset + len(columns)
+            columns += codes
+
+    meta_offset = columns_offset + len(columns)
+    meta_bytes = json.dumps({
+        'format_version': FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'source_dir': str(source_dir) if source_dir else None,
+        'sections': list(SECTIONS),
+        'columns': layout,
+        'sources': [entry['source'] for entry in entries],
+        'errors': list(errors),
+        'repaired': list(repaired),
+        'validation': validation,
+    }, ensure_ascii=False).encode('utf-8')
+
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, len(entries),
+        index_offset, len(index_bytes),
+        ids_offset, len(ids_bytes),
+        columns_offset, len(columns),
+        meta_offset, len(meta_bytes),
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in (header, data, index_bytes, ids_bytes, columns, meta_bytes):
+                f.write(chunk)
+        # mkstemp creates the file 0600
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class PackedCorpus:
+    """Read-only, memory-mapped view of a packed corpus
+
+    Opening a pack reads the header, the id table and the metadata; entry
+    sections and columns are decoded only when asked for.
+    """
+
+    def __init__(self, path=DEFAULT_PACK_PATH):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        (magic, version, _, self.entry_count,
+         index_offset, index_length, ids_offset, _,
+         _, _, meta_offset, meta_length) = HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'{self.path} is not a packed corpus')
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f'{self.path} has format version {version}, expected {FORMAT_VERSION}')
+
+        self._index = self._cast(self._view[index_offset:index_offset + index_length], 'Q')
+        self.meta = json.loads(bytes(self._view[meta_offset:meta_offset + meta_length]))
+        self.ids = self._read_strings(ids_offset)
+        self._section_slots = {name: slot for slot, name in enumerate(self.meta['sections'])}
+        self._positions = None
+        self._columns = {}
+
+    @staticmethod
+    def _cast(view, fmt):
+        if sys.byteorder == 'big':
+            values = array(fmt, view.tobytes())
+            values.byteswap()
+            return values
+        return view.cast(fmt)
+
+    def _read_strings(self, offset):
+        (count,) = struct.unpack_from('<I', self._view, offset)
+        offsets = self._cast(self._view[offset + 4:offset + 8 + 4 * count], 'I')
+        blob = offset + 8 + 4 * count
+        data = self._view
+        return [str(data[blob + offsets[i]:blob + offsets[i + 1]], 'utf-8') for i in range(count)]
+
+    def __len__(self):
+        return self.entry_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def errors(self):
+        """Source files that could not be parsed, as {'file', 'error'} dicts"""
+        return self.meta['errors']
+
+    @property
+    def validation(self):
+        """Schema validation report from when the pack was built, or None"""
+        return self.meta.get('validation')
+
+    def position(self, entry_id):
+        """Index position of entry_id; raises KeyError if it is not in the pack"""
+        if self._positions is None:
+            self._positions = {entry_id: position for position, entry_id in enumerate(self.ids)}
+        return self._positions[entry_id]
+
+    def source(self, position):
+        """Source file name the entry at position was packed from"""
+        return self.meta['sources'][position]
+
+    def column(self, field):
+        """All values of a hot original_entry field, in index order"""
+        values = self._columns.get(field)
+        if values is None:
+            layout = self.meta['columns'][field]
+            values = self._read_strings(layout['offset'])
+            if layout['kind'] == 'dictionary':
+                dictionary = values
+                codes = self._cast(self._view[layout['codes_offset']:layout['codes_offset'] + 2 * self.entry_count], 'H')
+                values = [None if code == NULL_CODE else dictionary[code] for code in codes]
+            self._columns[field] = values
+        return values
+
+    def section_bytes(self, position, section):
+        """Raw JSON bytes of one section of one entry, or None if it is absent"""
+        slot = (position * len(self._section_slots) + self._section_slots[section]) * 2
+        offset, length = self._index[slot], self._index[slot + 1]
+        if not length:
+            return None
+        return self._view[offset:offset + length]
+
+    def read_section(self, position, section):
+        """Decode one section of one entry (None if absent)"""
+        raw = self.section_bytes(position, section)
+        return None if raw is None else json.loads(bytes(raw))
+
+    def read_entry(self, position, sections=SECTIONS):
+        """Decode the given sections of one entry into a dict"""
+        entry = {'id': self.ids[position]}
+        for section in sections:
+            value = self.read_section(position, section)
+            if value is not None:
+                entry[section] = value
+        return entry
+
+    def close(self):
+        """Release the memory map"""
+        if self._mmap is None:
+            return
+        if isinstance(getattr(self, '_index', None), memoryview):
+            self._index.release()
+        self._view.release()
+        self._mmap.close()
+        self._mmap = None
+
+
+def validate_entries(entries, errors=()):
+    """Schema report (see validate_corpus.py) for loaded entries, or None without fastjsonschema"""
+    try:
+        from validate_corpus import build_report, get_validator
+    except ImportError as e:
+        # fastjsonschema is optional; packs are still written, just unvalidated.
+        # Anything else (validate_corpus itself missing or broken) is a real error.
+        if e.name != 'fastjsonschema':
+            raise
+        return None
+    validator = get_validator()
+    results = [
+        {'file': entry['source'], 'id': entry['id'], 'errors': validator.validate({'id': entry['id'], **entry['sections']})}
+        for entry in entries
+    ]
+    results += [{'file': error['file'], 'unreadable': error['error']} for error in errors]
+    return build_report(results)
+
+
+def pack_directory(source_dir=DEFAULT_SOURCE_DIR, output=DEFAULT_PACK_PATH, validate=True, strict=False):
+    """Convert a directory of enhanced entry files into a packed corpus
+
+    Entries are validated against the schema unless validate is False. With
+    strict, invalid or unreadable entries raise ValueError and no pack is
+    written.
+
+    Returns:
+        (entries, errors, repaired, validation report or None)
+    """
+    if strict and not validate:
+        raise ValueError('strict packing needs validation')
+    entries, errors, repaired = load_source_directory(source_dir)
+    validation = validate_entries(entries, errors) if validate else None
+    if strict and validation is None:
+        raise ValueError('strict packing needs fastjsonschema to validate the corpus')
+    if strict and (validation['invalid'] or validation['unreadable']):
+        raise ValueError('corpus failed validation')
+    write_pack(entries, output, errors=errors, repaired=repaired, source_dir=source_dir, validation=validation)
+    return entries, errors, repaired, validation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default=DEFAULT_SOURCE_DIR, help='directory of enhanced entry JSON files')
+    parser.add_argument('--output', default=DEFAULT_PACK_PATH, help='packed corpus file to write')
+    parser.add_argument('--no-validate', action='store_true', help='skip schema validation')
+    parser.add_argument('--strict', action='store_true', help='refuse to write a pack with invalid entries')
+    parser.add_argument('--report', help='also write the validation report to this file')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        entries, errors, repaired, validation = pack_directory(
+            args.source, args.output, validate=not args.no_validate, strict=args.strict
+        )
+    except ValueError as e:
+        sys.exit(f"Not packed: {e}; run data/tools/validate_corpus.py for details")
+    elapsed = time.perf_counter() - start
+
+    source_bytes = sum(path.stat().st_size for path in Path(args.source).glob('*.json'))
+    print(f"Packed {len(entries)} entries into {args.output} "
+          f"({os.path.getsize(args.output) / 1024:.0f} KiB from {source_bytes / 1024:.0f} KiB of JSON) "
+          f"in {elapsed:.2f}s")
+    if repaired:
+        print(f"Repaired {len(repaired)} file(s) with recoverable syntax errors")
+    if errors:
+        print(f"Skipped {len(errors)} unreadable file(s):")
+        for error in errors:
+            print(f"  {error['file']}: {error['error']}")
+    if validation:
+        print(f"Schema: {validation['valid']} valid, {validation['nonconforming']} nonconforming, "
+              f"{validation['invalid']} invalid")
+        if args.report:
+            Path(args.report).write_text(json.dumps(validation, indent=2, ensure_ascii=False), encoding='utf-8')
+    elif not args.no_validate:
+        print("Schema validation skipped (fastjsonschema is not installed)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Lazy loader for the enhanced research entries
+
+Wraps the packed corpus (see ``corpus_pack.py``) in ``EnhancedEntry``
+objects. An entry's id and hot fields (title, domain, evidence level,
+professional relevance) come straight from the pack's columns; each
+section attribute (``tier_1_essential_enhancement``, ...) is decoded from
+its byte range on first access and kept on the entry afterwards, so code
+that only reads titles and tier 1 never parses the rest.
+
+    from enhanced_entries import EnhancedCorpus
+
+    with EnhancedCorpus.open() as corpus:
+        for entry in corpus:
+            print(entry.title, len(entry.tier_1_essential_enhancement or {}))
+
+``EnhancedCorpus.open`` rebuilds the pack first when it is missing or
+older than any source file.
+
+Usage:
+    python data/tools/enhanced_entries.py [--pack FILE] [--source DIR]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus_pack import (  # noqa: E402
+    DEFAULT_PACK_PATH, DEFAULT_SOURCE_DIR, SECTIONS, PackedCorpus, pack_directory,
+)
+
+
+class _LazySection:
+    """Descriptor decoding one section of an entry the first time it is read"""
+
+    def __init__(self, section):
+        self.section = section
+
+    def __get__(self, entry, owner=None):
+        if entry is None:
+            return self
+        loaded = entry._loaded
+        if self.section not in loaded:
+            loaded[self.section] = entry._corpus.read_section(entry.position, self.section)
+        return loaded[self.section]
+
+
+class _HotField:
+    """Descriptor reading an original_entry field from the pack's columns"""
+
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, entry, owner=None):
+        if entry is None:
+            return self
+        return entry._corpus.column(self.field)[entry.position]
+
+
+class EnhancedEntry:
+    """One enhanced research entry backed by a packed corpus
+
+    Section attributes are None when the source document had no such
+    section. The entry is only valid while its corpus is open.
+    """
+
+    __slots__ = ('_corpus', 'position', 'id', '_loaded')
+
+    original_entry = _LazySection('original_entry')
+    tier_1_essential_enhancement = _LazySection('tier_1_essential_enhancement')
+    tier_2_strategic_enhancement = _LazySection('tier_2_strategic_enhancement')
+    tier_3_future_enhancement = _LazySection('tier_3_future_enhancement')
+    content_creation_framework = _LazySection('content_creation_framework')
+    quality_assurance = _LazySection('quality_assurance')
+    extra = _LazySection('extra')
+
+    title = _HotField('title')
+    domain = _HotField('domain')
+    evidence_level = _HotField('evidence_level')
+    professional_relevance = _HotField('professional_relevance')
+
+    def __init__(self, corpus, position):
+        self._corpus = corpus
+        self.position = position
+        self.id = corpus.ids[position]
+        self._loaded = {}
+
+    def __repr__(self):
+        return f'<EnhancedEntry {self.id} {self.title!r}>'
+
+    @property
+    def source(self):
+        """Source file name this entry was packed from"""
+        return self._corpus.source(self.position)
+
+    @property
+    def loaded_sections(self):
+        """Names of the sections decoded so far"""
+        return [section for section in SECTIONS if section in self._loaded]
+
+    def has_section(self, section):
+        """Whether the entry has a section, without decoding it"""
+        return self._corpus.section_bytes(self.position, section) is not None
+
+    def to_dict(self, sections=SECTIONS):
+        """Decode the given sections into a plain dict, as PackedCorpus.read_entry does"""
+        entry = {'id': self.id}
+        for section in sections:
+            value = getattr(self, section)
+            if value is not None:
+                entry[section] = value
+        return entry
+
+
+class EnhancedCorpus:
+    """Sequence of EnhancedEntry objects over an open packed corpus"""
+
+    def __init__(self, path=DEFAULT_PACK_PATH):
+        self.packed = PackedCorpus(path)
+        self._entries = [EnhancedEntry(self.packed, position) for position in range(len(self.packed))]
+
+    @classmethod
+    def open(cls, path=DEFAULT_PACK_PATH, source_dir=DEFAULT_SOURCE_DIR):
+        """Open the pack, rebuilding it from source_dir first if it is missing or stale"""
+        path, source_dir = Path(path), Path(source_dir)
+        if source_dir.is_dir() and _is_stale(path, source_dir):
+            pack_directory(source_dir, path)
+        return cls(path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __getitem__(self, key):
+        """Look an entry up by position, or by id when key is a string"""
+        if isinstance(key, str):
+            return self._entries[self.packed.position(key)]
+        return self._entries[key]
+
+    def __contains__(self, entry_id):
+        try:
+            self.packed.position(entry_id)
+        except KeyError:
+            return False
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def errors(self):
+        """Source files that could not be parsed when the pack was built"""
+        return self.packed.errors
+
+    def close(self):
+        self.packed.close()
+
+
+def _is_stale(path, source_dir):
+    if not path.exists():
+        return True
+    built = path.stat().st_mtime
+    return source_dir.stat().st_mtime > built or any(
+        source.stat().st_mtime > built for source in source_dir.glob('*.json')
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pack', default=DEFAULT_PACK_PATH, help='packed corpus file')
+    parser.add_argument('--source', default=DEFAULT_SOURCE_DIR, help='directory to rebuild a stale pack from')
+    args = parser.parse_args()
+
+    with EnhancedCorpus.open(args.pack, args.source) as corpus:
+        for entry in corpus:
+            print(f"{entry.id:<32} {entry.title or '(untitled)'}")
+        print(f"\n{len(corpus)} entries, {len(corpus.errors)} unreadable source file(s)")
+
+
+if __name__ == '__main__':
+    main()
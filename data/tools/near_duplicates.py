@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate research entries with MinHash signatures and LSH banding
+
+The corpus was assembled from parallel extraction batches, so the same
+finding often appears several times with slightly different wording. Each
+entry's title and summary (or primary results, for full research entries)
+are split into overlapping word shingles. A MinHash signature of NUM_PERM
+values then estimates the Jaccard similarity of two shingle sets as the
+fraction of positions where the signatures agree.
+
+Signatures are cut into bands of rows; entries that agree on every row of
+at least one band land in the same bucket and become candidate pairs, so
+only a small fraction of all pairs is ever compared. Candidates whose
+estimated similarity reaches the threshold are joined into clusters. The
+whole run is linear in the number of entries apart from the final check of
+the candidates, which handles 100k entries in seconds on one machine.
+
+The report is JSON:
+
+    {
+      "entries": 281, "threshold": 0.8, "num_perm": 128, "bands": 16, "rows": 8,
+      "duplicates": 12,
+      "clusters": [
+        {"keep": "ADD-Workplace-001", "size": 2, "members": [
+            {"id": "ADD-Workplace-001", "title": "...", "similarity": 1.0},
+            {"id": "ADD-Workplace-014", "title": "...", "similarity": 0.86}]},
+        ...
+      ]
+    }
+
+The first entry of each cluster, in input order, is the one kept; other
+members report their estimated similarity to it. Clusters are transitive,
+so that can fall below the threshold for a member joined through another;
+merge_clusters() keeps those. update_knowledge_base.py runs the same check
+on every update.
+
+Usage:
+    python data/tools/near_duplicates.py [FILE] [--threshold 0.8] [--report FILE]
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_INPUT = REPO_ROOT / 'data' / 'knowledge_base' / 'knowledge_base.json'
+
+NUM_PERM = 128
+SHINGLE_SIZE = 3
+THRESHOLD = 0.8
+SEED = 1
+
+# Buckets larger than this are joined to their first member only, instead
+# of comparing every pair, so one huge bucket cannot make a run quadratic
+MAX_BUCKET_PAIRS = 128
+
+# Shingle hashes per block of the vectorized MinHash (NUM_PERM x BLOCK uint64)
+BLOCK_SHINGLES = 1 << 16
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def entry_text(entry):
+    """Title plus summary; full research entries use key_findings.primary_results as their summary"""
+    summary = entry.get('summary')
+    if not summary and isinstance(entry.get('key_findings'), dict):
+        summary = entry['key_findings'].get('primary_results')
+    return ' '.join(str(part) for part in (entry.get('title'), summary) if part)
+
+
+def entry_label(entry, index):
+    return str(entry.get('knowledge_id') or entry.get('id') or index)
+
+
+def shingle_corpus(texts, size=SHINGLE_SIZE, seed=SEED):
+    """Hashes of every run of ``size`` consecutive lowercased words, for all texts at once
+
+    Each distinct word is hashed once (crc32), then each shingle hash is
+    computed in NumPy as a random linear combination of its word hashes,
+    keeping the high 32 bits, so a text always gets the same hashes.
+    Texts shorter than ``size`` words get one shingle. A shingle that
+    repeats within a text is hashed twice, which MinHash ignores.
+
+    Returns:
+        (uint64 hashes of all shingles, shingles per text); texts without
+        words get no shingles
+    """
+    vocabulary = {}
+    words, lengths = [], []
+    for text in texts:
+        numbers = []
+        for word in _WORD_RE.findall(text.lower()):
+            number = vocabulary.get(word)
+            if number is None:
+                number = vocabulary[word] = zlib.crc32(word.encode('utf-8')) + 1
+            numbers.append(number)
+        lengths.append(len(numbers))
+        # size - 1 zeros after each text stop shingles from spanning two texts
+        words.extend(numbers)
+        words.extend([0] * (size - 1))
+
+    words = np.asarray(words, dtype=np.uint64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    multipliers = _odd_multipliers(size, [seed, 1])
+    combined = np.zeros(len(words) - size + 1 if len(words) >= size else 0, dtype=np.uint64)
+    for offset, multiplier in enumerate(multipliers):
+        combined += words[offset:offset + len(combined)] * multiplier
+    combined >>= np.uint64(32)
+
+    counts = np.where(lengths > 0, np.maximum(lengths - size + 1, 1), 0)
+    text_starts = np.concatenate(([0], np.cumsum(lengths + size - 1)[:-1]))
+    first_shingles = np.cumsum(counts) - counts
+    # Position of every shingle: its text's start plus its index within the text
+    starts = np.repeat(text_starts - first_shingles, counts) + np.arange(counts.sum())
+    return combined[starts], counts
+
+
+def _odd_multipliers(count, seed):
+    return np.random.default_rng(seed).integers(0, 2 ** 63, size=count, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """Shingle hashes of one text (see shingle_corpus)"""
+    return shingle_corpus([text], size)[0]
+
+
+class MinHasher:
+    """NUM_PERM hash functions h(x) = (a*x + b) mod 2**64 >> 32 over 32-bit shingle hashes
+
+    Multiply-add-shift is a universal family for 32-bit keys, and NumPy's
+    wrapping uint64 arithmetic computes it exactly.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=SEED):
+        self.num_perm = num_perm
+        self.a = _odd_multipliers(num_perm, [seed, 2])
+        self.b = np.random.default_rng([seed, 3]).integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, hashes, counts):
+        """(len(counts), num_perm) uint32 signatures of consecutive runs of hashes; counts must be positive
+
+        Shingles are hashed in blocks of about BLOCK_SHINGLES and reduced per
+        text with np.minimum.reduceat, so the Python loop runs per block,
+        not per text.
+        """
+        ends = np.cumsum(counts)
+        signatures = np.empty((len(counts), self.num_perm), dtype=np.uint32)
+        a, b = self.a[:, None], self.b[:, None]
+        first = 0
+        while first < len(counts):
+            start = ends[first] - counts[first]
+            last = max(int(np.searchsorted(ends, start + BLOCK_SHINGLES, side='right')), first + 1)
+            block = hashes[start:ends[last - 1]]
+            hashed = np.multiply(a, block[None, :])
+            hashed += b
+            hashed >>= np.uint64(32)
+            offsets = ends[first:last] - counts[first:last] - start
+            signatures[first:last] = np.minimum.reduceat(hashed, offsets, axis=1).T
+            first = last
+        return signatures
+
+
+def lsh_params(threshold, num_perm=NUM_PERM):
+    """(bands, rows) with bands * rows <= num_perm minimizing false positives plus false negatives
+
+    A pair with similarity s shares a bucket with probability
+    1 - (1 - s**rows)**bands; the errors are that probability integrated
+    below the threshold and its complement integrated above it.
+    """
+    best, best_error = None, None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        below = np.linspace(0, threshold, 201)
+        above = np.linspace(threshold, 1, 201)
+        false_positive = np.trapezoid(1 - (1 - below ** rows) ** bands, below)
+        false_negative = np.trapezoid((1 - above ** rows) ** bands, above)
+        error = false_positive + false_negative
+        if best_error is None or error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class _DisjointSet:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            # Lower index becomes the root, so a cluster's root is its first entry
+            if second < first:
+                first, second = second, first
+            self.parent[second] = first
+
+
+def candidate_pairs(signatures, bands, rows):
+    """Pairs of row numbers sharing at least one LSH bucket (may repeat across bands)"""
+    # One random linear combination per band stands in for its rows; a
+    # collision only adds a candidate, which find_clusters() then rejects
+    multipliers = _odd_multipliers(rows, [SEED, 4])
+    for band in range(bands):
+        keys = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) @ multipliers
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        shared = counts[inverse] > 1
+        members = np.flatnonzero(shared)
+        order = np.argsort(inverse[members], kind='stable')
+        members = members[order]
+        boundaries = np.flatnonzero(np.diff(inverse[members])) + 1
+        for bucket in np.split(members, boundaries):
+            bucket = bucket.tolist()
+            if len(bucket) > MAX_BUCKET_PAIRS:
+                first = bucket[0]
+                yield from ((first, other) for other in bucket[1:])
+            else:
+                for i, first in enumerate(bucket):
+                    for second in bucket[i + 1:]:
+                        yield first, second
+
+
+def find_clusters(entries, threshold=THRESHOLD, num_perm=NUM_PERM, text=entry_text):
+    """Clusters of near-duplicate entries
+
+    Returns:
+        list of clusters, each a list of (entry index, estimated similarity
+        to the cluster's first entry) in input order, largest clusters first
+    """
+    hashes, counts = shingle_corpus([text(entry) for entry in entries])
+    indices = np.flatnonzero(counts).tolist()
+    if len(indices) < 2:
+        return []
+
+    signatures = MinHasher(num_perm).signatures(hashes, counts[counts > 0])
+    bands, rows = lsh_params(threshold, num_perm)
+    groups = _DisjointSet(len(indices))
+    checked = set()
+    for first, second in candidate_pairs(signatures, bands, rows):
+        if (first, second) in checked or groups.find(first) == groups.find(second):
+            continue
+        checked.add((first, second))
+        if np.count_nonzero(signatures[first] == signatures[second]) >= threshold * num_perm:
+            groups.union(first, second)
+
+    members = {}
+    for position in range(len(indices)):
+        members.setdefault(groups.find(position), []).append(position)
+    clusters = []
+    for root, positions in members.items():
+        if len(positions) > 1:
+            clusters.append([
+                (indices[position], round(float(np.mean(signatures[position] == signatures[root])), 3))
+                for position in positions
+            ])
+    clusters.sort(key=lambda cluster: (-len(cluster), cluster[0][0]))
+    return clusters
+
+
+def build_report(entries, clusters, threshold=THRESHOLD, num_perm=NUM_PERM):
+    bands, rows = lsh_params(threshold, num_perm)
+    return {
+        'entries': len(entries),
+        'threshold': threshold,
+        'num_perm': num_perm,
+        'bands': bands,
+        'rows': rows,
+        'duplicates': sum(len(cluster) - 1 for cluster in clusters),
+        'clusters': [
+            {
+                'keep': entry_label(entries[cluster[0][0]], cluster[0][0]),
+                'size': len(cluster),
+                'members': [
+                    {'id': entry_label(entries[index], index), 'title': entries[index].get('title'),
+                     'similarity': similarity}
+                    for index, similarity in cluster
+                ],
+            }
+            for cluster in clusters
+        ],
+    }
+
+
+def merge_clusters(entries, clusters, threshold=THRESHOLD):
+    """Entries with each cluster collapsed into its first entry, which also takes the union of the tags
+
+    Clusters are single-linkage, so a member can be joined through others
+    without being similar to the first entry itself; only members at least
+    threshold similar to it are dropped, the rest are kept as they are.
+    """
+    dropped = set()
+    merged = list(entries)
+    for cluster in clusters:
+        keep = cluster[0][0]
+        tags = list(entries[keep].get('tags') or [])
+        for index, similarity in cluster[1:]:
+            if similarity < threshold:
+                continue
+            dropped.add(index)
+            tags.extend(tag for tag in entries[index].get('tags') or [] if tag not in tags)
+        if tags != list(entries[keep].get('tags') or []):
+            merged[keep] = dict(entries[keep], tags=tags)
+    return [entry for index, entry in enumerate(merged) if index not in dropped]
+
+
+def load_entries(path):
+    """Entries of a JSON list, or of the research_entries list of a knowledge base document"""
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    return data['research_entries'] if isinstance(data, dict) else data
+
+
+def summarize(report):
+    lines = [f"{report['entries']} entries: {report['duplicates']} near-duplicates in "
+             f"{len(report['clusters'])} clusters (threshold {report['threshold']}, "
+             f"{report['bands']} bands x {report['rows']} rows)"]
+    for cluster in report['clusters'][:10]:
+        lines.append(f"  {cluster['size']:>4}  {cluster['keep']}: {cluster['members'][0]['title']}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', nargs='?', default=DEFAULT_INPUT, help='JSON list of entries or knowledge base file')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='minimum estimated Jaccard similarity')
+    parser.add_argument('--report', help='write the JSON report here (default: stdout)')
+    args = parser.parse_args()
+    if not 0 < args.threshold <= 1:
+        parser.error('--threshold must be in (0, 1]')
+
+    entries = load_entries(args.input)
+    start = time.perf_counter()
+    clusters = find_clusters(entries, args.threshold)
+    elapsed = (time.perf_counter() - start) * 1000
+    report = build_report(entries, clusters, args.threshold)
+
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.report).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(summarize(report))
+        print(f"Report written to {args.report} in {elapsed:.0f} ms")
+    else:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Validate the enhanced research entries against enhanced_entry.schema.json
+
+The schema is compiled with fastjsonschema into plain Python functions,
+once per process. fastjsonschema stops at the first error, so the top-level
+checks (required sections, id) and each object section get their own
+compiled validator; one bad tier then does not hide problems in the others.
+
+Entries are validated in their normalized layout (see corpus_pack.py), on a
+process pool when validating a directory. An entry is invalid when the
+top-level checks or original_entry fail: it lacks an id, a title or a
+required section. Errors inside the tier and content sections only make it
+nonconforming; most of the generated corpus does not follow the schema's
+shape for those yet, and the packer and UI build do not depend on it. On
+the shipped corpus the report is:
+
+    {
+      "schema": ".../enhanced_entry.schema.json",
+      "checked": 145, "valid": 0, "nonconforming": 107, "invalid": 11, "unreadable": 27,
+      "entries": [
+        {"file": "...", "id": "...", "errors": [
+            {"section": "original_entry", "path": "data.original_entry",
+             "rule": "required", "message": "..."}], "invalid": true},
+        ...
+      ],
+      "unreadable_files": [{"file": "...", "error": "..."}]
+    }
+
+--strict fails on invalid and unreadable entries, not nonconforming ones.
+
+corpus_pack.py and build_ui_findings.py run the same checks and record the
+result, so this script is only needed for a standalone report.
+
+Usage:
+    python data/tools/validate_corpus.py [--source DIR] [--report FILE] [--jobs N] [--strict]
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import fastjsonschema
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus_pack import (  # noqa: E402
+    DEFAULT_SOURCE_DIR, REPO_ROOT, fallback_entry_id, normalize_enhanced_document, parse_enhanced_document,
+)
+
+SCHEMA_PATH = REPO_ROOT / 'data' / 'schemas' / 'enhanced_entry.schema.json'
+
+# Errors in these make an entry invalid; None is the top level (id, required sections)
+ENTRY_SECTIONS = (None, 'original_entry')
+
+
+class EntryValidator:
+    """Compiled validators for the top level and each object section of the schema"""
+
+    def __init__(self, schema_path=SCHEMA_PATH):
+        self.schema_path = Path(schema_path)
+        schema = json.loads(self.schema_path.read_text(encoding='utf-8'))
+        properties = schema.get('properties', {})
+        sections = {name: sub for name, sub in properties.items() if sub.get('type') == 'object'}
+
+        root = dict(schema, properties={name: sub for name, sub in properties.items() if name not in sections})
+        self._root = fastjsonschema.compile(root)
+        self._sections = {name: fastjsonschema.compile(sub) for name, sub in sections.items()}
+
+    def validate(self, entry):
+        """Errors for one entry ({'id', section: value, ...}), empty if it is valid"""
+        errors = []
+        self._check(self._root, entry, None, 'data', errors)
+        for section, validate in self._sections.items():
+            value = entry.get(section)
+            if value is not None:
+                self._check(validate, value, section, f'data.{section}', errors)
+        return errors
+
+    @staticmethod
+    def _check(validate, value, section, name, errors):
+        try:
+            validate(value, name_prefix=name)
+        except fastjsonschema.JsonSchemaValueException as e:
+            errors.append({'section': section, 'path': e.name, 'rule': e.rule, 'message': e.message})
+
+
+def is_invalid(errors):
+    """Whether validation errors include any outside the tier and content sections"""
+    return any(error['section'] in ENTRY_SECTIONS for error in errors or ())
+
+
+@functools.lru_cache(maxsize=None)
+def get_validator(schema_path=SCHEMA_PATH):
+    """Process-wide EntryValidator, compiled on first use"""
+    return EntryValidator(schema_path)
+
+
+def validate_file(path):
+    """Parse, normalize and validate one source file
+
+    Returns:
+        {'file', 'id', 'errors'}, or {'file', 'unreadable'} if it cannot be parsed
+    """
+    path = Path(path)
+    try:
+        document, _ = parse_enhanced_document(path.read_text(encoding='utf-8'))
+    except (ValueError, UnicodeDecodeError) as e:
+        return {'file': path.name, 'unreadable': str(e)}
+    entry_id, sections = normalize_enhanced_document(document, fallback_entry_id(path))
+    return {'file': path.name, 'id': entry_id, 'errors': get_validator().validate({'id': entry_id, **sections})}
+
+
+def build_report(results, schema_path=SCHEMA_PATH):
+    """Assemble validate_file() results (or equivalent dicts) into the report format"""
+    entries = [result for result in results if 'unreadable' not in result]
+    unreadable = [{'file': result['file'], 'error': result['unreadable']} for result in results
+                  if 'unreadable' in result]
+    failing = [dict(entry, invalid=is_invalid(entry['errors'])) for entry in entries if entry['errors']]
+    invalid = sum(entry['invalid'] for entry in failing)
+    return {
+        'schema': str(schema_path),
+        'checked': len(results),
+        'valid': len(entries) - len(failing),
+        'nonconforming': len(failing) - invalid,
+        'invalid': invalid,
+        'unreadable': len(unreadable),
+        'entries': failing,
+        'unreadable_files': unreadable,
+    }
+
+
+def validate_directory(source_dir=DEFAULT_SOURCE_DIR, jobs=None):
+    """Validate every *.json file in source_dir and return the report"""
+    paths = sorted(Path(source_dir).glob('*.json'))
+    if jobs == 1:
+        results = [validate_file(path) for path in paths]
+    else:
+        workers = jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=get_validator) as pool:
+            results = list(pool.map(validate_file, paths, chunksize=max(1, len(paths) // (4 * workers))))
+    return build_report(results)
+
+
+def summarize(report):
+    """One-line summary plus the most common failing rules"""
+    counts = {}
+    for entry in report['entries']:
+        for error in entry['errors']:
+            key = (error['path'], error['rule'])
+            counts[key] = counts.get(key, 0) + 1
+    lines = [f"{report['checked']} files: {report['valid']} valid, {report['nonconforming']} nonconforming, "
+             f"{report['invalid']} invalid, {report['unreadable']} unreadable"]
+    for (path, rule), count in sorted(counts.items(), key=lambda item: -item[1])[:10]:
+        lines.append(f"  {count:>4}  {path} ({rule})")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default=DEFAULT_SOURCE_DIR, help='directory of enhanced entry JSON files')
+    parser.add_argument('--report', help='write the JSON report here (default: stdout)')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--strict', action='store_true', help='exit with status 1 if any entry is invalid or unreadable')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = validate_directory(args.source, jobs=args.jobs)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.report).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(summarize(report))
+        print(f"Report written to {args.report} in {elapsed:.0f} ms")
+    else:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+    if args.strict and (report['invalid'] or report['unreadable']):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,140 +1,342 @@
 const { PrismaClient } = require('@prisma/client');
 const fs = require('fs');
 const path = require('path');
+const { createHash, randomUUID } = require('crypto');
+const { spawnSync } = require('child_process');
 
 const prisma = new PrismaClient();
 
+// Map study type and evidence level
+const studyTypeMap = {
+  'systematic_review': 'SYSTEMATIC_REVIEW',
+  'meta_analysis': 'META_ANALYSIS',
+  'rct': 'RCT',
+  'cohort': 'COHORT',
+  'case_control': 'CASE_CONTROL'
+};
+
+const evidenceLevelMap = {
+  '1a': 'LEVEL_1A',
+  '1b': 'LEVEL_1B',
+  '2a': 'LEVEL_2A',
+  '2b': 'LEVEL_2B',
+  '3a': 'LEVEL_3A',
+  '3b': 'LEVEL_3B',
+  '4': 'LEVEL_4',
+  '5': 'LEVEL_5'
+};
+
+// Rows per INSERT statement; each statement ships its rows as one jsonb parameter
+const CHUNK_SIZE = 5000;
+
+// Multi-row upsert: jsonb_to_recordset expands the staged rows server side,
+// so each table costs one round trip per CHUNK_SIZE rows instead of one per
+// row. columns maps column name -> recordset type; enums maps column -> enum type.
+function upsertSql(table, columns, enums = {}) {
+  const names = Object.keys(columns);
+  const quoted = names.map(name => `"${name}"`);
+  return `
+    INSERT INTO ${table} (${quoted.join(', ')})
+    SELECT ${names.map(name => enums[name] ? `"${name}"::"${enums[name]}"` : `"${name}"`).join(', ')}
+    FROM jsonb_to_recordset($1::jsonb) AS x(${names.map(name => `"${name}" ${columns[name]}`).join(', ')})
+    ON CONFLICT (id) DO UPDATE SET ${quoted.slice(1).map(column => `${column} = EXCLUDED.${column}`).join(', ')}`;
+}
+
+const INSERT_SQL = {
+  targetPopulations: upsertSql('target_populations', {
+    id: 'text', ageRange: 'text', gender: 'text', occupation: 'text', adhdSubtype: 'text'
+  }),
+  methodologies: upsertSql('methodologies', {
+    id: 'text', design: 'text', duration: 'text', primaryOutcomes: 'text[]', secondaryOutcomes: 'text[]'
+  }),
+  keyFindings: upsertSql('key_findings', {
+    id: 'text', primaryResults: 'text', effectSizes: 'jsonb', clinicalSignificance: 'text', limitations: 'text[]'
+  }),
+  workplaceRelevance: upsertSql('workplace_relevance', {
+    id: 'text', productivityImpact: 'text', accommodationNeeds: 'text[]', careerImplications: 'text'
+  }),
+  qualityAssessments: upsertSql('quality_assessments', {
+    id: 'text', riskOfBias: 'text', gradeRating: 'text', reviewerNotes: 'text'
+  }, { riskOfBias: 'RiskLevel', gradeRating: 'GradeRating' }),
+  clinicalApplications: upsertSql('clinical_applications', {
+    id: 'text', diagnosticUtility: 'text', treatmentRecommendations: 'text[]', monitoringParameters: 'text[]'
+  }),
+  researchEntries: upsertSql('research_entries', {
+    id: 'text', title: 'text', authors: 'text[]', journal: 'text', publicationDate: 'timestamp(3)', doi: 'text',
+    studyType: 'text', evidenceLevel: 'text', sampleSize: 'integer', createdAt: 'timestamp(3)',
+    updatedAt: 'timestamp(3)', addedDate: 'timestamp(3)', lastReviewed: 'timestamp(3)',
+    sourceKey: 'text', contentHash: 'text', targetPopulationId: 'text', methodologyId: 'text',
+    keyFindingsId: 'text', workplaceRelevanceId: 'text', qualityAssessmentId: 'text', clinicalApplicationsId: 'text'
+  }, { studyType: 'StudyType', evidenceLevel: 'EvidenceLevel' }),
+  researchEntryTags: `
+    INSERT INTO "_ResearchEntryTags" ("A", "B")
+    SELECT "A", "B" FROM jsonb_to_recordset($1::jsonb) AS x("A" text, "B" text)
+    ON CONFLICT DO NOTHING`
+};
+
+// Inserts new tag names and returns the id of every requested name, new or existing.
+// The final SELECT runs on the statement's snapshot, so it only sees pre-existing tags.
+const UPSERT_TAGS_SQL = `
+  WITH requested AS (
+    SELECT id, name FROM jsonb_to_recordset($1::jsonb) AS x(id text, name text)
+  ), inserted AS (
+    INSERT INTO tags (id, name) SELECT id, name FROM requested
+    ON CONFLICT (name) DO NOTHING
+    RETURNING id, name
+  )
+  SELECT id, name FROM inserted
+  UNION ALL
+  SELECT t.id, t.name FROM tags t JOIN requested r ON r.name = t.name`;
+
+// Existing rows for the given source keys, with the ids needed to update them in place
+const FIND_EXISTING_SQL = `
+  SELECT id, "sourceKey", "contentHash", "createdAt", "targetPopulationId", "methodologyId",
+    "keyFindingsId", "workplaceRelevanceId", "qualityAssessmentId", "clinicalApplicationsId"
+  FROM research_entries
+  WHERE "sourceKey" IN (SELECT jsonb_array_elements_text($1::jsonb))`;
+
+// Rows loaded before incremental ingest that have no sourceKey, matched by title and
+// publication date (the newest row of each pair). The migration can only key rows by
+// DOI; entries keyed by knowledge base id are claimed here on their first run.
+const FIND_UNKEYED_SQL = `
+  SELECT DISTINCT ON (re.title, re."publicationDate")
+    re.id, re.title, re."publicationDate", re."sourceKey", re."contentHash", re."createdAt",
+    re."targetPopulationId", re."methodologyId", re."keyFindingsId", re."workplaceRelevanceId",
+    re."qualityAssessmentId", re."clinicalApplicationsId"
+  FROM research_entries re
+  JOIN jsonb_to_recordset($1::jsonb) AS x(title text, "publicationDate" timestamp(3))
+    ON re.title = x.title AND re."publicationDate" = x."publicationDate"
+  WHERE re."sourceKey" IS NULL
+  ORDER BY re.title, re."publicationDate", re."createdAt" DESC, re.id DESC`;
+
+// Changed entries get their tag links rebuilt from the incoming tag list
+const UNLINK_TAGS_SQL = `
+  DELETE FROM "_ResearchEntryTags"
+  WHERE "A" IN (SELECT jsonb_array_elements_text($1::jsonb))`;
+
+// Incremental ingest key: the DOI when there is one, else the knowledge base id.
+// Only ASCII whitespace is trimmed, matching the regexp_replace in the
+// 20261018030000_research_source_key migration (String.trim and btrim differ).
+const DOI_TRIM = /^[ \t\n\r\f\v]+|[ \t\n\r\f\v]+$/g;
+
+function sourceKey(entry) {
+  const doi = (entry.doi || '').replace(DOI_TRIM, '').toLowerCase();
+  return doi ? `doi:${doi}` : `id:${entry.id}`;
+}
+
+// JSON with object keys sorted at every level, so equal content hashes equally
+function canonicalJson(value) {
+  if (Array.isArray(value)) {
+    return `[${value.map(canonicalJson).join(',')}]`;
+  }
+  if (value && typeof value === 'object') {
+    return `{${Object.keys(value).sort().map(key => `${JSON.stringify(key)}:${canonicalJson(value[key])}`).join(',')}}`;
+  }
+  return JSON.stringify(value);
+}
+
+function contentHash(entry) {
+  return createHash('sha256').update(canonicalJson(entry)).digest('hex');
+}
+
+// Split knowledge base entries into added / updated / unchanged against the database
+async function planChangeset(tx, entries) {
+  // Later entries with the same key win, matching the knowledge base merge
+  const incoming = new Map();
+  for (const entry of entries) {
+    incoming.set(sourceKey(entry), entry);
+  }
+
+  const existingRows = await tx.$queryRawUnsafe(FIND_EXISTING_SQL, JSON.stringify([...incoming.keys()]));
+  const existing = new Map(existingRows.map(row => [row.sourceKey, row]));
+
+  // Entries without a keyed row may still have an unkeyed one from a full load;
+  // updating that row in place gives it the key instead of inserting a duplicate
+  const unmatched = [...incoming].filter(([key]) => !existing.has(key));
+  if (unmatched.length > 0) {
+    const publicationKey = (title, date) => `${title}\u0000${new Date(date).toISOString()}`;
+    const unkeyedRows = await tx.$queryRawUnsafe(FIND_UNKEYED_SQL, JSON.stringify(unmatched.map(([, entry]) => ({
+      title: entry.title,
+      publicationDate: new Date(entry.publication_date).toISOString()
+    }))));
+    const unkeyed = new Map(unkeyedRows.map(row => [publicationKey(row.title, row.publicationDate), row]));
+    for (const [key, entry] of unmatched) {
+      const claimKey = publicationKey(entry.title, entry.publication_date);
+      const row = unkeyed.get(claimKey);
+      if (row) {
+        existing.set(key, row);
+        // Two entries with the same title and date cannot claim the same row
+        unkeyed.delete(claimKey);
+      }
+    }
+  }
+
+  const changeset = { added: [], updated: [], unchanged: 0 };
+  for (const [key, entry] of incoming) {
+    const hash = contentHash(entry);
+    const row = existing.get(key);
+    if (!row) {
+      changeset.added.push({ entry, key, hash });
+    } else if (row.contentHash !== hash) {
+      changeset.updated.push({ entry, key, hash, existing: row });
+    } else {
+      changeset.unchanged += 1;
+    }
+  }
+  return changeset;
+}
+
+async function insertRows(tx, sql, rows) {
+  for (let i = 0; i < rows.length; i += CHUNK_SIZE) {
+    await tx.$executeRawUnsafe(sql, JSON.stringify(rows.slice(i, i + CHUNK_SIZE)));
+  }
+}
+
+// Turn planned entries into one row list per table, with ids assigned up front.
+// Updated entries reuse the ids (and createdAt) of the rows they overwrite.
+function stageResearchEntries(items) {
+  const now = new Date().toISOString();
+  const staged = {
+    targetPopulations: [],
+    methodologies: [],
+    keyFindings: [],
+    workplaceRelevance: [],
+    qualityAssessments: [],
+    clinicalApplications: [],
+    researchEntries: [],
+    entryTags: [],
+    tagNames: new Set()
+  };
+
+  for (const { entry, key, hash, existing = {} } of items) {
+    const targetPopulationId = existing.targetPopulationId || randomUUID();
+    staged.targetPopulations.push({
+      id: targetPopulationId,
+      ageRange: entry.target_population.age_range,
+      gender: entry.target_population.gender,
+      occupation: entry.target_population.occupation,
+      adhdSubtype: entry.target_population.adhd_subtype
+    });
+
+    const methodologyId = existing.methodologyId || randomUUID();
+    staged.methodologies.push({
+      id: methodologyId,
+      design: entry.methodology.design,
+      duration: entry.methodology.duration,
+      primaryOutcomes: entry.methodology.primary_outcomes,
+      secondaryOutcomes: entry.methodology.secondary_outcomes
+    });
+
+    const keyFindingsId = existing.keyFindingsId || randomUUID();
+    staged.keyFindings.push({
+      id: keyFindingsId,
+      primaryResults: entry.key_findings.primary_results,
+      effectSizes: entry.key_findings.effect_sizes,
+      clinicalSignificance: entry.key_findings.clinical_significance,
+      limitations: entry.key_findings.limitations
+    });
+
+    const workplaceRelevanceId = existing.workplaceRelevanceId || randomUUID();
+    staged.workplaceRelevance.push({
+      id: workplaceRelevanceId,
+      productivityImpact: entry.workplace_relevance.productivity_impact,
+      accommodationNeeds: entry.workplace_relevance.accommodation_needs,
+      careerImplications: entry.workplace_relevance.career_implications
+    });
+
+    const qualityAssessmentId = existing.qualityAssessmentId || randomUUID();
+    staged.qualityAssessments.push({
+      id: qualityAssessmentId,
+      riskOfBias: entry.quality_assessment.risk_of_bias.toUpperCase(),
+      gradeRating: entry.quality_assessment.grade_rating.toUpperCase(),
+      reviewerNotes: entry.quality_assessment.reviewer_notes
+    });
+
+    const clinicalApplicationsId = existing.clinicalApplicationsId || randomUUID();
+    staged.clinicalApplications.push({
+      id: clinicalApplicationsId,
+      diagnosticUtility: entry.clinical_applications.diagnostic_utility,
+      treatmentRecommendations: entry.clinical_applications.treatment_recommendations,
+      monitoringParameters: entry.clinical_applications.monitoring_parameters
+    });
+
+    const researchEntryId = existing.id || randomUUID();
+    staged.researchEntries.push({
+      id: researchEntryId,
+      title: entry.title,
+      authors: entry.authors,
+      journal: entry.journal,
+      publicationDate: new Date(entry.publication_date).toISOString(),
+      doi: entry.doi,
+      studyType: studyTypeMap[entry.study_type] || 'RCT',
+      evidenceLevel: evidenceLevelMap[entry.evidence_level] || 'LEVEL_2B',
+      sampleSize: entry.sample_size,
+      createdAt: existing.createdAt ? new Date(existing.createdAt).toISOString() : now,
+      // Prisma fills @updatedAt client side, so the column has no database default
+      updatedAt: now,
+      addedDate: new Date(entry.added_date).toISOString(),
+      lastReviewed: new Date(entry.last_reviewed).toISOString(),
+      sourceKey: key,
+      contentHash: hash,
+      targetPopulationId,
+      methodologyId,
+      keyFindingsId,
+      workplaceRelevanceId,
+      qualityAssessmentId,
+      clinicalApplicationsId
+    });
+
+    for (const tagName of new Set(entry.tags)) {
+      staged.tagNames.add(tagName);
+      staged.entryTags.push({ entryId: researchEntryId, tagName });
+    }
+  }
+
+  return staged;
+}
+
+async function loadResearchEntries(tx, staged) {
+  const tagRows = await tx.$queryRawUnsafe(
+    UPSERT_TAGS_SQL,
+    JSON.stringify([...staged.tagNames].map(name => ({ id: randomUUID(), name })))
+  );
+  const tagIds = new Map(tagRows.map(tag => [tag.name, tag.id]));
+
+  // Parents first so the foreign keys on research_entries resolve
+  await insertRows(tx, INSERT_SQL.targetPopulations, staged.targetPopulations);
+  await insertRows(tx, INSERT_SQL.methodologies, staged.methodologies);
+  await insertRows(tx, INSERT_SQL.keyFindings, staged.keyFindings);
+  await insertRows(tx, INSERT_SQL.workplaceRelevance, staged.workplaceRelevance);
+  await insertRows(tx, INSERT_SQL.qualityAssessments, staged.qualityAssessments);
+  await insertRows(tx, INSERT_SQL.clinicalApplications, staged.clinicalApplications);
+  await insertRows(tx, INSERT_SQL.researchEntries, staged.researchEntries);
+  await insertRows(
+    tx,
+    INSERT_SQL.researchEntryTags,
+    staged.entryTags.map(({ entryId, tagName }) => ({ A: entryId, B: tagIds.get(tagName) }))
+  );
+}
+
+// Rebuild the "related research" TF-IDF index for the new data version
+// (see adhd_research_api/src/related_research.py)
+function buildRelatedIndex() {
+  const result = spawnSync(process.env.PYTHON || 'python3', ['-m', 'src.related_research', 'build'], {
+    cwd: path.join(__dirname, 'adhd_research_api'),
+    stdio: 'inherit'
+  });
+  if (result.status !== 0) {
+    console.warn('⚠ Could not build the related research index; the API will build it on first use');
+  }
+}
+
 async function migrateData() {
   try {
-    // Read the JSON knowledge base
-    const jsonPath = path.join(__dirname, 'knowledge_base', 'knowledge_base.json');
+    // Read the JSON knowledge base (or another file in the same format)
+    const jsonPath = process.argv[2] || path.join(__dirname, 'knowledge_base', 'knowledge_base.json');
     const jsonData = JSON.parse(fs.readFileSync(jsonPath, 'utf8'));
     
     console.log('Starting data migration...');
-    
-    // Migrate research entries
-    for (const entry of jsonData.research_entries) {
-      console.log(`Migrating: ${entry.title}`);
-      
-      // Create target population
-      const targetPopulation = await prisma.targetPopulation.create({
-        data: {
-          ageRange: entry.target_population.age_range,
-          gender: entry.target_population.gender,
-          occupation: entry.target_population.occupation,
-          adhdSubtype: entry.target_population.adhd_subtype
-        }
-      });
-      
-      // Create methodology
-      const methodology = await prisma.methodology.create({
-        data: {
-          design: entry.methodology.design,
-          duration: entry.methodology.duration,
-          primaryOutcomes: entry.methodology.primary_outcomes,
-          secondaryOutcomes: entry.methodology.secondary_outcomes
-        }
-      });
-      
-      // Create key findings
-      const keyFindings = await prisma.keyFindings.create({
-        data: {
-          primaryResults: entry.key_findings.primary_results,
-          effectSizes: entry.key_findings.effect_sizes,
-          clinicalSignificance: entry.key_findings.clinical_significance,
-          limitations: entry.key_findings.limitations
-        }
-      });
-      
-      // Create workplace relevance
-      const workplaceRelevance = await prisma.workplaceRelevance.create({
-        data: {
-          productivityImpact: entry.workplace_relevance.productivity_impact,
-          accommodationNeeds: entry.workplace_relevance.accommodation_needs,
-          careerImplications: entry.workplace_relevance.career_implications
-        }
-      });
-      
-      // Create quality assessment
-      const qualityAssessment = await prisma.qualityAssessment.create({
-        data: {
-          riskOfBias: entry.quality_assessment.risk_of_bias.toUpperCase(),
-          gradeRating: entry.quality_assessment.grade_rating.toUpperCase(),
-          reviewerNotes: entry.quality_assessment.reviewer_notes
-        }
-      });
-      
-      // Create clinical applications
-      const clinicalApplications = await prisma.clinicalApplications.create({
-        data: {
-          diagnosticUtility: entry.clinical_applications.diagnostic_utility,
-          treatmentRecommendations: entry.clinical_applications.treatment_recommendations,
-          monitoringParameters: entry.clinical_applications.monitoring_parameters
-        }
-      });
-      
-      // Create or find tags
-      const tagRecords = [];
-      for (const tagName of entry.tags) {
-        let tag = await prisma.tag.findUnique({
-          where: { name: tagName }
-        });
-        
-        if (!tag) {
-          tag = await prisma.tag.create({
-            data: { name: tagName }
-          });
-        }
-        tagRecords.push(tag);
-      }
-      
-      // Map study type and evidence level
-      const studyTypeMap = {
-        'systematic_review': 'SYSTEMATIC_REVIEW',
-        'meta_analysis': 'META_ANALYSIS',
-        'rct': 'RCT',
-        'cohort': 'COHORT',
-        'case_control': 'CASE_CONTROL'
-      };
-      
-      const evidenceLevelMap = {
-        '1a': 'LEVEL_1A',
-        '1b': 'LEVEL_1B',
-        '2a': 'LEVEL_2A',
-        '2b': 'LEVEL_2B',
-        '3a': 'LEVEL_3A',
-        '3b': 'LEVEL_3B',
-        '4': 'LEVEL_4',
-        '5': 'LEVEL_5'
-      };
-      
-      // Create research entry
-      const researchEntry = await prisma.researchEntry.create({
-        data: {
-          title: entry.title,
-          authors: entry.authors,
-          journal: entry.journal,
-          publicationDate: new Date(entry.publication_date),
-          doi: entry.doi,
-          studyType: studyTypeMap[entry.study_type] || 'RCT',
-          evidenceLevel: evidenceLevelMap[entry.evidence_level] || 'LEVEL_2B',
-          sampleSize: entry.sample_size,
-          addedDate: new Date(entry.added_date),
-          lastReviewed: new Date(entry.last_reviewed),
-          targetPopulationId: targetPopulation.id,
-          methodologyId: methodology.id,
-          keyFindingsId: keyFindings.id,
-          workplaceRelevanceId: workplaceRelevance.id,
-          qualityAssessmentId: qualityAssessment.id,
-          clinicalApplicationsId: clinicalApplications.id,
-          tags: {
-            connect: tagRecords.map(tag => ({ id: tag.id }))
-          }
-        }
-      });
-      
-      console.log(`✓ Migrated: ${entry.title}`);
-    }
+    const start = performance.now();
     
     // Add some assessment tools
     const assessmentTools = [
@@ -168,12 +370,6 @@ async function migrateData() {
       }
     ];
     
-    for (const tool of assessmentTools) {
-      await prisma.assessmentTool.create({
-        data: tool
-      });
-    }
-    
     // Add treatment recommendations
     const treatmentRecommendations = [
       {
@@ -202,14 +398,56 @@ async function migrateData() {
       }
     ];
     
-    for (const recommendation of treatmentRecommendations) {
-      await prisma.treatmentRecommendation.create({
-        data: recommendation
-      });
-    }
+    let changeset;
+    let written;
+    let dataChanged = false;
+    await prisma.$transaction(async (tx) => {
+      // Only entries whose content hash changed (or that are new) are written;
+      // changed ones are updated in place under their existing ids
+      changeset = await planChangeset(tx, jsonData.research_entries);
+      await tx.$executeRawUnsafe(UNLINK_TAGS_SQL, JSON.stringify(changeset.updated.map(item => item.existing.id)));
+      
+      // Stage the delta in memory, then write each table in bulk
+      const staged = stageResearchEntries([...changeset.added, ...changeset.updated]);
+      await loadResearchEntries(tx, staged);
+      written = staged.researchEntries.length;
+      
+      // Supplementary records are only added once
+      const knownTools = new Set((await tx.assessmentTool.findMany({ select: { name: true } })).map(tool => tool.name));
+      const newTools = assessmentTools.filter(tool => !knownTools.has(tool.name));
+      const knownTreatments = new Set(
+        (await tx.treatmentRecommendation.findMany({ select: { interventionName: true } })).map(rec => rec.interventionName)
+      );
+      const newTreatments = treatmentRecommendations.filter(rec => !knownTreatments.has(rec.interventionName));
+      await tx.assessmentTool.createMany({ data: newTools });
+      await tx.treatmentRecommendation.createMany({ data: newTreatments });
+      
+      if (written > 0 || newTools.length > 0 || newTreatments.length > 0) {
+        // Tell running API processes to drop cached responses
+        // (see adhd_research_api/src/data_version.py)
+        await tx.dataVersion.upsert({
+          where: { id: 1 },
+          update: { version: { increment: 1 } },
+          create: { id: 1, version: 1 }
+        });
+        dataChanged = true;
+      }
+    }, {
+      // Interactive transactions default to a 5s timeout
+      maxWait: 10000,
+      timeout: 10 * 60 * 1000
+    });
     
+    const seconds = (performance.now() - start) / 1000;
+    const rate = Math.round(written / seconds);
+    console.log(`Changeset: ${changeset.added.length} added, ${changeset.updated.length} updated, ${changeset.unchanged} unchanged`);
+    console.log(`✓ Wrote ${written} entries in ${seconds.toFixed(2)}s (${rate} entries/sec)`);
     console.log('✓ Data migration completed successfully!');
     
+    if (dataChanged) {
+      buildRelatedIndex();
+    }
+    
     // Print summary
     const counts = await Promise.all([
       prisma.researchEntry.count(),
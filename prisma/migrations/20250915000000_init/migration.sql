@@ -0,0 +1,211 @@
+-- CreateEnum
+CREATE TYPE "StudyType" AS ENUM ('SYSTEMATIC_REVIEW', 'META_ANALYSIS', 'RCT', 'COHORT', 'CASE_CONTROL', 'CASE_SERIES', 'EXPERT_OPINION');
+
+-- CreateEnum
+CREATE TYPE "EvidenceLevel" AS ENUM ('LEVEL_1A', 'LEVEL_1B', 'LEVEL_2A', 'LEVEL_2B', 'LEVEL_3A', 'LEVEL_3B', 'LEVEL_4', 'LEVEL_5');
+
+-- CreateEnum
+CREATE TYPE "RiskLevel" AS ENUM ('LOW', 'MODERATE', 'HIGH');
+
+-- CreateEnum
+CREATE TYPE "GradeRating" AS ENUM ('HIGH', 'MODERATE', 'LOW', 'VERY_LOW');
+
+-- CreateEnum
+CREATE TYPE "TreatmentType" AS ENUM ('PHARMACOLOGICAL', 'PSYCHOLOGICAL', 'BEHAVIORAL', 'NEUROSTIMULATION', 'LIFESTYLE', 'COMBINED');
+
+-- CreateEnum
+CREATE TYPE "RecommendationStrength" AS ENUM ('STRONG_FOR', 'CONDITIONAL_FOR', 'CONDITIONAL_AGAINST', 'STRONG_AGAINST');
+
+-- CreateEnum
+CREATE TYPE "OutcomeDomain" AS ENUM ('ADHD_SYMPTOMS', 'EXECUTIVE_FUNCTION', 'QUALITY_OF_LIFE', 'WORKPLACE_FUNCTIONING', 'ACADEMIC_PERFORMANCE', 'SOCIAL_FUNCTIONING', 'EMOTIONAL_REGULATION', 'COMORBID_SYMPTOMS');
+
+-- CreateEnum
+CREATE TYPE "MeasureType" AS ENUM ('SELF_REPORT', 'CLINICIAN_RATED', 'PERFORMANCE_BASED', 'PHYSIOLOGICAL', 'BEHAVIORAL_OBSERVATION');
+
+-- CreateTable
+CREATE TABLE "research_entries" (
+    "id" TEXT NOT NULL,
+    "title" TEXT NOT NULL,
+    "authors" TEXT[],
+    "journal" TEXT NOT NULL,
+    "publicationDate" TIMESTAMP(3) NOT NULL,
+    "doi" TEXT,
+    "studyType" "StudyType" NOT NULL,
+    "evidenceLevel" "EvidenceLevel" NOT NULL,
+    "sampleSize" INTEGER NOT NULL,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+    "addedDate" TIMESTAMP(3) NOT NULL,
+    "lastReviewed" TIMESTAMP(3) NOT NULL,
+    "targetPopulationId" TEXT NOT NULL,
+    "methodologyId" TEXT NOT NULL,
+    "keyFindingsId" TEXT NOT NULL,
+    "workplaceRelevanceId" TEXT NOT NULL,
+    "qualityAssessmentId" TEXT NOT NULL,
+    "clinicalApplicationsId" TEXT NOT NULL,
+
+    CONSTRAINT "research_entries_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "target_populations" (
+    "id" TEXT NOT NULL,
+    "ageRange" TEXT NOT NULL,
+    "gender" TEXT NOT NULL,
+    "occupation" TEXT NOT NULL,
+    "adhdSubtype" TEXT NOT NULL,
+
+    CONSTRAINT "target_populations_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "methodologies" (
+    "id" TEXT NOT NULL,
+    "design" TEXT NOT NULL,
+    "duration" TEXT NOT NULL,
+    "primaryOutcomes" TEXT[],
+    "secondaryOutcomes" TEXT[],
+
+    CONSTRAINT "methodologies_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "key_findings" (
+    "id" TEXT NOT NULL,
+    "primaryResults" TEXT NOT NULL,
+    "effectSizes" JSONB NOT NULL,
+    "clinicalSignificance" TEXT NOT NULL,
+    "limitations" TEXT[],
+
+    CONSTRAINT "key_findings_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "workplace_relevance" (
+    "id" TEXT NOT NULL,
+    "productivityImpact" TEXT NOT NULL,
+    "accommodationNeeds" TEXT[],
+    "careerImplications" TEXT NOT NULL,
+
+    CONSTRAINT "workplace_relevance_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "quality_assessments" (
+    "id" TEXT NOT NULL,
+    "riskOfBias" "RiskLevel" NOT NULL,
+    "gradeRating" "GradeRating" NOT NULL,
+    "reviewerNotes" TEXT NOT NULL,
+
+    CONSTRAINT "quality_assessments_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "clinical_applications" (
+    "id" TEXT NOT NULL,
+    "diagnosticUtility" TEXT NOT NULL,
+    "treatmentRecommendations" TEXT[],
+    "monitoringParameters" TEXT[],
+
+    CONSTRAINT "clinical_applications_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "tags" (
+    "id" TEXT NOT NULL,
+    "name" TEXT NOT NULL,
+
+    CONSTRAINT "tags_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "treatment_recommendations" (
+    "id" TEXT NOT NULL,
+    "condition" TEXT NOT NULL,
+    "treatmentType" "TreatmentType" NOT NULL,
+    "interventionName" TEXT NOT NULL,
+    "evidenceLevel" "EvidenceLevel" NOT NULL,
+    "effectSize" DOUBLE PRECISION,
+    "recommendationStrength" "RecommendationStrength" NOT NULL,
+    "targetPopulation" TEXT NOT NULL,
+    "contraindications" TEXT[],
+    "sideEffects" TEXT[],
+    "monitoringRequirements" TEXT[],
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "treatment_recommendations_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "assessment_tools" (
+    "id" TEXT NOT NULL,
+    "name" TEXT NOT NULL,
+    "acronym" TEXT,
+    "purpose" TEXT NOT NULL,
+    "targetPopulation" TEXT NOT NULL,
+    "administrationTime" INTEGER,
+    "domains" TEXT[],
+    "psychometricProperties" JSONB NOT NULL,
+    "clinicalUtility" TEXT NOT NULL,
+    "limitations" TEXT[],
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "assessment_tools_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "outcome_measures" (
+    "id" TEXT NOT NULL,
+    "name" TEXT NOT NULL,
+    "domain" "OutcomeDomain" NOT NULL,
+    "measureType" "MeasureType" NOT NULL,
+    "description" TEXT NOT NULL,
+    "scoringMethod" TEXT NOT NULL,
+    "interpretationGuidelines" TEXT NOT NULL,
+    "clinicalSignificance" TEXT,
+    "minimumDetectableChange" DOUBLE PRECISION,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "outcome_measures_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "_ResearchEntryTags" (
+    "A" TEXT NOT NULL,
+    "B" TEXT NOT NULL,
+
+    CONSTRAINT "_ResearchEntryTags_AB_pkey" PRIMARY KEY ("A","B")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "tags_name_key" ON "tags"("name");
+
+-- CreateIndex
+CREATE INDEX "_ResearchEntryTags_B_index" ON "_ResearchEntryTags"("B");
+
+-- AddForeignKey
+ALTER TABLE "research_entries" ADD CONSTRAINT "research_entries_targetPopulationId_fkey" FOREIGN KEY ("targetPopulationId") REFERENCES "target_populations"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "research_entries" ADD CONSTRAINT "research_entries_methodologyId_fkey" FOREIGN KEY ("methodologyId") REFERENCES "methodologies"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "research_entries" ADD CONSTRAINT "research_entries_keyFindingsId_fkey" FOREIGN KEY ("keyFindingsId") REFERENCES "key_findings"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "research_entries" ADD CONSTRAINT "research_entries_workplaceRelevanceId_fkey" FOREIGN KEY ("workplaceRelevanceId") REFERENCES "workplace_relevance"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "research_entries" ADD CONSTRAINT "research_entries_qualityAssessmentId_fkey" FOREIGN KEY ("qualityAssessmentId") REFERENCES "quality_assessments"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "research_entries" ADD CONSTRAINT "research_entries_clinicalApplicationsId_fkey" FOREIGN KEY ("clinicalApplicationsId") REFERENCES "clinical_applications"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "_ResearchEntryTags" ADD CONSTRAINT "_ResearchEntryTags_A_fkey" FOREIGN KEY ("A") REFERENCES "research_entries"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "_ResearchEntryTags" ADD CONSTRAINT "_ResearchEntryTags_B_fkey" FOREIGN KEY ("B") REFERENCES "tags"("id") ON DELETE CASCADE ON UPDATE CASCADE;
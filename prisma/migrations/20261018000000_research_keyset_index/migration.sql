@@ -0,0 +1,2 @@
+-- CreateIndex
+CREATE INDEX "research_entries_publicationDate_id_idx" ON "research_entries"("publicationDate" DESC, "id" DESC);
@@ -0,0 +1,65 @@
+-- Full-text search over title, authors, journal and key findings.
+--
+-- A generated column cannot read key_findings, so "searchVector" is kept
+-- up to date by triggers instead: one recomputes it whenever a research
+-- entry is written, the other touches the owning entries whenever their
+-- key findings change.
+
+-- AlterTable
+ALTER TABLE "research_entries" ADD COLUMN "searchVector" tsvector;
+
+-- CreateFunction
+CREATE FUNCTION "research_entries_search_vector"(
+    "title" TEXT,
+    "authors" TEXT[],
+    "journal" TEXT,
+    "keyFindingsId" TEXT
+) RETURNS tsvector
+LANGUAGE sql STABLE AS $$
+    SELECT
+        setweight(to_tsvector('english', coalesce("title", '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(array_to_string("authors", ' '), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce("journal", '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(
+            (SELECT kf."primaryResults" || ' ' || kf."clinicalSignificance"
+             FROM key_findings kf WHERE kf.id = "keyFindingsId"),
+            ''
+        )), 'D')
+$$;
+
+-- CreateFunction
+CREATE FUNCTION "research_entries_search_vector_trigger"() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW."searchVector" := "research_entries_search_vector"(NEW."title", NEW."authors", NEW."journal", NEW."keyFindingsId");
+    RETURN NEW;
+END
+$$;
+
+-- CreateFunction
+CREATE FUNCTION "key_findings_search_vector_trigger"() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE "research_entries"
+    SET "searchVector" = "research_entries_search_vector"("title", "authors", "journal", "keyFindingsId")
+    WHERE "keyFindingsId" = NEW.id;
+    RETURN NULL;
+END
+$$;
+
+-- CreateTrigger
+CREATE TRIGGER "research_entries_search_vector_update"
+BEFORE INSERT OR UPDATE OF "title", "authors", "journal", "keyFindingsId" ON "research_entries"
+FOR EACH ROW EXECUTE FUNCTION "research_entries_search_vector_trigger"();
+
+-- CreateTrigger
+CREATE TRIGGER "key_findings_search_vector_update"
+AFTER UPDATE OF "primaryResults", "clinicalSignificance" ON "key_findings"
+FOR EACH ROW EXECUTE FUNCTION "key_findings_search_vector_trigger"();
+
+-- Backfill existing rows
+UPDATE "research_entries"
+SET "searchVector" = "research_entries_search_vector"("title", "authors", "journal", "keyFindingsId");
+
+-- CreateIndex
+CREATE INDEX "research_entries_searchVector_idx" ON "research_entries" USING GIN ("searchVector");
@@ -0,0 +1,11 @@
+-- CreateTable
+CREATE TABLE "data_version" (
+    "id" INTEGER NOT NULL DEFAULT 1,
+    "version" INTEGER NOT NULL DEFAULT 0,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "data_version_pkey" PRIMARY KEY ("id")
+);
+
+-- Seed the single row that ingest jobs bump
+INSERT INTO "data_version" ("id", "version", "updatedAt") VALUES (1, 0, CURRENT_TIMESTAMP);
@@ -0,0 +1,29 @@
+-- AlterTable
+ALTER TABLE "research_entries" ADD COLUMN "sourceKey" TEXT,
+ADD COLUMN "contentHash" TEXT;
+
+-- Key rows loaded before incremental ingest by DOI. Earlier full re-runs may
+-- have left duplicates, so only the newest row per DOI gets the key; the
+-- next ingest run fills in contentHash by replacing that row in place.
+-- The DOI is normalized exactly as sourceKey() in migrate_data.js does:
+-- ASCII whitespace trimmed, then lowercased.
+-- Rows without a DOI are keyed by knowledge base id, which the table does
+-- not store; migrate_data.js claims those by title and publication date on
+-- its first run instead.
+UPDATE "research_entries" re
+SET "sourceKey" = 'doi:' || newest."doi"
+FROM (
+    SELECT DISTINCT ON (normalized."doi") normalized."id", normalized."doi"
+    FROM (
+        SELECT "id", "createdAt",
+            lower(regexp_replace("doi", '^[ \t\n\r\f\v]+|[ \t\n\r\f\v]+$', '', 'g')) AS "doi"
+        FROM "research_entries"
+        WHERE "doi" IS NOT NULL
+    ) normalized
+    WHERE normalized."doi" <> ''
+    ORDER BY normalized."doi", normalized."createdAt" DESC, normalized."id" DESC
+) newest
+WHERE re."id" = newest."id";
+
+-- CreateIndex
+CREATE UNIQUE INDEX "research_entries_sourceKey_key" ON "research_entries"("sourceKey");
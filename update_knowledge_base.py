@@ -1,8 +1,70 @@
+import hashlib
 import json
-from datetime import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'tools'))
+
+from near_duplicates import build_report, find_clusters, merge_clusters, summarize  # noqa: E402
+
+KNOWLEDGE_BASE_PATH = os.getenv('KNOWLEDGE_BASE_PATH') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'knowledge_base', 'knowledge_base.json'
+)
+
+# "flag" only reports near-duplicate entries (different DOI/id, same title and
+# findings); "merge" also collapses each cluster into its first entry
+NEAR_DUPLICATE_MODE = os.getenv('NEAR_DUPLICATE_MODE', 'flag')
+NEAR_DUPLICATE_REPORT = os.getenv('NEAR_DUPLICATE_REPORT') or os.path.join(
+    os.path.dirname(KNOWLEDGE_BASE_PATH), 'near_duplicates.json'
+)
+
+
+def entry_key(entry):
+    """Identity of an entry across runs: its DOI when present, else its id
+
+    Same format as the sourceKey column written by migrate_data.js.
+    """
+    doi = (entry.get('doi') or '').strip().lower()
+    return f"doi:{doi}" if doi else f"id:{entry['id']}"
+
+
+def content_hash(entry):
+    """sha256 of the entry's canonical JSON (sorted keys, no whitespace)"""
+    canonical = json.dumps(entry, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def merge_entries(existing, incoming):
+    """Upsert incoming entries into existing ones by entry_key
+
+    Duplicates already in the knowledge base collapse to their last copy.
+    Entries keep their position; new ones are appended.
+
+    Returns:
+        (merged entries, changeset counts)
+    """
+    merged = {}
+    for entry in existing:
+        merged[entry_key(entry)] = entry
+    changeset = {'added': 0, 'updated': 0, 'unchanged': 0, 'duplicates_removed': len(existing) - len(merged)}
+
+    for entry in incoming:
+        key = entry_key(entry)
+        current = merged.get(key)
+        if current is None:
+            changeset['added'] += 1
+        elif content_hash(current) == content_hash(entry):
+            changeset['unchanged'] += 1
+            continue
+        else:
+            changeset['updated'] += 1
+        merged[key] = entry
+
+    return list(merged.values()), changeset
+
 
 # Load existing knowledge base
-with open('/home/ubuntu/add_research_project/knowledge_base/knowledge_base.json', 'r') as f:
+with open(KNOWLEDGE_BASE_PATH, 'r') as f:
     kb = json.load(f)
 
 # New research entries based on our findings
@@ -170,16 +232,37 @@ new_entries = [
     }
 ]
 
-# Add new entries to knowledge base
-kb["research_entries"].extend(new_entries)
+# Upsert new entries into the knowledge base; re-runs only write what changed
+kb["research_entries"], changeset = merge_entries(kb["research_entries"], new_entries)
+
+# Exact keys miss re-extracted copies of the same finding; MinHash/LSH catches those
+clusters = find_clusters(kb["research_entries"])
+changeset['near_duplicates_merged'] = 0
+# Written even when empty, so a stale report never outlives its duplicates
+report = build_report(kb["research_entries"], clusters)
+with open(NEAR_DUPLICATE_REPORT, 'w') as f:
+    json.dump(report, f, indent=2, ensure_ascii=False)
+print(summarize(report))
+print(f"Near-duplicate report written to {NEAR_DUPLICATE_REPORT}")
+if clusters and NEAR_DUPLICATE_MODE == 'merge':
+    merged_entries = merge_clusters(kb["research_entries"], clusters)
+    changeset['near_duplicates_merged'] = len(kb["research_entries"]) - len(merged_entries)
+    kb["research_entries"] = merged_entries
+
+print(f"Changeset: {changeset['added']} added, {changeset['updated']} updated, "
+      f"{changeset['unchanged']} unchanged, {changeset['duplicates_removed']} duplicates removed, "
+      f"{changeset['near_duplicates_merged']} near-duplicates merged")
 
-# Update metadata
-kb["metadata"]["last_updated"] = "2025-09-15"
-kb["metadata"]["version"] = "1.1"
+if changeset['added'] or changeset['updated'] or changeset['duplicates_removed'] or changeset['near_duplicates_merged']:
+    # Update metadata
+    kb["metadata"]["last_updated"] = "2025-09-15"
+    kb["metadata"]["version"] = "1.1"
 
-# Save updated knowledge base
-with open('/home/ubuntu/add_research_project/knowledge_base/knowledge_base.json', 'w') as f:
-    json.dump(kb, f, indent=2)
+    # Save updated knowledge base
+    with open(KNOWLEDGE_BASE_PATH, 'w') as f:
+        json.dump(kb, f, indent=2)
+    print("Knowledge base updated successfully!")
+else:
+    print("Knowledge base already up to date")
 
-print("Knowledge base updated successfully!")
 print(f"Total research entries: {len(kb['research_entries'])}")